@@ -1,11 +1,15 @@
 #!/usr/bin/env python3
 """
 Script to add Google Analytics tracking code to all HTML files
+Pass --workers N to set the number of worker processes.
 """
 import os
+import sys
 import glob
 import re
 
+from transform_engine import run_parallel, build_report, print_results, get_worker_count, file_result
+
 # Google Analytics tracking code to insert
 GA_CODE = """<!-- Google tag (gtag.js) -->
 <script async src="https://www.googletagmanager.com/gtag/js?id=G-C0EW343WC5"></script>
@@ -20,57 +24,43 @@ GA_CODE = """<!-- Google tag (gtag.js) -->
 
 def add_ga_to_file(filepath):
     """Add Google Analytics code to a single HTML file if not already present"""
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
+    with open(filepath, 'r', encoding='utf-8') as f:
+        content = f.read()
 
-        # Check if GA code is already present
-        if 'G-C0EW343WC5' in content or 'gtag.js' in content:
-            print(f"[SKIP] {filepath} - GA code already present")
-            return False
+    # Check if GA code is already present
+    if 'G-C0EW343WC5' in content or 'gtag.js' in content:
+        return file_result(filepath, 'skipped', 'GA code already present')
 
-        # Find the <head> tag and insert GA code after it
-        if '<head>' in content:
-            # Insert after <head> tag
-            content = content.replace('<head>', '<head>\n' + GA_CODE, 1)
+    # Find the <head> tag and insert GA code after it
+    if '<head>' not in content:
+        return file_result(filepath, 'skipped', 'No <head> tag found')
 
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
-            print(f"[OK] Updated {filepath}")
-            return True
-        else:
-            print(f"[WARN] No <head> tag found in {filepath}")
-            return False
+    # Insert after <head> tag
+    content = content.replace('<head>', '<head>\n' + GA_CODE, 1)
 
-    except Exception as e:
-        print(f"[ERROR] Error processing {filepath}: {str(e)}")
-        return False
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write(content)
+    return file_result(filepath, 'updated')
 
 def main():
     """Main function to process all HTML files"""
     # Get all HTML files recursively
-    html_files = glob.glob('**/*.html', recursive=True)
+    html_files = sorted(glob.glob('**/*.html', recursive=True))
 
     print(f"Found {len(html_files)} HTML files\n")
 
-    updated_count = 0
-    skipped_count = 0
-    error_count = 0
-
-    for html_file in sorted(html_files):
-        result = add_ga_to_file(html_file)
-        if result is True:
-            updated_count += 1
-        elif result is False and 'already present' in str(result):
-            skipped_count += 1
-        else:
-            error_count += 1
+    results = run_parallel(add_ga_to_file, html_files, workers=get_worker_count(sys.argv))
+    report = build_report(results)
+    print_results(report)
 
     print(f"\n{'='*60}")
     print(f"Summary:")
-    print(f"  [OK] Updated: {updated_count} files")
-    print(f"  [SKIP] Skipped: {skipped_count} files (already had GA)")
-    print(f"  [ERROR] Errors: {error_count} files")
+    print(f"  [OK] Updated: {report['updated']} files")
+    no_head = sum(1 for result in report['results']
+                  if result['status'] == 'skipped' and result['error'] == 'No <head> tag found')
+    print(f"  [SKIP] Already had GA: {report['skipped'] - no_head} files")
+    print(f"  [SKIP] No <head> tag: {no_head} files")
+    print(f"  [ERROR] Errors: {report['errors']} files")
     print(f"{'='*60}")
 
 if __name__ == '__main__':
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Render every qualification page to PDF concurrently.
+
+Pages are discovered from qualifications/*.html (or the glob patterns given
+on the command line) and put on an asyncio queue. K workers, each with its
+own context and tab in one shared Chromium (playwright.async_api), take
+pages off the queue, so K pages load and print at the same time. A page
+that fails is put back on the queue and retried up to MAX_ATTEMPTS times,
+and the time of every render is reported at the end.
+
+Each rendered PDF is then shrunk by optimize_pdfs.py (downsampled images,
+merged duplicate resources, linearized) unless --no-optimize is given or
+pikepdf/Pillow are not installed.
+
+Rendering is incremental: each PDF's inputs - the page, the local CSS, JS
+and images it references, the print stylesheet and the PDF options - are
+hashed into a key stored in PDF_MANIFEST, and pages whose key is unchanged
+(and whose PDF still exists) are skipped. Use --force to render them all.
+
+Usage:
+    python batch_render_pdfs.py [pattern ...] [--workers K] [--force] [--no-optimize] [--offline]
+
+    pattern        Glob under qualifications/ (default: *.html)
+    --workers K    Pages rendered concurrently (default: DEFAULT_CONCURRENCY)
+    --force        Render every page even when its inputs are unchanged
+    --no-optimize  Keep PDFs exactly as Chromium wrote them
+    --offline      Serve CDN files only from the vendor cache, never the network
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import asyncio
+import hashlib
+from pathlib import Path
+from urllib.parse import unquote
+
+import regex_registry
+from optimize_pdfs import optimize_pdf, optimizer_available, optimizer_settings, print_sizes
+
+from pdf_browser_pool import CHROMIUM_ARGS, LOAD_LAZY_IMAGES, MAX_RENDERS_PER_BROWSER, PDF_OPTIONS, PRINT_CSS, READY_CHECK, READY_TIMEOUT_MS, page_url
+from qualification_page import EXCLUDED_FILES
+from transform_engine import get_worker_count, run_parallel
+from vendor_cache import VendorRoutes, install_routes_async
+
+# Handle Windows console encoding
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+    sys.stderr.reconfigure(encoding='utf-8')
+
+QUALIFICATIONS_DIR = Path('qualifications')
+OUTPUT_DIR = Path('Qualifications PDF')
+
+# Pages rendered at the same time. Rendering is mostly waiting on the page
+# and on Chromium, so this can exceed the CPU count.
+DEFAULT_CONCURRENCY = 4
+
+# Tries per page before it is reported as failed
+MAX_ATTEMPTS = 3
+
+# Input keys of the PDFs rendered so far, by page path
+PDF_MANIFEST = Path('.cache') / 'pdf_manifest.json'
+
+# Bump when rendering changes in a way the hashed inputs don't capture
+PDF_PIPELINE_VERSION = 1
+
+# Local files a page loads: src/href/poster attributes and CSS url()
+ASSET_REF = regex_registry.register_pattern(
+    'pdf.asset_ref', r"""(?:\b(?:src|href|poster)\s*=\s*["']|url\(\s*["']?)([^"'()\s?#]+)""", re.IGNORECASE
+)
+ASSET_SRCSET = regex_registry.register_pattern(
+    'pdf.asset_srcset', r"""\bsrcset\s*=\s*["']([^"']+)["']""", re.IGNORECASE
+)
+
+# References that are not local render inputs
+EXTERNAL_PREFIXES = ('http:', 'https:', '//', 'data:', 'mailto:', 'tel:', 'javascript:')
+
+# Hashes of asset files already read in this process, by (path, mtime, size)
+_FILE_HASHES = {}
+
+def discover_pages(patterns=None, qualifications_dir=QUALIFICATIONS_DIR):
+    """Qualification pages matching the glob patterns, sorted, without templates."""
+    found = set()
+    for pattern in patterns or ['*.html']:
+        found.update(Path(qualifications_dir).glob(pattern))
+    return sorted(path for path in found if path.suffix == '.html' and path.name not in EXCLUDED_FILES)
+
+def file_hash(path):
+    """SHA-256 of a file, computed once per process for unchanged files."""
+    stat = os.stat(path)
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    if key not in _FILE_HASHES:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        _FILE_HASHES[key] = digest.hexdigest()
+    return _FILE_HASHES[key]
+
+def asset_refs(text):
+    """Local references in HTML or CSS text (links to other pages excluded)."""
+    refs = list(regex_registry.findall(ASSET_REF, text))
+    for srcset in regex_registry.findall(ASSET_SRCSET, text):
+        refs.extend(candidate.split()[0] for candidate in srcset.split(',') if candidate.strip())
+
+    local = []
+    for ref in refs:
+        ref = unquote(ref.strip())
+        if not ref or ref.lower().startswith(EXTERNAL_PREFIXES):
+            continue
+        if Path(ref).suffix.lower() in ('', '.html', '.htm'):
+            continue
+        local.append(ref)
+    return local
+
+def referenced_assets(html_file):
+    """
+    Existing local files a page loads, sorted, including files referenced
+    by url() in the local stylesheets it loads.
+    """
+    html_file = Path(html_file)
+    with open(html_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    assets = set()
+    pending = [(ref, html_file.parent) for ref in asset_refs(content)]
+    while pending:
+        ref, base = pending.pop()
+        path = Path(os.path.normpath(base / ref))
+        if path in assets or not path.is_file():
+            continue
+        assets.add(path)
+        if path.suffix.lower() == '.css':
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                pending.extend((css_ref, path.parent) for css_ref in asset_refs(f.read()))
+    return sorted(assets)
+
+def pdf_input_key(html_file, optimize=True):
+    """Hash of everything a page's PDF depends on."""
+    digest = hashlib.sha256()
+    parts = [str(PDF_PIPELINE_VERSION), PRINT_CSS, READY_CHECK, json.dumps(PDF_OPTIONS, sort_keys=True),
+             optimizer_settings() if optimize else 'unoptimized', file_hash(html_file)]
+    for asset in referenced_assets(html_file):
+        parts.extend([page_key(asset), file_hash(asset)])
+    for part in parts:
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+def page_key(html_file):
+    """Manifest key for a page: its path relative to the site root."""
+    return Path(os.path.relpath(html_file)).as_posix()
+
+def load_pdf_manifest(manifest_path=PDF_MANIFEST):
+    """PDF input keys from the last run, by page path."""
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_pdf_manifest(manifest, manifest_path=PDF_MANIFEST):
+    Path(manifest_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+def record_rendered(html_files, optimize=True, manifest_path=PDF_MANIFEST):
+    """Store the current input keys of freshly rendered pages."""
+    manifest = load_pdf_manifest(manifest_path)
+    for html_file in html_files:
+        manifest[page_key(html_file)] = pdf_input_key(html_file, optimize)
+    save_pdf_manifest(manifest, manifest_path)
+
+def optimize_rendered(pdf_files, workers=None):
+    """
+    Optimize freshly rendered PDFs and print their sizes. Returns the
+    PDFs that were optimized.
+    """
+    results = run_parallel(optimize_pdf, pdf_files, workers)
+    print_sizes(results)
+    return [Path(result['path']) for result in results if result['status'] != 'error']
+
+def stale_pages(html_files, output_dir=OUTPUT_DIR, optimize=True, manifest_path=PDF_MANIFEST):
+    """
+    Pages whose PDF is missing or whose input key differs from the
+    manifest, as (stale pages, {page path: current key}).
+    """
+    manifest = load_pdf_manifest(manifest_path)
+    keys = {}
+    stale = []
+    for html_file in html_files:
+        path = page_key(html_file)
+        keys[path] = pdf_input_key(html_file, optimize)
+        output_pdf = Path(output_dir) / f'{Path(html_file).stem}.pdf'
+        if manifest.get(path) != keys[path] or not output_pdf.exists():
+            stale.append(html_file)
+    return stale, keys
+
+async def wait_until_ready(page, html_file, timeout_ms=READY_TIMEOUT_MS):
+    """Async counterpart of pdf_browser_pool.wait_until_ready()."""
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+    try:
+        await page.wait_for_function(READY_CHECK, timeout=timeout_ms)
+        return True
+    except PlaywrightTimeoutError:
+        print(f"[WARN] {Path(html_file).name} not ready after {timeout_ms / 1000:.0f}s, rendering anyway")
+        return False
+
+async def render_page_pdf(page, html_file, output_pdf):
+    """Async counterpart of pdf_browser_pool.render_page_pdf()."""
+    await page.goto(page_url(html_file))
+    await page.evaluate(LOAD_LAZY_IMAGES)
+    await wait_until_ready(page, html_file)
+
+    await page.add_style_tag(content=PRINT_CSS)
+    await page.pdf(path=str(Path(output_pdf).resolve()), **PDF_OPTIONS)
+
+async def render_worker(browser, queue, results, routes):
+    """
+    Take (html_file, output_pdf, attempt) jobs off the queue until it is
+    empty, rendering each through this worker's own tab.
+    """
+    context = page = None
+    renders = 0
+
+    while True:
+        try:
+            html_file, output_pdf, attempt = queue.get_nowait()
+        except asyncio.QueueEmpty:
+            break
+
+        try:
+            start = time.perf_counter()
+            try:
+                # Fresh context after a failure or every MAX_RENDERS_PER_BROWSER pages
+                if page is None or renders >= MAX_RENDERS_PER_BROWSER:
+                    if context is not None:
+                        await context.close()
+                    context = await browser.new_context()
+                    await install_routes_async(context, routes)
+                    page = await context.new_page()
+                    renders = 0
+
+                await render_page_pdf(page, html_file, output_pdf)
+            except Exception as e:
+                seconds = time.perf_counter() - start
+                page = None
+                if attempt < MAX_ATTEMPTS:
+                    print(f"[RETRY] {html_file.name} (attempt {attempt} of {MAX_ATTEMPTS}): {e}")
+                    queue.put_nowait((html_file, output_pdf, attempt + 1))
+                else:
+                    print(f"[ERROR] {html_file.name} after {attempt} attempts: {e}")
+                    results.append({'file': html_file.name, 'ok': False, 'seconds': seconds,
+                                    'attempts': attempt, 'error': str(e)})
+                continue
+
+            seconds = time.perf_counter() - start
+            renders += 1
+            size_kb = Path(output_pdf).stat().st_size / 1024
+            print(f"[OK] {html_file.name} ({seconds:.1f}s, {size_kb:.0f} KB)")
+            results.append({'file': html_file.name, 'ok': True, 'seconds': seconds,
+                            'attempts': attempt, 'size_kb': size_kb})
+        finally:
+            queue.task_done()
+
+    if context is not None:
+        await context.close()
+
+async def render_all(html_files, output_dir=OUTPUT_DIR, concurrency=DEFAULT_CONCURRENCY, offline=False):
+    """
+    Render html_files to output_dir with `concurrency` pages in flight,
+    serving CDN requests from the vendor cache (network-free when offline).
+
+    Returns one result dict per page: file, ok, seconds, attempts and
+    size_kb or error.
+    """
+    from playwright.async_api import async_playwright
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(exist_ok=True)
+
+    queue = asyncio.Queue()
+    for html_file in html_files:
+        queue.put_nowait((Path(html_file), output_dir / f'{Path(html_file).stem}.pdf', 1))
+
+    results = []
+    routes = VendorRoutes(offline)
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(args=CHROMIUM_ARGS)
+        try:
+            workers = max(1, min(concurrency, len(html_files)))
+            await asyncio.gather(*(render_worker(browser, queue, results, routes) for _ in range(workers)))
+        finally:
+            await browser.close()
+
+    print(f"Vendor cache: {routes.hits} requests served locally, {routes.misses} not cached"
+          f"{' (blocked, offline)' if offline else ' (fetched and stored)'}")
+    return results
+
+def print_timings(results, wall_seconds, up_to_date=0):
+    """Per-page timings, slowest first, and the batch totals."""
+    print(f"\n{'='*60}")
+    print("Render times (slowest first)")
+    print(f"{'='*60}")
+    for result in sorted(results, key=lambda result: result['seconds'], reverse=True):
+        status = 'OK' if result['ok'] else 'FAILED'
+        retries = f" after {result['attempts']} attempts" if result['attempts'] > 1 else ''
+        print(f"  {result['seconds']:6.1f}s  {status:<6} {result['file']}{retries}")
+
+    ok = [result for result in results if result['ok']]
+    render_seconds = sum(result['seconds'] for result in results)
+    print(f"\n{'='*60}")
+    print("Summary:")
+    print(f"  Rendered: {len(ok)}/{len(results)}")
+    print(f"  Failed: {len(results) - len(ok)}")
+    print(f"  Up to date (manifest): {up_to_date}")
+    print(f"  Wall clock: {wall_seconds:.1f}s (sum of render times {render_seconds:.1f}s)")
+    print(f"{'='*60}")
+
+def run(patterns=None, concurrency=DEFAULT_CONCURRENCY, output_dir=OUTPUT_DIR, force=False, optimize=True,
+        offline=False, manifest_path=PDF_MANIFEST):
+    """Discover, render and optimize what changed and report; returns the process exit code."""
+    html_files = discover_pages(patterns)
+    if not html_files:
+        print(f"[ERROR] No pages in {QUALIFICATIONS_DIR} match {' '.join(patterns or ['*.html'])}")
+        return 1
+
+    if optimize and not optimizer_available():
+        print("[WARN] pikepdf/Pillow not installed, PDFs will not be optimized (pip install pikepdf pillow)")
+        optimize = False
+
+    stale, keys = stale_pages(html_files, output_dir, optimize, manifest_path)
+    if force:
+        stale = html_files
+    up_to_date = len(html_files) - len(stale)
+
+    print(f"Rendering {len(stale)} of {len(html_files)} pages to {Path(output_dir).resolve()} "
+          f"({concurrency} at a time, {up_to_date} up to date)")
+    print("=" * 60)
+    if not stale:
+        return 0
+
+    start = time.perf_counter()
+    results = asyncio.run(render_all(stale, output_dir, concurrency, offline))
+    print_timings(results, time.perf_counter() - start, up_to_date)
+
+    rendered_names = {result['file'] for result in results if result['ok']}
+    rendered = [html_file for html_file in stale if html_file.name in rendered_names]
+
+    if optimize and rendered:
+        print(f"\nOptimizing {len(rendered)} rendered PDFs")
+        print("=" * 60)
+        optimized = optimize_rendered([Path(output_dir) / f'{html_file.stem}.pdf' for html_file in rendered])
+        optimized_names = {pdf_file.stem for pdf_file in optimized}
+        rendered = [html_file for html_file in rendered if html_file.stem in optimized_names]
+
+    # Keys were computed before rendering, so an edit made mid-run is
+    # picked up next time
+    manifest = load_pdf_manifest(manifest_path)
+    for html_file in rendered:
+        manifest[page_key(html_file)] = keys[page_key(html_file)]
+    save_pdf_manifest(manifest, manifest_path)
+
+    return 0 if len(rendered) == len(stale) else 1
+
+def main():
+    argv = sys.argv[1:]
+    concurrency = get_worker_count(argv, default=DEFAULT_CONCURRENCY)
+
+    patterns = []
+    skip_next = False
+    for arg in argv:
+        if skip_next:
+            skip_next = False
+        elif arg == '--workers':
+            skip_next = True
+        elif not arg.startswith('--'):
+            patterns.append(arg)
+
+    return run(patterns, max(1, concurrency), force='--force' in argv, optimize='--no-optimize' not in argv,
+               offline='--offline' in argv)
+
+if __name__ == '__main__':
+    try:
+        sys.exit(main())
+    except ImportError:
+        print("Error: Playwright is not installed.")
+        print("Please run: pip install playwright")
+        print("Then run: playwright install chromium")
+        sys.exit(1)
@@ -2,12 +2,15 @@
 """
 Batch update all qualification sidebars to standardized format.
 Keeps only: SETA, NQF Level, Credits, Duration (if exists), NLRD ID/SAQA Qual ID
+
+Fields and the span of the field rows come from the cached QualificationPage
+model (see qualification_page.py); the new rows are spliced in at its offsets.
 """
 
-import os
-import re
 from pathlib import Path
 
+from qualification_page import ID_LABELS, page_for_content, splice
+
 # Files to exclude
 EXCLUDED_FILES = [
     'skills-conflict-management-nqf5.html',
@@ -23,72 +26,50 @@ PROCESSED_FILES = [
     'agri-animal-production-nqf1.html'
 ]
 
+def sidebar_rows(fields):
+    """Sidebar label/value rows for (label, value) pairs (the first row unindented)."""
+    return '\n                            '.join(
+        f'<div class="flex justify-between items-center py-3 border-b border-gray-100">\n'
+        f'                                <span class="text-gray-600">{label}</span>\n'
+        f'                                <span class="font-semibold">{value}</span>\n'
+        f'                            </div>'
+        for label, value in fields
+    )
+
 def standardize_sidebar(content, filename):
     """Standardize the sidebar section in a qualification file."""
+    page = page_for_content(content, filename)
+    if 'sidebar_fields' not in page.offsets:
+        return content
+
+    field_dict = page.sidebar
+
+    # Build standardized field list
+    standardized_fields = []
+
+    # Add fields in standard order
+    if 'SETA' in field_dict:
+        standardized_fields.append(('SETA', field_dict['SETA']))
+
+    # NQF Level (various formats)
+    for key in ['NQF Level', 'NQF level']:
+        if key in field_dict:
+            standardized_fields.append(('NQF Level', field_dict[key]))
+            break
+
+    if 'Credits' in field_dict:
+        standardized_fields.append(('Credits', field_dict['Credits']))
+
+    if 'Duration' in field_dict:
+        standardized_fields.append(('Duration', field_dict['Duration']))
+
+    # NLRD ID or SAQA Qual ID
+    for key in ID_LABELS:
+        if key in field_dict:
+            standardized_fields.append((key, field_dict[key]))
+            break
 
-    # Pattern to find the sidebar details section
-    # Looking for either "Qualification Details" or "Quick Facts"
-    pattern = r'((?:Qualification Details|Quick Facts)</h3>\s*<div class="space-y-4[^"]*">)(.*?)(</div>\s*(?:</div>|<!-- Career|<div class="mb-8|<button|<div class="space-y-4">))'
-
-    def process_sidebar(match):
-        before = match.group(1)
-        fields_html = match.group(2)
-        after = match.group(3)
-
-        # Extract all field divs
-        field_pattern = r'<div class="flex justify-between[^>]*>\s*<span class="text-gray-600">([^<]+?)(?::)?</span>\s*<span class="font-semibold">([^<]+)</span>\s*</div>'
-        fields = re.findall(field_pattern, fields_html, re.DOTALL)
-
-        if not fields:
-            return match.group(0)
-
-        # Create field dictionary
-        field_dict = {}
-        for label, value in fields:
-            clean_label = label.strip().rstrip(':')
-            field_dict[clean_label] = value.strip()
-
-        # Build standardized field list
-        standardized_fields = []
-
-        # Add fields in standard order
-        if 'SETA' in field_dict:
-            standardized_fields.append(('SETA', field_dict['SETA']))
-
-        # NQF Level (various formats)
-        for key in ['NQF Level', 'NQF level']:
-            if key in field_dict:
-                standardized_fields.append(('NQF Level', field_dict[key]))
-                break
-
-        if 'Credits' in field_dict:
-            standardized_fields.append(('Credits', field_dict['Credits']))
-
-        if 'Duration' in field_dict:
-            standardized_fields.append(('Duration', field_dict['Duration']))
-
-        # NLRD ID or SAQA Qual ID
-        for key in ['NLRD ID', 'SAQA Qual ID', 'SAQA ID']:
-            if key in field_dict:
-                standardized_fields.append((key, field_dict[key]))
-                break
-
-        # Rebuild HTML
-        new_fields = []
-        for label, value in standardized_fields:
-            new_fields.append(
-                f'                            <div class="flex justify-between items-center py-3 border-b border-gray-100">\n'
-                f'                                <span class="text-gray-600">{label}</span>\n'
-                f'                                <span class="font-semibold">{value}</span>\n'
-                f'                            </div>'
-            )
-
-        return before + '\n' + '\n'.join(new_fields) + '\n                        ' + after
-
-    # Apply standardization
-    new_content = re.sub(pattern, process_sidebar, content, flags=re.DOTALL)
-
-    return new_content
+    return splice(content, page.offsets['sidebar_fields'], sidebar_rows(standardized_fields))
 
 def main():
     qualifications_dir = Path('qualifications')
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Inline each page type's critical CSS and load the full stylesheet async.
+
+Pages built with build_tailwind.py link one compiled stylesheet, and the
+browser paints nothing until it has downloaded it. This build step:
+
+1. renders a few sample pages of each page type (PAGE_TYPES) in headless
+   Chromium (the pdf_browser_pool BrowserPool) at a mobile and a desktop
+   viewport (VIEWPORTS)
+2. keeps the stylesheet rules whose selectors match an element above the
+   fold at either viewport - with the @media and @supports blocks around
+   them and the @keyframes they animate with
+3. inlines that CSS as <style id="critical-css"> where the stylesheet was
+   linked, and loads the stylesheet with <link rel="preload" as="style">
+   switched to rel="stylesheet" once it arrives (with a <noscript>
+   fallback)
+
+Selectors are matched without their pseudo-classes and pseudo-elements
+(.hover\\:x:hover is kept when a .hover\\:x element is above the fold), and
+a selector the browser can't parse is kept, so the critical CSS errs on
+the side of too much. Critical CSS is reused while the stylesheet and the
+sample pages' <body> are unchanged. Run after build_tailwind.py, and again
+after it rebuilds the stylesheet.
+
+Usage:
+    python build_critical_css.py [--dry-run] [--force] [--offline] [--workers N]
+
+Requires Playwright (pip install playwright && playwright install chromium).
+"""
+
+import re
+import sys
+import json
+import hashlib
+import functools
+from pathlib import Path
+
+import regex_registry
+from pdf_browser_pool import LOAD_LAZY_IMAGES, BrowserPool, page_url, wait_until_ready
+from site_build import BUILD_CACHE_DIR, asset_prefix
+from transform_engine import find_site_files, get_worker_count, make_transform, print_summary, run_transforms
+
+# Handle Windows console encoding
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+    sys.stderr.reconfigure(encoding='utf-8')
+
+# Page types: folder -> page names in it (None for every page); samples
+# are taken from the first folder
+PAGE_TYPES = {
+    'index': {'.': ['index.html']},
+    'setas': {'setas': None},
+    'qualifications': {'qualifications': None, 'templates': ['qualification.html']},
+    'short-courses': {'short-courses': None},
+}
+
+# Pages of each type rendered to find its critical CSS
+SAMPLE_PAGES = 3
+
+VIEWPORTS = {
+    'mobile': {'width': 375, 'height': 812},
+    'desktop': {'width': 1440, 'height': 900},
+}
+
+BUILD_DIR = BUILD_CACHE_DIR / 'critical'
+BUILD_STATE = BUILD_DIR / 'build.json'
+
+# Bump when the extraction changes
+BUILD_VERSION = 1
+
+# Blocks whose rules are filtered one by one
+GROUPING_RULES = ('@media', '@supports')
+
+# Browser-side filter: the selectors that match an element above the fold
+ABOVE_FOLD_SELECTORS = r"""(selectors) => {
+    const fold = window.innerHeight;
+    const state = /(?<!\\)::?[a-zA-Z-]+(\((?:[^()]|\([^()]*\))*\))?/g;
+    const aboveFold = element => element.getBoundingClientRect().top < fold;
+    return selectors.filter(selector => selector.split(',').some(part => {
+        const bare = part.replace(state, '').trim();
+        if (!bare) return true;
+        try {
+            return Array.from(document.querySelectorAll(bare)).some(aboveFold);
+        } catch (e) {
+            return true;
+        }
+    }));
+}"""
+
+# The built stylesheet's <link>, linked directly or (from an earlier run)
+# through a preload with a <noscript> fallback
+STYLESHEET_LINK = regex_registry.register_pattern(
+    'critical.stylesheet_link',
+    r'[ \t]*(?:<link rel="preload" href="[^"]*" as="style"[^>]*>\s*<noscript>)?'
+    r'<link rel="stylesheet" href="((?:\.\./)?css/tailwind\.[0-9a-f]+\.css)">(?:</noscript>)?\n?'
+)
+CRITICAL_STYLE = regex_registry.register_pattern(
+    'critical.style', r'[ \t]*<style id="critical-css">.*?</style>\n?', re.DOTALL
+)
+CSS_COMMENT = regex_registry.register_pattern('critical.css_comment', r'/\*.*?\*/', re.DOTALL)
+BODY = regex_registry.register_pattern('critical.body', r'<body\b.*', re.DOTALL)
+KEYFRAMES_NAME = regex_registry.register_pattern('critical.keyframes_name', r'@(?:-webkit-)?keyframes\s+([\w-]+)')
+
+def type_pages(folders):
+    """Pages of one page type."""
+    pages = []
+    for folder, names in folders.items():
+        for path in find_site_files([folder]):
+            if names is None or path.name in names:
+                pages.append(path)
+    return pages
+
+def linked_stylesheet(path):
+    """Site-relative path of the built stylesheet a page links, or None."""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        match = regex_registry.search(STYLESHEET_LINK, f.read())
+    if match is None:
+        return None
+    return Path(re.sub(r'^(\.\./)+', '', match.group(1)))
+
+def sample_pages(folders):
+    """Up to SAMPLE_PAGES pages of the type's first folder, spread across it."""
+    folder, names = next(iter(folders.items()))
+    pages = [path for path in type_pages({folder: names}) if linked_stylesheet(path)]
+    if len(pages) <= SAMPLE_PAGES:
+        return pages
+    step = len(pages) / SAMPLE_PAGES
+    return [pages[int(i * step)] for i in range(SAMPLE_PAGES)]
+
+def split_blocks(css):
+    """
+    Top-level (prelude, body) pairs of a stylesheet; body is None for
+    statements such as @import.
+    """
+    css = regex_registry.sub(CSS_COMMENT, '', css)
+    blocks = []
+    depth = 0
+    start = 0
+    body_start = None
+    quote = None
+    i = 0
+    while i < len(css):
+        char = css[i]
+        if quote:
+            if char == '\\':
+                i += 1
+            elif char == quote:
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif char == '{':
+            if depth == 0:
+                body_start = i
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                blocks.append((css[start:body_start].strip(), css[body_start + 1:i]))
+                start = i + 1
+        elif char == ';' and depth == 0:
+            blocks.append((css[start:i].strip(), None))
+            start = i + 1
+        i += 1
+    return [(prelude, body) for prelude, body in blocks if prelude]
+
+def is_grouping(prelude):
+    return prelude.lower().startswith(GROUPING_RULES)
+
+def style_selectors(blocks):
+    """Selector lists of every style rule, including those in grouping blocks."""
+    selectors = []
+    for prelude, body in blocks:
+        if body is None or prelude.startswith('@'):
+            if body is not None and is_grouping(prelude):
+                selectors.extend(style_selectors(split_blocks(body)))
+        else:
+            selectors.append(prelude)
+    return selectors
+
+def filter_blocks(blocks, matched):
+    """Blocks kept in the critical CSS, as text, before @keyframes are added back."""
+    kept = []
+    for prelude, body in blocks:
+        if body is None:
+            kept.append(f'{prelude};')
+        elif is_grouping(prelude):
+            inner = filter_blocks(split_blocks(body), matched)
+            if inner:
+                kept.append(f"{prelude}{{{''.join(inner)}}}")
+        elif prelude.startswith('@'):
+            # @keyframes are added back once the kept rules are known;
+            # any other at-rule (@font-face, @page) is kept
+            if not regex_registry.search(KEYFRAMES_NAME, prelude):
+                kept.append(f'{prelude}{{{body}}}')
+        elif prelude in matched:
+            kept.append(f'{prelude}{{{body}}}')
+    return kept
+
+def critical_css(css, matched):
+    """The stylesheet cut down to the rules whose selectors matched."""
+    blocks = split_blocks(css)
+    kept = filter_blocks(blocks, matched)
+    text = ''.join(kept)
+    for prelude, body in blocks:
+        name = regex_registry.search(KEYFRAMES_NAME, prelude)
+        if name and body is not None and re.search(rf'\banimation(?:-name)?:[^;}}]*\b{re.escape(name.group(1))}\b', text):
+            kept.append(f'{prelude}{{{body}}}')
+    return ''.join(kept)
+
+def above_fold_selectors(page, html_file, viewport, selectors):
+    """Load html_file at viewport and return the selectors matching an element above the fold."""
+    page.set_viewport_size(viewport)
+    page.goto(page_url(html_file))
+    page.evaluate(LOAD_LAZY_IMAGES)
+    wait_until_ready(page, html_file)
+    return page.evaluate(ABOVE_FOLD_SELECTORS, selectors)
+
+def build_key(stylesheet_css, samples):
+    """Cache key: the stylesheet, the sample pages' <body> and the extraction settings."""
+    digest = hashlib.sha256(f'{BUILD_VERSION}:{json.dumps(VIEWPORTS, sort_keys=True)}:'.encode('utf-8'))
+    digest.update(stylesheet_css.encode('utf-8'))
+    for path in samples:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            body = regex_registry.search(BODY, f.read())
+        digest.update(f'\0{path.as_posix()}\0{body.group(0) if body else ""}'.encode('utf-8'))
+    return digest.hexdigest()
+
+def load_build_state():
+    try:
+        with open(BUILD_STATE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_build_state(state):
+    BUILD_DIR.mkdir(parents=True, exist_ok=True)
+    with open(BUILD_STATE, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+
+def extract_critical(stylesheet_css, samples, pool):
+    """Critical CSS for pages like samples, over every viewport."""
+    selectors = list(dict.fromkeys(style_selectors(split_blocks(stylesheet_css))))
+    matched = set()
+    for path in samples:
+        for viewport in VIEWPORTS.values():
+            matched.update(pool.run(above_fold_selectors, path, viewport, selectors))
+    return critical_css(stylesheet_css, matched)
+
+def critical_markup(match, css):
+    """Inline critical CSS followed by the async stylesheet link."""
+    indent = re.match(r'[ \t]*', match.group(0)).group(0)
+    href = match.group(1)
+    return (f'{indent}<style id="critical-css">{css}</style>\n'
+            f'{indent}<link rel="preload" href="{href}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">\n'
+            f'{indent}<noscript><link rel="stylesheet" href="{href}"></noscript>\n')
+
+def inline_critical(content, filename, prefix, css, pages=None):
+    """Inline a page's critical CSS and load its stylesheet asynchronously."""
+    if pages is not None and filename not in pages:
+        return content
+    if regex_registry.search(STYLESHEET_LINK, content) is None:
+        return content
+    content = regex_registry.sub(CRITICAL_STYLE, '', content)
+    return regex_registry.sub(STYLESHEET_LINK, lambda match: critical_markup(match, css), content, count=1)
+
+def main():
+    dry_run = '--dry-run' in sys.argv
+    force = '--force' in sys.argv
+    offline = '--offline' in sys.argv
+    workers = get_worker_count(sys.argv)
+
+    print("Building critical CSS...")
+    print("=" * 60)
+
+    state = load_build_state()
+    critical = {}
+    with BrowserPool(offline=offline) as pool:
+        for page_type, folders in PAGE_TYPES.items():
+            samples = sample_pages(folders)
+            if not samples:
+                print(f"[SKIP] {page_type}: no page links the built stylesheet (run build_tailwind.py first)")
+                continue
+            stylesheet = linked_stylesheet(samples[0])
+            if not stylesheet.is_file():
+                print(f"[ERROR] {page_type}: {stylesheet} not found")
+                return 1
+            with open(stylesheet, 'r', encoding='utf-8') as f:
+                stylesheet_css = f.read()
+
+            key = build_key(stylesheet_css, samples)
+            previous = state.get(page_type, {})
+            if not force and previous.get('key') == key:
+                critical[page_type] = previous['css']
+                status = '[OK]'
+            else:
+                try:
+                    critical[page_type] = extract_critical(stylesheet_css, samples, pool)
+                except Exception as e:
+                    print(f"[ERROR] {page_type}: {e}")
+                    return 1
+                state[page_type] = {'key': key, 'css': critical[page_type]}
+                status = '[UPDATED]'
+            print(f"{status} {page_type}: {len(critical[page_type]) / 1024:.1f} KB critical of "
+                  f"{len(stylesheet_css) / 1024:.1f} KB ({', '.join(path.as_posix() for path in samples)})")
+    save_build_state(state)
+
+    transforms = []
+    folders = []
+    for page_type, css in critical.items():
+        for folder, names in PAGE_TYPES[page_type].items():
+            func = functools.partial(inline_critical, prefix=asset_prefix(folder), css=css, pages=names)
+            transforms.append(make_transform('critical_css', func, folders=[folder]))
+            folders.append(folder)
+    report = run_transforms(transforms=transforms, files=find_site_files(folders), dry_run=dry_run, workers=workers)
+    print_summary(report)
+    return 0 if report['errors'] == 0 else 1
+
+if __name__ == '__main__':
+    try:
+        sys.exit(main())
+    except ImportError:
+        print("Error: Playwright is required.")
+        print("Please run: pip install playwright && playwright install chromium")
+        sys.exit(1)
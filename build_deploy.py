@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Deploy build: a minified, precompressed copy of the site in dist/.
+
+The site is served exactly as it is edited - index.html is 267 KB and the
+modal scripts are indented source. This build step copies everything the
+site serves into DEPLOY_DIR, and on the way:
+
+1. minifies HTML pages: comments are removed and runs of whitespace between
+   and inside tags collapsed (to a newline when they contained one, so
+   spacing between inline elements is kept), while <pre> and <textarea>
+   content is left exactly as written; inline <script>s are minified as
+   JavaScript, JSON-LD is compacted and inline <style>s minified as CSS
+2. minifies .css and .js files
+3. writes a .br (Brotli, quality 11) and a .gz (gzip, level 9) sibling
+   next to every text file of at least MIN_COMPRESS_BYTES, for hosts that
+   serve precompressed files
+4. prints each text file's size before and after, and compressed
+
+Build tooling (scripts, notes, templates, source fonts, caches) is not
+copied, and files removed from the site are removed from DEPLOY_DIR. Files
+whose output is unchanged since the last run are not recompressed. Run it
+last, after the other build steps.
+
+Usage:
+    python build_deploy.py [--dry-run] [--workers N]
+
+Requires rjsmin, rcssmin and Brotli (pip install rjsmin rcssmin brotli).
+"""
+
+import os
+import re
+import sys
+import gzip
+import json
+import shutil
+import importlib.util
+from pathlib import Path
+
+import regex_registry
+from transform_engine import file_result, get_worker_count, run_parallel
+
+# Handle Windows console encoding
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+    sys.stderr.reconfigure(encoding='utf-8')
+
+DEPLOY_DIR = Path('dist')
+
+# Never deployed: folders by name anywhere, paths from the site root, and
+# files by pattern (hidden files and folders are skipped too)
+EXCLUDED_DIRS = {'__pycache__', 'node_modules'}
+EXCLUDED_PATHS = {DEPLOY_DIR.as_posix(), 'templates', 'fonts/source'}
+EXCLUDED_FILES = ['*.py', '*.pyc', '*.sh', '*.md', '*.jsonl', '*.backup', '~$*']
+
+# Text files that are compressed (and minified, when they have a minifier)
+COMPRESSED_SUFFIXES = {'.html', '.css', '.js', '.svg', '.json', '.xml', '.txt', '.webmanifest'}
+
+# Smaller files aren't compressed - the saving is less than a packet
+MIN_COMPRESS_BYTES = 1024
+
+BROTLI_QUALITY = 11
+GZIP_LEVEL = 9
+
+# Script types minified as JavaScript
+JS_TYPES = {'', 'text/javascript', 'application/javascript', 'module'}
+
+HTML_TOKEN = regex_registry.register_pattern(
+    'deploy.html_token',
+    r'(<(pre|textarea|script|style)\b[^>]*>)(.*?)(</\2\s*>)'
+    r'|(<!--.*?-->)'
+    r'''|(<[!/]?[a-zA-Z][^>"']*(?:(?:"[^"]*"|'[^']*')[^>"']*)*>)''',
+    re.DOTALL | re.IGNORECASE,
+)
+# Conditional comments are markup for old IE, not comments
+KEPT_COMMENT = regex_registry.register_pattern('deploy.kept_comment', r'<!--\s*\[(?:if|endif)')
+TAG_SPACE = regex_registry.register_pattern('deploy.tag_space', r'''("[^"]*"|'[^']*')|\s+''')
+SCRIPT_TYPE = regex_registry.register_pattern(
+    'deploy.script_type', r'''\btype\s*=\s*["']?([^"'\s>]*)''', re.IGNORECASE
+)
+
+def deploy_available():
+    """True when rjsmin, rcssmin and Brotli are installed."""
+    return all(importlib.util.find_spec(module) for module in ('rjsmin', 'rcssmin', 'brotli'))
+
+def collapse_space(match):
+    return '\n' if '\n' in match.group(0) else ' '
+
+def minify_tag(tag):
+    """A tag with whitespace outside its quoted attribute values collapsed."""
+    tag = regex_registry.sub(TAG_SPACE, lambda match: match.group(1) or ' ', tag)
+    return re.sub(r'\s+(/?>)$', r'\1', tag)
+
+def minify_css(css):
+    import rcssmin
+
+    return rcssmin.cssmin(css)
+
+def minify_js(js):
+    import rjsmin
+
+    return rjsmin.jsmin(js)
+
+def minify_script(open_tag, body):
+    """An inline script's content, minified by its type."""
+    match = regex_registry.search(SCRIPT_TYPE, open_tag)
+    script_type = match.group(1).lower() if match else ''
+    if script_type in JS_TYPES:
+        return minify_js(body)
+    if script_type == 'application/ld+json':
+        try:
+            return json.dumps(json.loads(body), ensure_ascii=False, separators=(',', ':'))
+        except ValueError:
+            return body
+    return body
+
+def minify_html(html):
+    """Minified HTML (see the module docstring for what is kept)."""
+    parts = []
+    # Text since the last token kept, so a removed comment doesn't leave
+    # two whitespace runs behind
+    text = ''
+    position = 0
+    for match in regex_registry.finditer(HTML_TOKEN, html):
+        text += html[position:match.start()]
+        position = match.end()
+
+        open_tag, element, body, close_tag, comment, tag = match.groups()
+        if comment is not None:
+            if not regex_registry.search(KEPT_COMMENT, comment):
+                continue
+            markup = comment
+        elif tag is not None:
+            markup = minify_tag(tag)
+        else:
+            element = element.lower()
+            if element == 'script':
+                body = minify_script(open_tag, body)
+            elif element == 'style':
+                body = minify_css(body)
+            markup = minify_tag(open_tag) + body + close_tag
+        parts.append(re.sub(r'\s+', collapse_space, text))
+        parts.append(markup)
+        text = ''
+    parts.append(re.sub(r'\s+', collapse_space, text + html[position:]))
+    return ''.join(parts).strip() + '\n'
+
+MINIFIERS = {'.html': minify_html, '.css': minify_css, '.js': minify_js}
+
+def is_excluded(relative):
+    """True for paths under the site root that are not deployed."""
+    if any(part.startswith('.') or part in EXCLUDED_DIRS for part in relative.parts):
+        return True
+    if any(relative.as_posix() == path or relative.as_posix().startswith(path + '/') for path in EXCLUDED_PATHS):
+        return True
+    return any(relative.match(pattern) for pattern in EXCLUDED_FILES)
+
+def deploy_files(root='.'):
+    """Site-relative paths of every file that is deployed, sorted."""
+    files = []
+    for directory, dirnames, filenames in os.walk(root):
+        relative_dir = Path(directory).relative_to(root)
+        dirnames[:] = [name for name in dirnames if not is_excluded(relative_dir / name)]
+        files.extend(relative_dir / name for name in filenames if not is_excluded(relative_dir / name))
+    return sorted(files)
+
+def compressed_siblings(path):
+    return path.with_name(path.name + '.br'), path.with_name(path.name + '.gz')
+
+def write_compressed(output, data, dry_run=False):
+    """Write output's .br and .gz siblings; returns their sizes (None when not compressed)."""
+    import brotli
+
+    br_path, gz_path = compressed_siblings(output)
+    if len(data) < MIN_COMPRESS_BYTES:
+        if not dry_run:
+            for path in (br_path, gz_path):
+                path.unlink(missing_ok=True)
+        return None, None
+
+    sizes = []
+    for path, compressed in ((br_path, brotli.compress(data, quality=BROTLI_QUALITY)),
+                             (gz_path, gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0))):
+        sizes.append(len(compressed))
+        if not dry_run:
+            with open(path, 'wb') as f:
+                f.write(compressed)
+    return tuple(sizes)
+
+def deploy_file(path, deploy_dir, dry_run=False):
+    """Copy one file into deploy_dir, minified and compressed when it is text."""
+    output = Path(deploy_dir) / path
+    before = path.stat().st_size
+
+    if path.suffix.lower() not in COMPRESSED_SUFFIXES:
+        current = output.is_file() and output.stat().st_size == before \
+            and output.stat().st_mtime >= path.stat().st_mtime
+        if not current and not dry_run:
+            output.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(path, output)
+        result = file_result(path, 'unchanged' if current else 'updated')
+        result.update(text=False, before=before, after=before, br=None, gz=None)
+        return result
+
+    with open(path, 'rb') as f:
+        data = f.read()
+    minify = MINIFIERS.get(path.suffix.lower())
+    if minify is not None:
+        data = minify(data.decode('utf-8', errors='replace')).encode('utf-8')
+
+    # Unchanged output keeps its compressed siblings
+    br_path, gz_path = compressed_siblings(output)
+    if output.is_file() and output.read_bytes() == data:
+        if len(data) < MIN_COMPRESS_BYTES:
+            result = file_result(path, 'unchanged')
+            result.update(text=True, before=before, after=len(data), br=None, gz=None)
+            return result
+        if br_path.is_file() and gz_path.is_file():
+            result = file_result(path, 'unchanged')
+            result.update(text=True, before=before, after=len(data),
+                          br=br_path.stat().st_size, gz=gz_path.stat().st_size)
+            return result
+
+    if not dry_run:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with open(output, 'wb') as f:
+            f.write(data)
+    br, gz = write_compressed(output, data, dry_run)
+    result = file_result(path, 'updated')
+    result.update(text=True, before=before, after=len(data), br=br, gz=gz)
+    return result
+
+def remove_stale(files, deploy_dir):
+    """Delete files in deploy_dir that are no longer deployed; returns them."""
+    expected = set()
+    for path in files:
+        output = Path(deploy_dir) / path
+        expected.update([output, *compressed_siblings(output)])
+    stale = [path for path in Path(deploy_dir).rglob('*') if path.is_file() and path not in expected]
+    for path in stale:
+        path.unlink()
+    return stale
+
+def print_deploy(results):
+    """Per-file sizes of the text files, and the totals."""
+    totals = {'before': 0, 'after': 0, 'br': 0, 'gz': 0}
+    copied = 0
+    for result in results:
+        if result['status'] == 'error':
+            print(f"[ERROR] {result['path']}: {result['error']}")
+            continue
+        if not result['text']:
+            copied += 1
+            continue
+        status = '[UPDATED]' if result['status'] == 'updated' else '[OK]'
+        line = f"{status} {result['path']}: {result['before'] / 1024:.1f} KB -> {result['after'] / 1024:.1f} KB"
+        if result['br'] is not None:
+            line += f" (br {result['br'] / 1024:.1f} KB, gz {result['gz'] / 1024:.1f} KB)"
+        print(line)
+        totals['before'] += result['before']
+        totals['after'] += result['after']
+        totals['br'] += result['br'] if result['br'] is not None else result['after']
+        totals['gz'] += result['gz'] if result['gz'] is not None else result['after']
+
+    counts = {status: sum(1 for result in results if result['status'] == status)
+              for status in ('updated', 'unchanged', 'error')}
+    print(f"\n{'='*60}")
+    print("Summary:")
+    print(f"  Written: {counts['updated']}")
+    print(f"  Unchanged: {counts['unchanged']}")
+    print(f"  Errors: {counts['error']}")
+    print(f"  Copied as-is (binary): {copied}")
+    if totals['before']:
+        print(f"  Text files: {totals['before'] / 1048576:.2f} MB -> {totals['after'] / 1048576:.2f} MB minified, "
+              f"{totals['br'] / 1048576:.2f} MB br, {totals['gz'] / 1048576:.2f} MB gz")
+    print(f"{'='*60}")
+
+def main():
+    dry_run = '--dry-run' in sys.argv
+    workers = get_worker_count(sys.argv)
+
+    if not deploy_available():
+        print("Error: rjsmin, rcssmin and Brotli are required.")
+        print("Please run: pip install rjsmin rcssmin brotli")
+        return 1
+
+    files = deploy_files()
+    print(f"Building deploy copy of {len(files)} files in {DEPLOY_DIR}/")
+    print("=" * 60)
+
+    results = run_parallel(deploy_file, files, workers, args=(DEPLOY_DIR.as_posix(), dry_run))
+    print_deploy(results)
+
+    if not dry_run:
+        for path in remove_stale(files, DEPLOY_DIR):
+            print(f"[OK] Removed {path}")
+    return 0 if all(result['status'] != 'error' for result in results) else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Self-hosted, subsetted web fonts instead of Google Fonts.
+
+Pages link Roboto and Inter stylesheets from fonts.googleapis.com (some
+qualification pages several times over), so first paint waits on two
+third-party connections. This build step:
+
+1. finds the families pages actually set (font-family declarations in
+   pages and scripts) and the weights they use (font-weight declarations
+   and Tailwind font-* classes, plus 400), mapped to the nearest weight
+   each family's Google Fonts link offers
+2. collects every character in the pages and scripts, plus printable
+   ASCII for what visitors type into forms
+3. subsets each family and weight to those characters as WOFF2, into
+   fonts/<family>-<weight>.<hash>.woff2, and writes the @font-face rules
+   (font-display: swap) to css/fonts.<hash>.css
+4. replaces each page's Google Fonts <link>s and preconnects with one
+   <link> to that stylesheet, preceded by preload hints for the regular
+   and bold weights of the families the page sets
+
+Source fonts are read from SOURCE_DIR (<Family>-<weight>.ttf) when present,
+otherwise downloaded once from Google Fonts through the vendor cache (see
+vendor_cache.py).
+
+Usage:
+    python build_fonts.py [--dry-run] [--offline] [--workers N]
+
+Requires fontTools and Brotli (pip install fonttools brotli).
+"""
+
+import io
+import re
+import sys
+import importlib.util
+from pathlib import Path
+from urllib.parse import unquote
+
+import regex_registry
+from build_tailwind import CONTENT_SCRIPTS
+from site_build import BUILD_FOLDERS, rewrite_pages, write_hashed_asset
+from transform_engine import find_site_files, get_worker_count, print_summary
+from vendor_cache import cached_body, fetch, load_index, store
+
+# Handle Windows console encoding
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+    sys.stderr.reconfigure(encoding='utf-8')
+
+FONT_DIR = Path('fonts')
+SOURCE_DIR = FONT_DIR / 'source'
+CSS_DIR = Path('css')
+CSS_STEM = 'fonts'
+
+# Weights given preload hints on pages that set the family
+PRELOAD_WEIGHTS = [400, 700]
+
+# Google Fonts serves one complete TrueType file per weight (rather than
+# WOFF2 split by script) to clients it doesn't recognise
+GOOGLE_FONTS_CSS = 'https://fonts.googleapis.com/css2?family={family}:wght@{weight}'
+SOURCE_USER_AGENT = 'Mozilla/5.0'
+
+# Always kept, so text typed into forms renders in the web font
+BASE_CHARACTERS = ''.join(chr(code) for code in range(0x20, 0x7f))
+
+# Tailwind font-weight classes
+TAILWIND_WEIGHTS = {
+    'thin': 100, 'extralight': 200, 'light': 300, 'normal': 400, 'medium': 500,
+    'semibold': 600, 'bold': 700, 'extrabold': 800, 'black': 900,
+}
+
+GOOGLE_FONTS_LINK = regex_registry.register_pattern(
+    'fonts.google_link',
+    r'[ \t]*<link\b[^>]*href="https://fonts\.googleapis\.com/css2?\?family=([^"]+)"[^>]*>\n?'
+)
+FONT_PRECONNECT = regex_registry.register_pattern(
+    'fonts.preconnect',
+    r'[ \t]*<link\b[^>]*rel="(?:preconnect|dns-prefetch)"[^>]*href="https://fonts\.(?:googleapis|gstatic)\.com"[^>]*>\n?'
+)
+BUILT_LINKS = regex_registry.register_pattern(
+    'fonts.built_links',
+    r'[ \t]*<link rel="(?:preload|stylesheet)" href="(?:\.\./)?(?:fonts/[a-z0-9-]+|css/fonts)\.[0-9a-f]+\.(?:woff2|css)"[^>]*>\n?'
+)
+FONT_FAMILY = regex_registry.register_pattern(
+    'fonts.font_family', r"""font-family:\s*['"]?([A-Za-z][\w ]*?)['"]?\s*[,;"}]"""
+)
+FONT_WEIGHT = regex_registry.register_pattern(
+    'fonts.font_weight', r'font-weight:\s*(\d{3}|bold|normal)\b'
+)
+TAILWIND_WEIGHT = regex_registry.register_pattern(
+    'fonts.tailwind_weight', r'\bfont-(' + '|'.join(TAILWIND_WEIGHTS) + r')\b'
+)
+FONT_URL = regex_registry.register_pattern(
+    'fonts.font_url', r'url\((https://fonts\.gstatic\.com/[^)]+)\)'
+)
+
+def fonts_available():
+    """True when fontTools and Brotli (for WOFF2) are installed."""
+    return all(importlib.util.find_spec(module) for module in ('fontTools', 'brotli'))
+
+def content_files():
+    """Pages and scripts scanned for fonts and characters."""
+    return find_site_files(BUILD_FOLDERS) + [path for path in CONTENT_SCRIPTS if path.exists()]
+
+def linked_families(content):
+    """Weights offered by each family a page links from Google Fonts."""
+    families = {}
+    for query in regex_registry.findall(GOOGLE_FONTS_LINK, content):
+        # family=A:wght@400;700&family=B&display=swap (& may be HTML-escaped)
+        for family in unquote(query).replace('&amp;', '&').split('&family='):
+            name, _, axes = family.split('&')[0].partition(':')
+            weights = [int(weight) for weight in re.findall(r'\d{3}', axes.partition('@')[2])] or [400]
+            families.setdefault(name.replace('+', ' '), set()).update(weights)
+    return families
+
+def used_weights(content):
+    """Font weights a page or script asks for."""
+    weights = set()
+    for value in regex_registry.findall(FONT_WEIGHT, content):
+        weights.add({'normal': 400, 'bold': 700}.get(value) or int(value))
+    for name in regex_registry.findall(TAILWIND_WEIGHT, content):
+        weights.add(TAILWIND_WEIGHTS[name])
+    return weights
+
+def nearest_weight(wanted, offered):
+    """Weight the browser would pick from offered for wanted (CSS font matching)."""
+    offered = sorted(offered)
+    if wanted in offered:
+        return wanted
+    if wanted == 400 and 500 in offered:
+        return 500
+    if wanted == 500 and 400 in offered:
+        return 400
+    lighter = [weight for weight in offered if weight < wanted]
+    heavier = [weight for weight in offered if weight > wanted]
+    if wanted <= 500:
+        return lighter[-1] if lighter else heavier[0]
+    return heavier[0] if heavier else lighter[-1]
+
+def scan_site(files):
+    """
+    (families, characters): the weights to build for each family pages
+    both link and set, and every character the files contain.
+    """
+    offered = {}
+    declared = set()
+    weights = {400}
+    characters = set(BASE_CHARACTERS)
+    for path in files:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            content = f.read()
+        for family, family_weights in linked_families(content).items():
+            offered.setdefault(family, set()).update(family_weights)
+        declared.update(regex_registry.findall(FONT_FAMILY, content))
+        weights |= used_weights(content)
+        characters.update(content)
+
+    families = {}
+    for family in sorted(offered):
+        if family in declared:
+            families[family] = sorted({nearest_weight(weight, offered[family]) for weight in weights})
+    characters = {char for char in characters if char.isprintable()}
+    return families, ''.join(sorted(characters))
+
+def font_slug(family, weight):
+    return f"{re.sub(r'[^a-z0-9]+', '-', family.lower()).strip('-')}-{weight}"
+
+def cached_fetch(url, index, offline=False, user_agent=SOURCE_USER_AGENT):
+    """Body of url from the vendor cache, fetched and stored on a miss; None when unavailable."""
+    cached = cached_body(index, url)
+    if cached is None:
+        if offline:
+            return None
+        try:
+            body, content_type = fetch(url, user_agent)
+        except Exception:
+            return None
+        store(index, url, body, content_type)
+        cached = body, content_type
+    return cached[0]
+
+def source_font(family, weight, index, offline=False):
+    """Bytes of a family's full font at one weight, or None when it can't be found."""
+    local = SOURCE_DIR / f"{family.replace(' ', '')}-{weight}.ttf"
+    if local.is_file():
+        with open(local, 'rb') as f:
+            return f.read()
+
+    css = cached_fetch(GOOGLE_FONTS_CSS.format(family=family.replace(' ', '+'), weight=weight), index, offline)
+    if css is None:
+        return None
+    match = regex_registry.search(FONT_URL, css.decode('utf-8', errors='replace'))
+    if match is None:
+        return None
+    return cached_fetch(match.group(1), index, offline)
+
+def subset_font(data, characters):
+    """A font subset to characters, as WOFF2 bytes."""
+    from fontTools import subset
+    from fontTools.ttLib import TTFont
+
+    font = TTFont(io.BytesIO(data))
+    options = subset.Options()
+    options.flavor = 'woff2'
+    options.layout_features = ['*']
+    options.name_IDs = ['*']
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(text=characters)
+    subsetter.subset(font)
+
+    buffer = io.BytesIO()
+    font.save(buffer)
+    return buffer.getvalue()
+
+def font_face(family, weight, path):
+    """@font-face rule for one built font (url relative to css/)."""
+    return (f"@font-face {{ font-family: '{family}'; font-style: normal; font-weight: {weight}; "
+            f"font-display: swap; src: url('../{path}') format('woff2'); }}")
+
+def build_fonts(families, characters, offline=False):
+    """
+    Subset every family and weight. Returns (stylesheet, fonts, missing):
+    fonts maps (family, weight) to (path, source size); nothing is written
+    when a font is missing.
+    """
+    index = load_index()
+    sources = {}
+    missing = []
+    for family, weights in families.items():
+        for weight in weights:
+            data = source_font(family, weight, index, offline)
+            if data is None:
+                missing.append(f'{family} {weight}')
+            else:
+                sources[(family, weight)] = data
+    if missing:
+        return None, {}, missing
+
+    fonts = {}
+    rules = []
+    for (family, weight), data in sources.items():
+        path = write_hashed_asset(FONT_DIR, font_slug(family, weight), '.woff2', subset_font(data, characters))
+        fonts[(family, weight)] = (path, len(data))
+        rules.append(font_face(family, weight, path.as_posix()))
+
+    stylesheet = write_hashed_asset(CSS_DIR, CSS_STEM, '.css', '\n'.join(rules) + '\n')
+    return stylesheet, fonts, []
+
+def font_links(prefix, stylesheet, preloads, indent):
+    """Preload hints and the stylesheet <link>."""
+    lines = [f'<link rel="preload" href="{prefix}{path}" as="font" type="font/woff2" crossorigin>'
+             for path in preloads]
+    lines.append(f'<link rel="stylesheet" href="{prefix}{stylesheet}">')
+    return ''.join(f'{indent}{line}\n' for line in lines)
+
+def link_fonts(content, filename, prefix, stylesheet, preloads):
+    """Replace a page's Google Fonts links with the self-hosted stylesheet."""
+    first = regex_registry.search(GOOGLE_FONTS_LINK, content) or regex_registry.search(BUILT_LINKS, content)
+    if first is None:
+        return content
+    indent = re.match(r'[ \t]*', first.group(0)).group(0)
+
+    # Preload the families this page sets
+    declared = set(regex_registry.findall(FONT_FAMILY, content))
+    paths = [path for family, path in preloads if family in declared]
+
+    marker = '\0fonts\0'
+    content = content[:first.start()] + marker + content[first.start():]
+    for pattern in (GOOGLE_FONTS_LINK, FONT_PRECONNECT, BUILT_LINKS):
+        content = regex_registry.sub(pattern, '', content)
+    return content.replace(marker, font_links(prefix, stylesheet, paths, indent))
+
+def main():
+    dry_run = '--dry-run' in sys.argv
+    offline = '--offline' in sys.argv
+    workers = get_worker_count(sys.argv)
+
+    if not fonts_available():
+        print("Error: fontTools and Brotli are required.")
+        print("Please run: pip install fonttools brotli")
+        return 1
+
+    print("Building self-hosted fonts...")
+    print("=" * 60)
+
+    families, characters = scan_site(content_files())
+    if not families:
+        print("[SKIP] No page sets a family it loads from Google Fonts")
+        return 0
+    for family, weights in families.items():
+        print(f"  {family}: weights {', '.join(str(weight) for weight in weights)}")
+    print(f"  {len(characters)} characters")
+
+    stylesheet, fonts, missing = build_fonts(families, characters, offline)
+    if missing:
+        print(f"[ERROR] Source fonts not found: {', '.join(missing)}")
+        print(f"  Put them in {SOURCE_DIR} as <Family>-<weight>.ttf, or run online to fetch them from Google Fonts")
+        return 1
+
+    for (family, weight), (path, source_size) in fonts.items():
+        print(f"[OK] {path} ({source_size / 1024:.0f} KB -> {path.stat().st_size / 1024:.1f} KB)")
+    print(f"[OK] {stylesheet}")
+
+    preloads = [(family, path.as_posix()) for (family, weight), (path, size) in fonts.items()
+                if weight in PRELOAD_WEIGHTS]
+    report = rewrite_pages('self_hosted_fonts', link_fonts, dry_run=dry_run, workers=workers,
+                           stylesheet=stylesheet.as_posix(), preloads=preloads)
+    print_summary(report)
+    return 0 if report['errors'] == 0 else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
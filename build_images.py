@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Responsive, modern-format copies of the site's photos and logos.
+
+Images/ and Client Logos/ hold full-size PNG/JPEG originals, and every page
+downloads them at that size however small they are shown. This build step:
+
+1. encodes every original as AVIF and WebP at each of WIDTHS that is
+   narrower than the original (plus the original width), into
+   Images/responsive/<name>-<width>w.<hash>.<format> - originals whose
+   bytes and settings are unchanged since the last build are skipped
+2. wraps every <img> that shows one of them in a <picture> offering the
+   AVIF and WebP srcsets, keeping the original as the fallback src
+3. gives the <img> width and height (the size its Tailwind classes give it,
+   else the original's size) so the browser reserves its box before it
+   loads, a sizes hint, and loading="lazy" below the fold - images in the
+   header and the first ABOVE_FOLD_SECTIONS sections load eagerly
+
+The <picture> is display: contents, so it adds no box of its own and the
+<img> keeps its place in flex and grid layouts. Rebuilding unwraps and
+regenerates it, so pages always point at the latest variants.
+
+Usage:
+    python build_images.py [--dry-run] [--force] [--workers N]
+
+Requires Pillow with AVIF support (pip install pillow).
+"""
+
+import io
+import re
+import sys
+import json
+import hashlib
+import importlib.util
+from pathlib import Path
+
+import regex_registry
+from site_build import BUILD_CACHE_DIR, rewrite_pages, write_hashed_asset
+from transform_engine import file_result, get_worker_count, print_summary, run_parallel
+
+# Handle Windows console encoding
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+    sys.stderr.reconfigure(encoding='utf-8')
+
+SOURCE_DIRS = [Path('Images'), Path('Client Logos')]
+SOURCE_SUFFIXES = {'.png', '.jpg', '.jpeg', '.jfif'}
+
+OUTPUT_DIR = Path('Images') / 'responsive'
+
+# Variant widths in pixels; srcset lets the browser pick by layout width and DPR
+WIDTHS = [96, 160, 320, 640, 960, 1280, 1920]
+
+# Formats in order of preference, with their Pillow save options
+FORMATS = {
+    'avif': {'quality': 50},
+    'webp': {'quality': 80, 'method': 6},
+}
+
+BUILD_DIR = BUILD_CACHE_DIR / 'images'
+BUILD_STATE = BUILD_DIR / 'build.json'
+
+# Bump when encode_variants() output changes
+BUILD_VERSION = 1
+
+# Sections after the header that are usually on screen at load: the
+# breadcrumb bar and the hero
+ABOVE_FOLD_SECTIONS = 2
+
+# Pixels per step of Tailwind's spacing scale (w-12 is 48px)
+SPACING_PX = 4
+
+IMG_TAG = regex_registry.register_pattern('images.img_tag', r'<img\b[^>]*>')
+RESPONSIVE_PICTURE = regex_registry.register_pattern(
+    'images.responsive_picture',
+    r'<picture data-responsive[^>]*>(?:\s*<source\b[^>]*>)*\s*(<img\b[^>]*>)\s*</picture>'
+)
+SECTION_END = regex_registry.register_pattern('images.section_end', r'</section>|</header>')
+FIXED_SIZE = regex_registry.register_pattern(
+    'images.fixed_size', r'(?:^|\s)([wh])-(\d+(?:\.5)?|\[(\d+)px\])(?=\s|$)'
+)
+
+def images_available():
+    """True when Pillow is installed."""
+    return importlib.util.find_spec('PIL') is not None
+
+def build_settings():
+    """Settings that change the variants, part of every source's build key."""
+    return json.dumps({'version': BUILD_VERSION, 'widths': WIDTHS, 'formats': FORMATS}, sort_keys=True)
+
+def source_images(source_dirs=SOURCE_DIRS):
+    """Originals to encode, sorted."""
+    images = []
+    for directory in source_dirs:
+        images.extend(path for path in directory.glob('*') if path.suffix.lower() in SOURCE_SUFFIXES)
+    return sorted(images)
+
+def source_key(source):
+    """Build key of an original: its bytes and the build settings."""
+    with open(source, 'rb') as f:
+        return hashlib.sha256(f.read() + build_settings().encode('utf-8')).hexdigest()
+
+def variant_stem(source):
+    """Name variants of an original are written under (folder and stem, slugged)."""
+    return re.sub(r'[^a-z0-9]+', '-', f'{source.parent.name}-{source.stem}'.lower()).strip('-')
+
+def variant_widths(width):
+    """Widths an original of the given width is encoded at."""
+    return [w for w in WIDTHS if w < width] + [min(width, WIDTHS[-1])]
+
+def encode_variants(source, output_dir=OUTPUT_DIR):
+    """
+    Encode one original at every variant width and format.
+
+    Returns a file_result() with the original's 'width' and 'height',
+    'variants' ({format: [[width, path], ...]}) and the 'before' and
+    'after' sizes of the original and its largest WebP.
+    """
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    try:
+        image = Image.open(source)
+        image.load()
+    except (UnidentifiedImageError, OSError):
+        return file_result(source, 'skipped', 'not a readable image')
+
+    image = ImageOps.exif_transpose(image)
+    has_alpha = image.mode in ('RGBA', 'LA', 'PA') or (image.mode == 'P' and 'transparency' in image.info)
+    image = image.convert('RGBA' if has_alpha else 'RGB')
+
+    stem = variant_stem(source)
+    variants = {name: [] for name in FORMATS}
+    after = 0
+    for width in variant_widths(image.width):
+        height = max(1, round(image.height * width / image.width))
+        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+        for name, options in FORMATS.items():
+            buffer = io.BytesIO()
+            resized.save(buffer, name.upper(), **options)
+            path = write_hashed_asset(output_dir, f'{stem}-{width}w', f'.{name}', buffer.getvalue())
+            variants[name].append([width, path.as_posix()])
+            if name == 'webp':
+                after = buffer.tell()
+
+    result = file_result(source, 'updated')
+    result.update(width=image.width, height=image.height, variants=variants,
+                  before=Path(source).stat().st_size, after=after)
+    return result
+
+def load_build_state():
+    try:
+        with open(BUILD_STATE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_build_state(state):
+    BUILD_DIR.mkdir(parents=True, exist_ok=True)
+    with open(BUILD_STATE, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+
+def entry_is_current(entry, key):
+    """True when a build state entry matches key and its files still exist."""
+    if not entry or entry.get('key') != key:
+        return False
+    return all(Path(path).is_file() for variants in entry['variants'].values() for width, path in variants)
+
+def build_variants(sources, force=False, workers=None):
+    """
+    Encode the originals that changed since the last build.
+
+    Returns (images, results): images maps each original's site-relative
+    path to its width, height and variants; results has one file_result()
+    per original ('cached' when the previous build was reused).
+    """
+    state = load_build_state()
+    keys = {source.as_posix(): source_key(source) for source in sources}
+
+    results = []
+    pending = []
+    for source in sources:
+        entry = state.get(source.as_posix())
+        if not force and entry_is_current(entry, keys[source.as_posix()]):
+            result = file_result(source, 'cached')
+            result.update(entry)
+            results.append(result)
+        else:
+            pending.append(source)
+
+    results.extend(run_parallel(encode_variants, pending, workers))
+
+    images = {}
+    for result in results:
+        if result['status'] in ('updated', 'cached'):
+            path = Path(result['path']).as_posix()
+            images[path] = {
+                'key': keys[path],
+                'width': result['width'],
+                'height': result['height'],
+                'variants': result['variants'],
+                'before': result['before'],
+                'after': result['after'],
+            }
+    save_build_state(images)
+    return images, sorted(results, key=lambda result: str(result['path']))
+
+def get_attribute(tag, name):
+    """Value of an attribute in a tag, or None."""
+    match = re.search(rf'\s{name}="([^"]*)"', tag)
+    return match.group(1) if match else None
+
+def set_attribute(tag, name, value):
+    """Tag with an attribute set, replacing any existing value."""
+    attribute = f' {name}="{value}"'
+    if get_attribute(tag, name) is not None:
+        return re.sub(rf'\s{name}="[^"]*"', lambda match: attribute, tag, count=1)
+    end = len(tag) - (2 if tag.endswith('/>') else 1)
+    return tag[:end].rstrip() + attribute + tag[end:]
+
+def fixed_size(classes):
+    """(width, height) in pixels set by unprefixed Tailwind w-/h- classes (None when unset)."""
+    size = {'w': None, 'h': None}
+    for axis, value, pixels in regex_registry.findall(FIXED_SIZE, classes or ''):
+        size[axis] = int(pixels) if pixels else round(float(value) * SPACING_PX)
+    return size['w'], size['h']
+
+def display_size(classes, width, height):
+    """
+    (width, height, sizes) an image is displayed at: the box its classes
+    fix, with an unset side following the image's aspect ratio, or its
+    own size shown up to the full viewport width.
+    """
+    box_width, box_height = fixed_size(classes)
+    if box_width and box_height:
+        return box_width, box_height, f'{box_width}px'
+    if box_width:
+        return box_width, max(1, round(box_width * height / width)), f'{box_width}px'
+    if box_height:
+        box_width = max(1, round(box_height * width / height))
+        return box_width, box_height, f'{box_width}px'
+    return width, height, f'(min-width: {width}px) {width}px, 100vw'
+
+def picture_markup(tag, image, prefix, lazy):
+    """A <picture> around an <img> tag offering the image's variants."""
+    width, height, sizes = display_size(get_attribute(tag, 'class'), image['width'], image['height'])
+    tag = set_attribute(tag, 'width', width)
+    tag = set_attribute(tag, 'height', height)
+    tag = set_attribute(tag, 'decoding', 'async')
+    if lazy:
+        tag = set_attribute(tag, 'loading', 'lazy')
+    elif get_attribute(tag, 'loading') == 'lazy':
+        # Left by a build that placed the image lower down the page
+        tag = re.sub(r'\sloading="lazy"', '', tag)
+
+    sources = ''.join(
+        f'<source type="image/{name}" sizes="{sizes}" srcset="'
+        + ', '.join(f'{prefix}{path} {variant_width}w' for variant_width, path in image['variants'][name])
+        + '">'
+        for name in FORMATS
+    )
+    return f'<picture data-responsive style="display: contents">{sources}{tag}</picture>'
+
+def fold_offset(content):
+    """Offset in a page past which images count as below the fold."""
+    ends = list(regex_registry.finditer(SECTION_END, content))
+    headers = [i for i, match in enumerate(ends) if match.group(0) == '</header>']
+    first = headers[0] + 1 if headers else 0
+    above = ends[first:first + ABOVE_FOLD_SECTIONS]
+    return above[-1].end() if len(above) == ABOVE_FOLD_SECTIONS else len(content)
+
+def image_source(src, prefix):
+    """Site-relative path of a local image src, or None for other URLs."""
+    if not src or '://' in src or src.startswith(('data:', '/')):
+        return None
+    if prefix:
+        if not src.startswith(prefix):
+            return None
+        src = src[len(prefix):]
+    return src.replace('%20', ' ')
+
+def link_images(content, filename, prefix, images):
+    """Serve every <img> showing a built original through its responsive variants."""
+    content = regex_registry.sub(RESPONSIVE_PICTURE, r'\1', content)
+    fold = fold_offset(content)
+
+    def rewrite(match):
+        tag = match.group(0)
+        image = images.get(image_source(get_attribute(tag, 'src'), prefix))
+        if image is None:
+            return tag
+        return picture_markup(tag, image, prefix, lazy=match.start() > fold)
+
+    return regex_registry.sub(IMG_TAG, rewrite, content)
+
+def print_images(results):
+    """Original and largest-WebP size of every image, and the totals."""
+    before = after = 0
+    for result in results:
+        if result['status'] == 'error':
+            print(f"[ERROR] {result['path']}: {result['error']}")
+            continue
+        if result['status'] == 'skipped':
+            print(f"[SKIP] {result['path']}: {result['error']}")
+            continue
+        before += result['before']
+        after += result['after']
+        widths = [width for width, path in result['variants']['webp']]
+        status = '[UPDATED]' if result['status'] == 'updated' else '[OK]'
+        print(f"{status} {result['path']}: {result['before'] / 1024:.0f} KB -> {result['after'] / 1024:.0f} KB "
+              f"webp at {widths[-1]}px ({len(widths)} widths x {len(FORMATS)} formats)")
+
+    counts = {status: sum(1 for result in results if result['status'] == status)
+              for status in ('updated', 'cached', 'skipped', 'error')}
+    print(f"\n{'='*60}")
+    print("Summary:")
+    print(f"  Encoded: {counts['updated']}")
+    print(f"  Unchanged (reused): {counts['cached']}")
+    print(f"  Skipped: {counts['skipped']}")
+    print(f"  Errors: {counts['error']}")
+    if before:
+        print(f"  Full-width originals: {before / 1048576:.1f} MB -> {after / 1048576:.1f} MB as WebP "
+              f"({100 * (after / before - 1):+.0f}%)")
+    print(f"{'='*60}")
+
+def main():
+    dry_run = '--dry-run' in sys.argv
+    force = '--force' in sys.argv
+    workers = get_worker_count(sys.argv)
+
+    # Fail once with the install hint rather than once per file
+    if not images_available():
+        raise ImportError('Pillow is required')
+
+    sources = source_images()
+    print(f"Building responsive images for {len(sources)} originals")
+    print("=" * 60)
+    images, results = build_variants(sources, force, workers)
+    print_images(results)
+
+    report = rewrite_pages('responsive_images', link_images, dry_run=dry_run, workers=workers, images=images)
+    print_summary(report)
+    errors = sum(1 for result in results if result['status'] == 'error')
+    return 0 if errors == 0 and report['errors'] == 0 else 1
+
+if __name__ == '__main__':
+    try:
+        sys.exit(main())
+    except ImportError:
+        print("Error: Pillow is required.")
+        print("Please run: pip install pillow")
+        sys.exit(1)
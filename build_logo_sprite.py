@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Pack the client logos into one sprite for the index.html carousels.
+
+The client reference carousel and the "Trusted by Leading Companies" strip
+show the same Client Logos/ files, each duplicated for the seamless loop -
+dozens of <img> tags and a request per logo. This build step:
+
+1. collects the client logos pages show (as <img> tags, or as sprite tiles
+   from an earlier build)
+2. scales each to SPRITE_HEIGHT (twice the 48px they are shown at, for
+   high-DPI screens) and packs them side by side into one WebP,
+   Images/client-logos.<hash>.webp
+3. adds a <style id="client-logo-sprite"> block to each page that uses
+   them, with a class per logo giving its aspect ratio and its offset in
+   the sprite - offsets are percentages, so a tile scales to any size
+4. replaces each logo <img> with a <span role="img"> tile: a tile keeps the
+   <img>'s classes (h-12 sets its height, the aspect ratio its width), and
+   one in a fixed w-/h- box is centred in that box like object-contain
+
+Logos the responsive image build (build_images.py) wrapped in a <picture>
+are unwrapped first.
+
+Usage:
+    python build_logo_sprite.py [--dry-run] [--workers N]
+
+Requires Pillow (pip install pillow).
+"""
+
+import io
+import re
+import sys
+import importlib.util
+from pathlib import Path
+
+import regex_registry
+from build_images import RESPONSIVE_PICTURE, fixed_size, get_attribute
+from site_build import BUILD_FOLDERS, rewrite_pages, write_hashed_asset
+from transform_engine import find_site_files, get_worker_count, print_summary
+
+# Handle Windows console encoding
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+    sys.stderr.reconfigure(encoding='utf-8')
+
+LOGO_DIR = Path('Client Logos')
+
+SPRITE_DIR = Path('Images')
+SPRITE_STEM = 'client-logos'
+
+# Height of every tile in the sprite, in pixels
+SPRITE_HEIGHT = 96
+
+# Transparent pixels between tiles, so scaling never bleeds a neighbour in
+TILE_GAP = 4
+
+WEBP_OPTIONS = {'quality': 90, 'method': 6}
+
+# Classes that only mean something on an <img>
+IMG_ONLY_CLASSES = {'object-contain', 'object-cover', 'object-center'}
+
+LOGO_IMG = regex_registry.register_pattern(
+    'logos.img', r'<img\b[^>]*\bsrc="(?:\.\./)?(?:Client Logos|Client%20Logos)/[^"]+"[^>]*>'
+)
+LOGO_TILE = regex_registry.register_pattern(
+    'logos.tile', r'\bclass="client-logo client-logo-([a-z0-9-]+)'
+)
+SPRITE_STYLE = regex_registry.register_pattern(
+    'logos.sprite_style', r'[ \t]*<style id="client-logo-sprite">.*?</style>\n?', re.DOTALL
+)
+HEAD_END = regex_registry.register_pattern('logos.head_end', r'</head>')
+
+def sprite_available():
+    """True when Pillow is installed."""
+    return importlib.util.find_spec('PIL') is not None
+
+def logo_slug(path):
+    """Class suffix of a logo file."""
+    return re.sub(r'[^a-z0-9]+', '-', Path(path).stem.lower()).strip('-')
+
+def logo_source(tag):
+    """Logo file an <img> tag shows."""
+    src = get_attribute(tag, 'src').replace('%20', ' ')
+    return LOGO_DIR / Path(src).name
+
+def collect_logos(files):
+    """Logo files shown by pages, by slug, sorted."""
+    by_slug = {logo_slug(path): path for path in LOGO_DIR.glob('*')}
+    logos = {}
+    for path in files:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            content = f.read()
+        for match in regex_registry.finditer(LOGO_IMG, content):
+            source = logo_source(match.group(0))
+            if source.is_file():
+                logos[logo_slug(source)] = source
+        for slug in regex_registry.findall(LOGO_TILE, content):
+            if slug in by_slug:
+                logos[slug] = by_slug[slug]
+    return dict(sorted(logos.items()))
+
+def build_sprite(logos):
+    """
+    Pack logos into the sprite. Returns (sprite path, tiles, sprite width)
+    where tiles maps each slug to its x offset and width in the sprite.
+    """
+    from PIL import Image
+
+    images = {}
+    for slug, source in logos.items():
+        image = Image.open(source).convert('RGBA')
+        # Crop transparent margins so the logo fills its tile
+        box = image.getbbox()
+        if box:
+            image = image.crop(box)
+        width = max(1, round(image.width * SPRITE_HEIGHT / image.height))
+        images[slug] = image.resize((width, SPRITE_HEIGHT), Image.LANCZOS)
+
+    total_width = sum(image.width for image in images.values()) + TILE_GAP * (len(images) - 1)
+    sprite = Image.new('RGBA', (total_width, SPRITE_HEIGHT), (0, 0, 0, 0))
+    tiles = {}
+    x = 0
+    for slug, image in images.items():
+        sprite.paste(image, (x, 0))
+        tiles[slug] = {'x': x, 'width': image.width}
+        x += image.width + TILE_GAP
+
+    buffer = io.BytesIO()
+    sprite.save(buffer, 'WEBP', **WEBP_OPTIONS)
+    path = write_hashed_asset(SPRITE_DIR, SPRITE_STEM, '.webp', buffer.getvalue())
+    return path, tiles, total_width
+
+def sprite_css(tiles, total_width, url):
+    """Stylesheet giving each logo tile its aspect ratio and sprite offset."""
+    lines = [
+        f'.client-logo {{ display: inline-block; background-image: url("{url}"); '
+        f'background-repeat: no-repeat; flex-shrink: 0; }}'
+    ]
+    for slug, tile in tiles.items():
+        spare = total_width - tile['width']
+        position = 100 * tile['x'] / spare if spare else 0
+        lines.append(
+            f'.client-logo-{slug} {{ aspect-ratio: {tile["width"]} / {SPRITE_HEIGHT}; '
+            f'background-size: {100 * total_width / tile["width"]:.4f}% 100%; '
+            f'background-position: {position:.4f}% 0; }}'
+        )
+    return '    <style id="client-logo-sprite">\n' + '\n'.join(f'        {line}' for line in lines) + '\n    </style>\n'
+
+def logo_tile(tag, tiles):
+    """<span> tile replacing a logo <img>."""
+    slug = logo_slug(logo_source(tag))
+    if slug not in tiles:
+        return tag
+    alt = get_attribute(tag, 'alt') or ''
+    classes = [name for name in (get_attribute(tag, 'class') or '').split() if name not in IMG_ONLY_CLASSES]
+
+    box_width, box_height = fixed_size(' '.join(classes))
+    if box_width and box_height:
+        # Centre the tile in the box, fitted to its longer side
+        fit = 'w-full' if tiles[slug]['width'] >= SPRITE_HEIGHT * box_width / box_height else 'h-full'
+        return (f'<span class="{" ".join(classes)} inline-flex items-center justify-center">'
+                f'<span role="img" aria-label="{alt}" class="client-logo client-logo-{slug} {fit}"></span></span>')
+    return f'<span role="img" aria-label="{alt}" class="client-logo client-logo-{slug} {" ".join(classes)}"></span>'
+
+def link_logos(content, filename, prefix, tiles, css):
+    """Show a page's client logos as sprite tiles and give it the sprite stylesheet."""
+    content = regex_registry.sub(
+        RESPONSIVE_PICTURE,
+        lambda match: match.group(1) if regex_registry.search(LOGO_IMG, match.group(1)) else match.group(0),
+        content,
+    )
+    content = regex_registry.sub(LOGO_IMG, lambda match: logo_tile(match.group(0), tiles), content)
+    content = regex_registry.sub(SPRITE_STYLE, '', content)
+    if regex_registry.search(LOGO_TILE, content):
+        # The sprite's URL in the stylesheet is relative to the page
+        content = regex_registry.sub(HEAD_END, lambda match: css.replace('{prefix}', prefix) + '</head>',
+                                     content, count=1)
+    return content
+
+def main():
+    dry_run = '--dry-run' in sys.argv
+    workers = get_worker_count(sys.argv)
+
+    # Fail once with the install hint rather than once per file
+    if not sprite_available():
+        raise ImportError('Pillow is required')
+
+    print("Building client logo sprite...")
+    print("=" * 60)
+
+    logos = collect_logos(find_site_files(BUILD_FOLDERS))
+    if not logos:
+        print(f"[SKIP] No pages show logos from {LOGO_DIR}")
+        return 0
+
+    sprite, tiles, total_width = build_sprite(logos)
+    before = sum(path.stat().st_size for path in logos.values())
+    print(f"[OK] {sprite} ({total_width}x{SPRITE_HEIGHT}, {sprite.stat().st_size / 1024:.1f} KB) "
+          f"replaces {len(logos)} logo files ({before / 1024:.1f} KB)")
+
+    css = sprite_css(tiles, total_width, '{prefix}' + sprite.as_posix())
+    report = rewrite_pages('client_logo_sprite', link_logos, dry_run=dry_run, workers=workers, tiles=tiles, css=css)
+    print_summary(report)
+    return 0 if report['errors'] == 0 else 1
+
+if __name__ == '__main__':
+    try:
+        sys.exit(main())
+    except ImportError:
+        print("Error: Pillow is required.")
+        print("Please run: pip install pillow")
+        sys.exit(1)
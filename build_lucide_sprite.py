@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Replace the runtime lucide icon pass with a static SVG sprite.
+
+Every page loads https://unpkg.com/lucide@latest - the whole icon library,
+unpinned - and calls lucide.createIcons() to swap each
+<i data-lucide="name"> for an inline SVG after the page has loaded. This
+build step:
+
+1. collects the icon names used by every page, the qualification page
+   template and records, and the modal scripts in js/, under their current
+   lucide names (ICON_ALIASES)
+2. reads those icons from lucide-static (LUCIDE_VERSION): from
+   node_modules/lucide-static when installed, otherwise from unpkg through
+   the vendor cache (see vendor_cache.py), so each icon is downloaded once
+3. writes them as <symbol>s into Images/lucide-sprite.<hash>.svg
+4. rewrites every <i data-lucide="name"> to
+   <svg class="lucide lucide-name ..."><use href="...sprite.svg#name"></use></svg>
+   and removes the lucide <script> and the lucide.createIcons() calls -
+   pages built earlier just have their sprite link repointed
+
+Names lucide-static doesn't have are reported and left as they are:
+lucide.createIcons() skips them too, so they render as nothing today.
+
+The modal scripts can be loaded from pages at any depth, so they resolve
+the sprite against their own URL (LUCIDE_SPRITE) instead of a fixed path.
+
+Usage:
+    python build_lucide_sprite.py [--dry-run] [--offline] [--workers N]
+"""
+
+import re
+import sys
+import json
+import functools
+import urllib.error
+from pathlib import Path
+
+import regex_registry
+from build_tailwind import CONTENT_SCRIPTS
+from generate_qualification_pages import DEFAULT_HERO_ICON, DEFAULT_RELATED_ICON, RECORDS_DIR
+from site_build import BUILD_FOLDERS, rewrite_pages, write_hashed_asset
+from transform_engine import find_site_files, get_worker_count, make_transform, print_summary, run_transforms
+from vendor_cache import VENDOR_DIR, cached_body, fetch, load_index, store
+
+# Handle Windows console encoding
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+    sys.stderr.reconfigure(encoding='utf-8')
+
+# lucide-static release the sprite is built from
+LUCIDE_VERSION = '0.460.0'
+
+ICON_DIRS = [Path('node_modules') / 'lucide-static' / 'icons']
+ICON_URL = 'https://unpkg.com/lucide-static@{version}/icons/{name}.svg'
+
+# Names pages use -> the lucide name the sprite has them under: icons lucide
+# renamed (older releases kept the old names as aliases, newer ones don't),
+# and names from other icon sets that have a lucide equivalent
+ICON_ALIASES = {
+    'alert-circle': 'circle-alert',
+    'alert-triangle': 'triangle-alert',
+    'arrow-right-circle': 'circle-arrow-right',
+    'bar-chart': 'chart-no-axes-column',
+    'bar-chart-3': 'chart-column',
+    'check-circle': 'circle-check-big',
+    'code-2': 'code-xml',
+    'edit': 'square-pen',
+    'gantt-chart': 'chart-gantt',
+    'play-circle': 'circle-play',
+    'users-2': 'users-round',
+    'balance-scale': 'scale',
+    'seedling': 'sprout',
+}
+
+SPRITE_DIR = Path('Images')
+SPRITE_STEM = 'lucide-sprite'
+
+# Attributes lucide.createIcons() puts on every icon; on the outer <svg>
+# so they are inherited by the symbol and Tailwind classes still win
+ICON_ATTRIBUTES = ('width="24" height="24" fill="none" stroke="currentColor" stroke-width="2" '
+                   'stroke-linecap="round" stroke-linejoin="round" aria-hidden="true"')
+
+# Variable the modal scripts resolve the sprite URL into
+SPRITE_VARIABLE = 'LUCIDE_SPRITE'
+
+ICON_TAG = regex_registry.register_pattern(
+    'lucide.icon_tag', r'<i data-lucide="([\w-]+)"([^>]*)></i>'
+)
+ICON_NAME = regex_registry.register_pattern(
+    'lucide.icon_name', r'(?:data-lucide="|\bclass="lucide lucide-)([\w-]+)'
+)
+CLASS_VALUE = regex_registry.register_pattern(
+    'lucide.class_value', r'\s*\bclass="([^"]*)"'
+)
+LUCIDE_SCRIPT = regex_registry.register_pattern(
+    'lucide.script', r'[ \t]*<script src="https://unpkg\.com/lucide@[^"]*"></script>\n?'
+)
+CREATE_ICONS = regex_registry.register_pattern(
+    'lucide.create_icons',
+    r'(?:[ \t]*//[^\n]*Lucide icons[^\n]*\n)?'
+    r'[ \t]*(?:if \(typeof lucide !== \'undefined\'\) \{\s*lucide\.createIcons\(\);\s*\}|lucide\.createIcons\(\);)'
+    r'[ \t]*\n?'
+)
+EMPTY_SCRIPT = regex_registry.register_pattern(
+    'lucide.empty_script', r'[ \t]*<script>\s*</script>\n?'
+)
+SPRITE_HREF = regex_registry.register_pattern(
+    'lucide.sprite_href', r'href="(?:\.\./)?Images/lucide-sprite\.[0-9a-f]+\.svg#'
+)
+SPRITE_DECLARATION = regex_registry.register_pattern(
+    'lucide.sprite_declaration', r"var LUCIDE_SPRITE = new URL\('[^']*'"
+)
+SVG_ELEMENT = regex_registry.register_pattern(
+    'lucide.svg_element', r'<svg\b([^>]*)>(.*)</svg>', re.DOTALL
+)
+VIEW_BOX = regex_registry.register_pattern(
+    'lucide.view_box', r'\bviewBox="([^"]*)"'
+)
+
+def source_files():
+    """Pages and scripts scanned for icon names."""
+    return find_site_files(BUILD_FOLDERS) + [path for path in CONTENT_SCRIPTS if path.exists()]
+
+def lucide_name(name):
+    return ICON_ALIASES.get(name, name)
+
+def record_icons(records_dir=RECORDS_DIR):
+    """Hero and related-card icons named by qualification records (filled into the template)."""
+    icons = {DEFAULT_HERO_ICON, DEFAULT_RELATED_ICON}
+    for record_file in Path(records_dir).glob('*.json'):
+        try:
+            with open(record_file, 'r', encoding='utf-8') as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            continue
+        icons.add(record.get('hero_icon'))
+        icons.update(card.get('icon') for card in record.get('related') or [])
+    icons.discard(None)
+    icons.discard('')
+    return icons
+
+def collect_icons(files):
+    """Lucide names of the icons used across files and records, sorted."""
+    icons = record_icons()
+    for path in files:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            icons.update(regex_registry.findall(ICON_NAME, f.read()))
+    return sorted({lucide_name(icon) for icon in icons})
+
+def icon_source(name, index, offline=False):
+    """
+    SVG text of one lucide-static icon; '' when lucide-static has no such
+    icon, None when it can't be read (offline and not cached, or a network
+    error).
+    """
+    installed = False
+    for directory in ICON_DIRS:
+        path = directory / f'{name}.svg'
+        if path.is_file():
+            with open(path, 'r', encoding='utf-8') as f:
+                return f.read()
+        installed = installed or directory.is_dir()
+    if installed:
+        return ''
+
+    url = ICON_URL.format(version=LUCIDE_VERSION, name=name)
+    cached = cached_body(index, url)
+    if cached is None:
+        if offline:
+            return None
+        try:
+            body, content_type = fetch(url)
+        except urllib.error.HTTPError as error:
+            return '' if error.code == 404 else None
+        except Exception:
+            return None
+        store(index, url, body, content_type)
+        cached = body, content_type
+    return cached[0].decode('utf-8')
+
+def icon_symbol(name, svg):
+    """An icon's SVG as a sprite <symbol>."""
+    match = regex_registry.search(SVG_ELEMENT, svg)
+    if match is None:
+        raise ValueError(f"{name}.svg has no <svg> element")
+    view_box = regex_registry.search(VIEW_BOX, match.group(1))
+    view_box = view_box.group(1) if view_box else '0 0 24 24'
+    body = '\n'.join(line.strip() for line in match.group(2).strip().splitlines())
+    return f'<symbol id="{name}" viewBox="{view_box}">\n{body}\n</symbol>'
+
+def build_sprite(icons, offline=False):
+    """
+    Write the sprite for icons. Returns (sprite path, names lucide-static
+    doesn't have, names that couldn't be read); unknown names are left out,
+    and nothing is written when any icon couldn't be read.
+    """
+    index = load_index()
+    symbols = []
+    unknown = []
+    missing = []
+    for name in icons:
+        svg = icon_source(name, index, offline)
+        if svg is None:
+            missing.append(name)
+        elif not svg:
+            unknown.append(name)
+        else:
+            symbols.append(icon_symbol(name, svg))
+    if missing:
+        return None, unknown, missing
+
+    sprite = (f'<svg xmlns="http://www.w3.org/2000/svg">\n'
+              f'<!-- lucide-static v{LUCIDE_VERSION} - ISC License - https://lucide.dev -->\n'
+              + '\n'.join(symbols) + '\n</svg>\n')
+    return write_hashed_asset(SPRITE_DIR, SPRITE_STEM, '.svg', sprite), unknown, []
+
+def icon_svg(match, href, unknown):
+    """
+    Static <svg><use> for one <i data-lucide> tag, keeping its class and
+    other attributes; tags naming an unknown icon are left as they are.
+    """
+    name, attributes = match.groups()
+    name = lucide_name(name)
+    if name in unknown:
+        return match.group(0)
+    classes = f'lucide lucide-{name}'
+    class_value = regex_registry.search(CLASS_VALUE, attributes)
+    if class_value:
+        classes += f' {class_value.group(1)}'
+        attributes = attributes.replace(class_value.group(0), '', 1)
+    return f'<svg class="{classes}" {ICON_ATTRIBUTES}{attributes}><use href="{href}#{name}"></use></svg>'
+
+def link_sprite(content, filename, prefix, sprite, unknown=()):
+    """Replace runtime lucide icons in a page with references to the sprite."""
+    href = f'{prefix}{sprite}'
+    content = regex_registry.sub(ICON_TAG, lambda match: icon_svg(match, href, unknown), content)
+    content = regex_registry.sub(LUCIDE_SCRIPT, '', content)
+    content = regex_registry.sub(CREATE_ICONS, '', content)
+    # Inline scripts that only created icons
+    content = regex_registry.sub(EMPTY_SCRIPT, '', content)
+    return regex_registry.sub(SPRITE_HREF, f'href="{href}#', content)
+
+def link_script_sprite(content, filename, sprite, unknown=()):
+    """Replace runtime lucide icons in a modal script, resolving the sprite against the script's URL."""
+    content = regex_registry.sub(ICON_TAG, lambda match: icon_svg(match, f'${{{SPRITE_VARIABLE}}}', unknown),
+                                 content)
+    content = regex_registry.sub(CREATE_ICONS, '', content)
+
+    # Scripts live in js/, one folder below the sprite's folder
+    declaration = f"var {SPRITE_VARIABLE} = new URL('../{sprite}'"
+    if regex_registry.search(SPRITE_DECLARATION, content):
+        return regex_registry.sub(SPRITE_DECLARATION, declaration, content)
+
+    # Declare it after the script's header comment
+    header = re.match(r'(?:[ \t]*//[^\n]*\n)*', content).group(0)
+    return (f"{header}\n// Icon sprite written by build_lucide_sprite.py, relative to this script\n"
+            f"{declaration}, document.currentScript.src).href;\n{content[len(header):]}")
+
+def rewrite_scripts(sprite, unknown=(), dry_run=False):
+    """Run link_script_sprite() over the modal scripts."""
+    transform = make_transform('lucide_sprite', functools.partial(link_script_sprite, sprite=sprite, unknown=unknown),
+                               folders=['js'])
+    return run_transforms(transforms=[transform], files=[path for path in CONTENT_SCRIPTS if path.exists()],
+                          dry_run=dry_run)
+
+def main():
+    dry_run = '--dry-run' in sys.argv
+    offline = '--offline' in sys.argv
+    workers = get_worker_count(sys.argv)
+
+    print("Building lucide icon sprite...")
+    print("=" * 60)
+
+    icons = collect_icons(source_files())
+    sprite, unknown, missing = build_sprite(icons, offline)
+    if unknown:
+        print(f"[WARN] {len(unknown)} icon names are not in lucide-static {LUCIDE_VERSION} and are left as they are "
+              f"(they render as nothing): {', '.join(unknown)}")
+    if missing:
+        print(f"[ERROR] {len(missing)} of {len(icons)} icons not found in lucide-static {LUCIDE_VERSION}: "
+              f"{', '.join(missing)}")
+        print(f"  Install them (npm install lucide-static@{LUCIDE_VERSION}) or run online to fill "
+              f"the vendor cache ({VENDOR_DIR})")
+        return 1
+    print(f"[OK] {sprite} ({sprite.stat().st_size / 1024:.1f} KB, {len(icons) - len(unknown)} icons)")
+
+    report = rewrite_pages('lucide_sprite', link_sprite, dry_run=dry_run, workers=workers,
+                           sprite=sprite.as_posix(), unknown=unknown)
+    print_summary(report)
+    script_report = rewrite_scripts(sprite.as_posix(), unknown, dry_run)
+    return 0 if report['errors'] == 0 and script_report['errors'] == 0 else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Hoist inline <style> and <script> blocks repeated across pages into
+shared, cacheable files.
+
+Most qualification and SETA pages embed the same dropdown and sticky
+banner CSS and the same enquiry form script, so every HTML response
+re-downloads them. This build step:
+
+1. splits the SHARED_FUNCTIONS declarations (the enquiry form's
+   submitEnquiry) out of the scripts they are in, as pages wrap the same
+   function in scripts that otherwise differ - a declaration runs from its
+   `function` line to the first `}` line indented the same
+2. moves per-page values out of scripts: a string property named in
+   PAGE_VALUE_KEYS (the enquiry form names the page's course and slug in
+   `Course: '...'` and `Source: '...'`) is read from window.pageValues
+   instead, and the page sets its own values in a small inline
+   <script>window.pageValues = {...};</script> before the shared file
+3. fingerprints every attribute-less inline <style> and <script> block and
+   every split-out function, after normalising away differences that don't
+   change what it does (CSS comments and whitespace; script indentation
+   and blank lines), so near-identical copies share a fingerprint
+4. writes each block found on at least MIN_PAGES pages and at least
+   MIN_BLOCK_BYTES long (smaller ones cost more as a request than inline)
+   to css/shared/<hash>.css or js/shared/<hash>.js - a block hoisted by an
+   earlier run is hoisted from any page that still has it inline
+5. replaces those blocks with a <link rel="stylesheet"> or
+   <script src> in place, so the order styles and scripts apply in is
+   unchanged (a function is loaded just before the script it came from,
+   which stays inline unless it is shared too), and deletes shared files
+   no page references any more
+
+A <style> or <script> inside another script's string (markup a script
+injects) is left alone, as are blocks with attributes (such as the
+critical CSS from build_critical_css.py) and styles with relative url()s,
+which would resolve against the shared file instead of the page. A script
+that sets the same page value twice keeps its literals, as one
+window.pageValues couldn't hold both.
+
+Usage:
+    python build_shared_blocks.py [--dry-run] [--workers N]
+"""
+
+import re
+import sys
+from pathlib import Path
+
+import regex_registry
+from site_build import BUILD_FOLDERS, rewrite_pages, short_hash
+from transform_engine import find_site_files, get_worker_count, print_summary
+
+# Handle Windows console encoding
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+    sys.stderr.reconfigure(encoding='utf-8')
+
+# Output folder and suffix for each kind of block
+SHARED_DIRS = {
+    'style': (Path('css') / 'shared', '.css'),
+    'script': (Path('js') / 'shared', '.js'),
+}
+
+# A block is hoisted when at least MIN_PAGES pages contain it...
+MIN_PAGES = 2
+# ...and it is at least this long once normalised
+MIN_BLOCK_BYTES = 512
+
+# Top-level functions hoisted on their own
+SHARED_FUNCTIONS = ['submitEnquiry']
+
+# Object properties whose string value differs from page to page; scripts
+# read them from window.pageValues instead
+PAGE_VALUE_KEYS = ['Course', 'Source', 'qualification']
+
+# Scripts come first so a <style> inside a script's string is consumed
+# with the script
+INLINE_BLOCK = regex_registry.register_pattern(
+    'shared_blocks.inline_block', r'<script>(.*?)</script>|<style>(.*?)</style>', re.DOTALL
+)
+CSS_COMMENT = regex_registry.register_pattern('shared_blocks.css_comment', r'/\*.*?\*/', re.DOTALL)
+CSS_SPACE = regex_registry.register_pattern('shared_blocks.css_space', r'\s*([{};:,>])\s*')
+RELATIVE_URL = regex_registry.register_pattern(
+    'shared_blocks.relative_url', r"""url\(\s*['"]?(?!data:|https?:|/|#)"""
+)
+FUNCTION_START = regex_registry.register_pattern(
+    'shared_blocks.function_start',
+    r'^([ \t]*)(?:async[ \t]+)?function[ \t]+(\w+)[ \t]*\(.*\{[ \t]*$',
+    re.MULTILINE,
+)
+PAGE_VALUE = regex_registry.register_pattern(
+    'shared_blocks.page_value',
+    r"""^(\w+)\s*:\s*('(?:[^'\\\n]|\\.)*'|"(?:[^"\\\n]|\\.)*")(,?)$""",
+    re.MULTILINE,
+)
+SHARED_REF = regex_registry.register_pattern(
+    'shared_blocks.shared_ref', r'(?:css/shared/[0-9a-f]+\.css|js/shared/[0-9a-f]+\.js)'
+)
+
+def normalize_style(css):
+    """CSS without comments and insignificant whitespace."""
+    css = regex_registry.sub(CSS_COMMENT, '', css)
+    css = re.sub(r'\s+', ' ', css)
+    return regex_registry.sub(CSS_SPACE, r'\1', css).strip()
+
+def normalize_script(js):
+    """A script with its lines unindented and blank lines dropped."""
+    return '\n'.join(line.strip() for line in js.splitlines() if line.strip())
+
+def extract_page_values(js):
+    """
+    A normalised script with its PAGE_VALUE_KEYS literals replaced by
+    window.pageValues lookups, and {key: literal} for the values taken out.
+    """
+    values = {}
+    for match in regex_registry.finditer(PAGE_VALUE, js):
+        if match.group(1) in PAGE_VALUE_KEYS:
+            if match.group(1) in values:
+                return js, {}
+            values[match.group(1)] = match.group(2)
+    if not values:
+        return js, {}
+
+    def lookup(match):
+        if match.group(1) not in values:
+            return match.group(0)
+        return f'{match.group(1)}: window.pageValues.{match.group(1)}{match.group(3)}'
+
+    return regex_registry.sub(PAGE_VALUE, lookup, js), values
+
+def shared_functions(js, offset):
+    """
+    (start, end, normalised text, page values) for each SHARED_FUNCTIONS
+    declaration in a script, its closing line included; positions are
+    in the page, where the script starts at offset.
+    """
+    functions = []
+    for match in regex_registry.finditer(FUNCTION_START, js):
+        if match.group(2) not in SHARED_FUNCTIONS:
+            continue
+        close = re.compile(rf'^{match.group(1)}\}}[ \t]*(?:\n|$)', re.MULTILINE).search(js, match.end())
+        if close:
+            functions.append((offset + match.start(), offset + close.end(),
+                              *extract_page_values(normalize_script(js[match.start():close.end()]))))
+    return functions
+
+def inline_blocks(content):
+    """
+    (match, kind, normalised text, page values, functions) for each inline
+    block on a page that could be hoisted. For scripts, the text is without
+    their SHARED_FUNCTIONS, which are listed (see shared_functions).
+    """
+    blocks = []
+    for match in regex_registry.finditer(INLINE_BLOCK, content):
+        if match.group(1) is not None:
+            functions = shared_functions(match.group(1), match.start(1))
+            js = match.group(1)
+            for start, end, text, values in reversed(functions):
+                js = js[:start - match.start(1)] + js[end - match.start(1):]
+            blocks.append((match, 'script', *extract_page_values(normalize_script(js)), functions))
+        elif not regex_registry.search(RELATIVE_URL, match.group(2)):
+            blocks.append((match, 'style', normalize_style(match.group(2)), {}, []))
+    return blocks
+
+def shared_path(kind, text):
+    """Where a hoisted block is written, relative to the site root."""
+    directory, suffix = SHARED_DIRS[kind]
+    return directory / f'{short_hash(text)}{suffix}'
+
+def count_blocks(pages):
+    """
+    {path: (kind, text, page count)} for the blocks, given as a set of
+    (kind, normalised text) per page, that are at least MIN_BLOCK_BYTES long
+    and on at least MIN_PAGES pages or were hoisted by an earlier run (a
+    page added since then).
+    """
+    found = {}
+    for blocks in pages:
+        for kind, text in blocks:
+            if len(text.encode('utf-8')) >= MIN_BLOCK_BYTES:
+                block_path = shared_path(kind, text)
+                found[block_path] = (kind, text, found.get(block_path, (kind, text, 0))[2] + 1)
+    return {path: block for path, block in found.items() if block[2] >= MIN_PAGES or path.exists()}
+
+def collect_shared(files):
+    """Blocks and functions to hoist: {path: (kind, text, page count)} (see count_blocks)."""
+    pages = []
+    for path in files:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            pages.append(inline_blocks(f.read()))
+
+    # Functions first, as a script is only hoisted once all its functions are
+    shared = count_blocks([{('script', function[2]) for match, kind, text, values, functions in blocks
+                            for function in functions} for blocks in pages])
+    shared.update(count_blocks([
+        {(kind, text) for match, kind, text, values, functions in blocks
+         if all(shared_path('script', function[2]) in shared for function in functions)}
+        for blocks in pages
+    ]))
+    return dict(sorted(shared.items()))
+
+def write_shared(shared):
+    """Write each hoisted block that isn't written yet."""
+    for path, (kind, text, pages) in shared.items():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if not path.exists():
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text + '\n')
+
+def block_reference(kind, href, values):
+    if kind == 'style':
+        return f'<link rel="stylesheet" href="{href}">'
+    reference = f'<script src="{href}"></script>'
+    if values:
+        config = ', '.join(f'{key}: {literal}' for key, literal in values.items())
+        reference = f'<script>window.pageValues = {{{config}}};</script>' + reference
+    return reference
+
+def hoist_blocks(content, filename, prefix, shared):
+    """Replace a page's shared inline blocks with references to their files."""
+    replacements = []
+    for match, kind, text, values, functions in inline_blocks(content):
+        hoisted = 0
+        for start, end, function_text, function_values in functions:
+            path = shared_path('script', function_text).as_posix()
+            if path in shared:
+                replacements.append((match.start(), match.start(),
+                                     block_reference('script', prefix + path, function_values)))
+                replacements.append((start, end, ''))
+                hoisted += 1
+
+        # A script is only replaced once all its functions are in files
+        path = shared_path(kind, text).as_posix()
+        if path in shared and hoisted == len(functions):
+            replacements = [replacement for replacement in replacements
+                            if not match.start() < replacement[0] < match.end()]
+            replacements.append((match.start(), match.end(), block_reference(kind, prefix + path, values)))
+    # Sorted by position; references inserted at one position keep their order
+    replacements.sort(key=lambda replacement: replacement[0])
+    for start, end, reference in reversed(replacements):
+        content = content[:start] + reference + content[end:]
+    return content
+
+def remove_unreferenced(files):
+    """Delete shared files no page links any more; returns the paths deleted."""
+    referenced = set()
+    for path in files:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            referenced.update(regex_registry.findall(SHARED_REF, f.read()))
+    deleted = []
+    for directory, suffix in SHARED_DIRS.values():
+        for path in sorted(directory.glob(f'*{suffix}')):
+            if path.as_posix() not in referenced:
+                path.unlink()
+                deleted.append(path)
+    return deleted
+
+def main():
+    dry_run = '--dry-run' in sys.argv
+    workers = get_worker_count(sys.argv)
+
+    print("Hoisting shared inline blocks...")
+    print("=" * 60)
+
+    files = find_site_files(BUILD_FOLDERS)
+    shared = collect_shared(files)
+    if not shared:
+        print(f"[SKIP] No inline block of {MIN_BLOCK_BYTES}+ bytes is repeated on {MIN_PAGES}+ pages")
+    saved = 0
+    for path, (kind, text, pages) in shared.items():
+        size = len(text.encode('utf-8'))
+        saved += size * pages
+        print(f"[OK] {path} ({kind}, {size / 1024:.1f} KB, {pages} pages)")
+    if not dry_run:
+        write_shared(shared)
+
+    report = rewrite_pages('shared_blocks', hoist_blocks, dry_run=dry_run, workers=workers,
+                           shared={path.as_posix() for path in shared})
+    print_summary(report)
+    if shared:
+        print(f"Inline bytes moved to cacheable files: {saved / 1024:.1f} KB across pages")
+
+    if not dry_run:
+        for path in remove_unreferenced(files):
+            print(f"[OK] Removed unreferenced {path}")
+    return 0 if report['errors'] == 0 else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Compile Tailwind at build time instead of in every visitor's browser.
+
+Every page loads https://cdn.tailwindcss.com, which generates the CSS for
+the page's classes on each page view and blocks rendering until it has.
+This build step:
+
+1. collects the class candidates used by every page and by the modal
+   scripts in js/ (including arbitrary values such as from-[#12265E]) -
+   when the set is unchanged since the last build, compilation is skipped
+2. runs the Tailwind CLI (TAILWIND_VERSION, the v3 engine the CDN script
+   uses) over the same files with --minify
+3. writes the result as css/tailwind.<hash>.css
+4. replaces the CDN <script> on every page with a <link> to that file, or
+   repoints an older build's <link>
+
+The CLI is the standalone `tailwindcss` binary when it is on PATH,
+otherwise `npx tailwindcss@TAILWIND_VERSION` (needs Node.js).
+
+Usage:
+    python build_tailwind.py [--dry-run] [--force] [--workers N]
+"""
+
+import re
+import sys
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import regex_registry
+from site_build import BUILD_CACHE_DIR, BUILD_FOLDERS, rewrite_pages, write_hashed_asset
+from transform_engine import find_site_files, get_worker_count, print_summary
+
+# Handle Windows console encoding
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+    sys.stderr.reconfigure(encoding='utf-8')
+
+# Tailwind release the build is pinned to (the CDN script serves v3)
+TAILWIND_VERSION = '3.4.17'
+
+# Scripts that build markup with Tailwind classes at runtime
+CONTENT_SCRIPTS = [Path('js') / 'centralized-modals.js', Path('js') / 'value-adds-popup.js']
+
+CSS_DIR = Path('css')
+CSS_STEM = 'tailwind'
+
+BUILD_DIR = BUILD_CACHE_DIR / 'tailwind'
+BUILD_STATE = BUILD_DIR / 'build.json'
+
+# Bump when the generated config or input CSS changes
+BUILD_VERSION = 1
+
+INPUT_CSS = """@tailwind base;
+@tailwind components;
+@tailwind utilities;
+"""
+
+CLASS_ATTRIBUTE = regex_registry.register_pattern(
+    'tailwind.class_attribute', r"""\bclass(?:Name)?\s*[=:]\s*(["'`])(.*?)\1""", re.DOTALL
+)
+CLASS_LIST_CALL = regex_registry.register_pattern(
+    'tailwind.class_list_call', r"""\bclassList\.(?:add|remove|toggle|replace)\(([^)]*)\)"""
+)
+STRING_LITERAL = regex_registry.register_pattern(
+    'tailwind.string_literal', r"""(["'`])([^"'`]*)\1"""
+)
+CDN_SCRIPT = regex_registry.register_pattern(
+    'tailwind.cdn_script', r'<script src="https://cdn\.tailwindcss\.com[^"]*"></script>'
+)
+BUILT_LINK = regex_registry.register_pattern(
+    'tailwind.built_link', r'href="(?:\.\./)?css/tailwind\.[0-9a-f]+\.css"'
+)
+
+def content_files():
+    """Pages and scripts Tailwind scans for classes."""
+    return find_site_files(BUILD_FOLDERS) + [path for path in CONTENT_SCRIPTS if path.exists()]
+
+def class_candidates(text):
+    """Class names used in class attributes, className and classList calls."""
+    candidates = set()
+    for quote, classes in regex_registry.findall(CLASS_ATTRIBUTE, text):
+        # Template expressions are not class names
+        classes = re.sub(r'\$\{[^}]*\}', ' ', classes)
+        candidates.update(classes.split())
+    for arguments in regex_registry.findall(CLASS_LIST_CALL, text):
+        for quote, value in regex_registry.findall(STRING_LITERAL, arguments):
+            candidates.update(value.split())
+    return candidates
+
+def collect_candidates(files):
+    """Class candidates across files, sorted."""
+    candidates = set()
+    for path in files:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            candidates |= class_candidates(f.read())
+    return sorted(candidates)
+
+def tailwind_command():
+    """Command that runs the Tailwind CLI, or None when neither is installed."""
+    executable = shutil.which('tailwindcss')
+    if executable:
+        return [executable]
+    npx = shutil.which('npx')
+    if npx:
+        return [npx, '--yes', f'tailwindcss@{TAILWIND_VERSION}']
+    return None
+
+def write_config(files):
+    """Write the generated Tailwind config and input CSS; return their paths."""
+    BUILD_DIR.mkdir(parents=True, exist_ok=True)
+    content = ',\n'.join(f'    {json.dumps(Path(path).resolve().as_posix())}' for path in files)
+    config_file = BUILD_DIR / 'tailwind.config.js'
+    with open(config_file, 'w', encoding='utf-8') as f:
+        f.write(f"module.exports = {{\n  content: [\n{content}\n  ],\n  theme: {{ extend: {{}} }},\n}};\n")
+
+    input_file = BUILD_DIR / 'input.css'
+    with open(input_file, 'w', encoding='utf-8') as f:
+        f.write(INPUT_CSS)
+    return config_file, input_file
+
+def compile_css(files):
+    """Run the Tailwind CLI over files and return the minified CSS."""
+    command = tailwind_command()
+    if command is None:
+        raise RuntimeError("Tailwind CLI not found: install Node.js (for npx) or the standalone "
+                           "tailwindcss binary from https://github.com/tailwindlabs/tailwindcss/releases")
+
+    config_file, input_file = write_config(files)
+    output_file = BUILD_DIR / 'output.css'
+    subprocess.run(command + ['-c', str(config_file), '-i', str(input_file), '-o', str(output_file), '--minify'],
+                   check=True)
+    with open(output_file, 'r', encoding='utf-8') as f:
+        return f.read()
+
+def load_build_state():
+    try:
+        with open(BUILD_STATE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_build_state(state):
+    BUILD_DIR.mkdir(parents=True, exist_ok=True)
+    with open(BUILD_STATE, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+
+def build_stylesheet(force=False):
+    """
+    Compile the stylesheet if the class candidates changed.
+
+    Returns (stylesheet path, candidates, compiled) where compiled is False
+    when the previous build was reused.
+    """
+    files = content_files()
+    candidates = collect_candidates(files)
+    key = f"{BUILD_VERSION}:{TAILWIND_VERSION}:" + ' '.join(candidates)
+
+    state = load_build_state()
+    previous = Path(state.get('stylesheet', ''))
+    if not force and state.get('key') == key and previous.is_file():
+        return previous, candidates, False
+
+    stylesheet = write_hashed_asset(CSS_DIR, CSS_STEM, '.css', compile_css(files))
+    save_build_state({'key': key, 'stylesheet': stylesheet.as_posix()})
+    return stylesheet, candidates, True
+
+def link_stylesheet(content, filename, prefix, stylesheet):
+    """Replace the Tailwind CDN script (or an older build's link) with the built stylesheet."""
+    href = f'{prefix}{stylesheet}'
+    content = regex_registry.sub(CDN_SCRIPT, f'<link rel="stylesheet" href="{href}">', content)
+    return regex_registry.sub(BUILT_LINK, f'href="{href}"', content)
+
+def main():
+    dry_run = '--dry-run' in sys.argv
+    force = '--force' in sys.argv
+    workers = get_worker_count(sys.argv)
+
+    print("Building Tailwind stylesheet...")
+    print("=" * 60)
+
+    try:
+        stylesheet, candidates, compiled = build_stylesheet(force)
+    except (RuntimeError, subprocess.CalledProcessError) as e:
+        print(f"[ERROR] {e}")
+        return 1
+
+    arbitrary = [name for name in candidates if '[' in name]
+    status = '[UPDATED]' if compiled else '[OK]'
+    print(f"{status} {stylesheet} ({stylesheet.stat().st_size / 1024:.1f} KB, {len(candidates)} class candidates, "
+          f"{len(arbitrary)} arbitrary values){'' if compiled else ' - classes unchanged, reused'}")
+
+    report = rewrite_pages('tailwind_stylesheet', link_stylesheet, dry_run=dry_run, workers=workers,
+                           stylesheet=stylesheet.as_posix())
+    print_summary(report)
+    return 0 if report['errors'] == 0 else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Web-optimized renditions and poster frames for the videos in Videos/.
+
+Pages play the Videos/ originals as they were exported (720p H.264 at
+around 2 Mbit/s), with no poster, so nothing is shown until enough video
+has downloaded. This build step:
+
+1. transcodes every video pages use into each of RENDITIONS no taller
+   than the original, as WebM (VP9) and MP4 (H.264 with the index moved
+   to the front - "faststart" - so playback starts before the download
+   ends), into Videos/optimized/<name>-<height>p.<hash>.<format>
+   - audio is dropped when every page plays the video muted
+   - videos whose bytes and settings are unchanged are skipped
+2. extracts the first frame (what autoplay shows first) as a JPEG poster
+3. rewrites each <video> that plays one of them: a <source> per
+   rendition and format (larger renditions only on wider screens, via
+   media queries), the poster, preload="metadata" for autoplaying videos
+   and preload="none" otherwise, and playsinline so autoplay also works
+   on iOS. Any fallback content inside the tag is kept.
+
+The rewritten <video> records its original in data-video, so a rebuild
+regenerates the tag from scratch.
+
+Uses ffmpeg from PATH, or the binary bundled with imageio-ffmpeg.
+
+Usage:
+    python build_videos.py [--dry-run] [--force] [--workers N]
+"""
+
+import os
+import re
+import sys
+import json
+import shutil
+import hashlib
+import subprocess
+import importlib.util
+from pathlib import Path
+
+import regex_registry
+from build_images import set_attribute
+from site_build import BUILD_CACHE_DIR, BUILD_FOLDERS, asset_prefix, rewrite_pages, write_hashed_asset
+from transform_engine import file_result, find_site_files, get_worker_count, page_folder, print_summary, run_parallel
+
+# Handle Windows console encoding
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+    sys.stderr.reconfigure(encoding='utf-8')
+
+VIDEO_DIR = Path('Videos')
+OUTPUT_DIR = VIDEO_DIR / 'optimized'
+
+# Renditions, largest first; min_width is the narrowest screen that gets
+# one (the smallest rendition is the fallback for every screen)
+RENDITIONS = [
+    {'height': 720, 'min_width': 1024, 'mp4_bitrate': '1200k', 'webm_bitrate': '900k'},
+    {'height': 480, 'min_width': 640, 'mp4_bitrate': '700k', 'webm_bitrate': '500k'},
+    {'height': 360, 'min_width': 0, 'mp4_bitrate': '400k', 'webm_bitrate': '300k'},
+]
+
+# ffmpeg arguments per format, in the order <source>s are listed
+FORMAT_ARGS = {
+    'webm': ['-c:v', 'libvpx-vp9', '-row-mt', '1', '-deadline', 'good', '-cpu-used', '4', '-c:a', 'libopus',
+             '-b:a', '96k'],
+    'mp4': ['-c:v', 'libx264', '-preset', 'slow', '-profile:v', 'high', '-pix_fmt', 'yuv420p', '-c:a', 'aac',
+            '-b:a', '128k', '-movflags', '+faststart'],
+}
+
+# JPEG quality of the poster frame (ffmpeg -q:v, 2 is best and 31 worst)
+POSTER_QUALITY = 4
+
+BUILD_DIR = BUILD_CACHE_DIR / 'videos'
+BUILD_STATE = BUILD_DIR / 'build.json'
+
+# Bump when transcode() output changes
+BUILD_VERSION = 1
+
+VIDEO_ELEMENT = regex_registry.register_pattern(
+    'videos.element', r'<video\b[^>]*>.*?</video>', re.DOTALL
+)
+VIDEO_OPEN_TAG = regex_registry.register_pattern('videos.open_tag', r'<video\b[^>]*>')
+SOURCE_TAG = regex_registry.register_pattern('videos.source_tag', r'\s*<source\b[^>]*>')
+VIDEO_SRC = regex_registry.register_pattern(
+    'videos.src', r'<(?:video|source)\b[^>]*\s(?:src|data-video)="([^"]+\.mp4)"'
+)
+
+def ffmpeg_command():
+    """ffmpeg executable, or None when neither ffmpeg nor imageio-ffmpeg is installed."""
+    executable = shutil.which('ffmpeg')
+    if executable:
+        return executable
+    if importlib.util.find_spec('imageio_ffmpeg'):
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    return None
+
+def has_attribute(tag, name):
+    """True when a tag has an attribute, with or without a value."""
+    return re.search(rf'\s{name}(?:\s|=|>|/)', tag) is not None
+
+def site_path(src, prefix):
+    """Site-relative path of a video src, or None for other URLs."""
+    if prefix:
+        if not src.startswith(prefix):
+            return None
+        src = src[len(prefix):]
+    return src.replace('%20', ' ')
+
+def video_references(files):
+    """
+    Videos pages play, mapped to True when every page that plays it plays
+    it muted (so its audio can be dropped).
+    """
+    videos = {}
+    for path in files:
+        prefix = asset_prefix(page_folder(path))
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            content = f.read()
+        for element in regex_registry.findall(VIDEO_ELEMENT, content):
+            match = regex_registry.search(VIDEO_SRC, element)
+            source = site_path(match.group(1), prefix) if match else None
+            if source and Path(source).is_file():
+                open_tag = regex_registry.search(VIDEO_OPEN_TAG, element).group(0)
+                videos[source] = videos.get(source, True) and has_attribute(open_tag, 'muted')
+    return dict(sorted(videos.items()))
+
+def build_settings(muted):
+    """Settings that change the renditions, part of every video's build key."""
+    return json.dumps({'version': BUILD_VERSION, 'renditions': RENDITIONS, 'formats': FORMAT_ARGS,
+                       'poster_quality': POSTER_QUALITY, 'muted': muted}, sort_keys=True)
+
+def source_key(source, muted):
+    """Build key of a video: its bytes and the build settings."""
+    with open(source, 'rb') as f:
+        return hashlib.sha256(f.read() + build_settings(muted).encode('utf-8')).hexdigest()
+
+def video_slug(source):
+    return re.sub(r'[^a-z0-9]+', '-', Path(source).stem.lower()).strip('-')
+
+def video_height(ffmpeg, source):
+    """Height of a video's first video stream, read from ffmpeg's stream info."""
+    info = subprocess.run([ffmpeg, '-hide_banner', '-i', str(source)], capture_output=True, text=True).stderr
+    match = re.search(r'Video:.*?, (\d+)x(\d+)', info)
+    if match is None:
+        raise ValueError('no video stream')
+    return int(match.group(2))
+
+def run_ffmpeg(ffmpeg, arguments, output_file):
+    """Run ffmpeg writing output_file; return the bytes it wrote."""
+    command = [ffmpeg, '-hide_banner', '-loglevel', 'error', '-y'] + arguments + [str(output_file)]
+    completed = subprocess.run(command, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else 'ffmpeg failed')
+    with open(output_file, 'rb') as f:
+        data = f.read()
+    os.unlink(output_file)
+    return data
+
+def transcode(source, ffmpeg, muted, output_dir=OUTPUT_DIR):
+    """
+    Encode one video's renditions and poster.
+
+    Returns a file_result() with 'renditions' ([{height, min_width,
+    webm, mp4}] largest first), 'poster', and the 'before' and 'after'
+    sizes of the original and its largest MP4 rendition.
+    """
+    source = Path(source)
+    BUILD_DIR.mkdir(parents=True, exist_ok=True)
+    slug = video_slug(source)
+    height = video_height(ffmpeg, source)
+    audio = ['-an'] if muted else []
+
+    # Renditions no taller than the original (or just the original's
+    # height), the last one served to every screen
+    chosen = [rendition for rendition in RENDITIONS if rendition['height'] <= height]
+    chosen = chosen or [dict(RENDITIONS[-1], height=height)]
+    chosen[-1] = dict(chosen[-1], min_width=0)
+
+    renditions = []
+    for rendition in chosen:
+        target = rendition['height']
+        entry = {'height': target, 'min_width': rendition['min_width']}
+        for name, format_args in FORMAT_ARGS.items():
+            bitrate = rendition[f'{name}_bitrate']
+            arguments = (['-i', str(source), '-vf', f'scale=-2:{target}', '-b:v', bitrate, '-maxrate', bitrate,
+                          '-bufsize', bitrate] + audio + format_args)
+            data = run_ffmpeg(ffmpeg, arguments, BUILD_DIR / f'{slug}-{target}p.{name}')
+            entry[name] = write_hashed_asset(output_dir, f'{slug}-{target}p', f'.{name}', data).as_posix()
+        renditions.append(entry)
+
+    data = run_ffmpeg(ffmpeg, ['-i', str(source), '-frames:v', '1', '-q:v', str(POSTER_QUALITY)],
+                      BUILD_DIR / f'{slug}-poster.jpg')
+    poster = write_hashed_asset(output_dir, f'{slug}-poster', '.jpg', data).as_posix()
+
+    result = file_result(source, 'updated')
+    result.update(renditions=renditions, poster=poster, before=source.stat().st_size,
+                  after=Path(renditions[0]['mp4']).stat().st_size)
+    return result
+
+def load_build_state():
+    try:
+        with open(BUILD_STATE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_build_state(state):
+    BUILD_DIR.mkdir(parents=True, exist_ok=True)
+    with open(BUILD_STATE, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+
+def entry_is_current(entry, key):
+    """True when a build state entry matches key and its files still exist."""
+    if not entry or entry.get('key') != key:
+        return False
+    files = [entry['poster']] + [rendition[name] for rendition in entry['renditions'] for name in FORMAT_ARGS]
+    return all(Path(path).is_file() for path in files)
+
+def build_renditions(references, ffmpeg, force=False, workers=None):
+    """
+    Transcode the videos that changed since the last build.
+
+    Returns (videos, results) as build_images.build_variants() does.
+    """
+    state = load_build_state()
+    keys = {source: source_key(source, muted) for source, muted in references.items()}
+
+    results = []
+    pending = {}
+    for source, muted in references.items():
+        entry = state.get(source)
+        if not force and entry_is_current(entry, keys[source]):
+            result = file_result(source, 'cached')
+            result.update(entry)
+            results.append(result)
+        else:
+            pending.setdefault(muted, []).append(Path(source))
+
+    for muted, sources in pending.items():
+        results.extend(run_parallel(transcode, sources, workers, args=(ffmpeg, muted)))
+
+    videos = {}
+    for result in results:
+        if result['status'] in ('updated', 'cached'):
+            path = Path(result['path']).as_posix()
+            videos[path] = {key: result[key] for key in ('renditions', 'poster', 'before', 'after')}
+            videos[path]['key'] = keys[path]
+    save_build_state(videos)
+    return videos, sorted(results, key=lambda result: str(result['path']))
+
+def source_tags(video, prefix):
+    """<source> tags for a video's renditions: per rendition, each format in FORMAT_ARGS order."""
+    tags = []
+    for rendition in video['renditions']:
+        media = f' media="(min-width: {rendition["min_width"]}px)"' if rendition['min_width'] else ''
+        for name in FORMAT_ARGS:
+            tags.append(f'<source src="{prefix}{rendition[name]}" type="video/{name}"{media}>')
+    return tags
+
+def video_markup(element, prefix, videos):
+    """Rewritten <video> element, or the element unchanged when its video wasn't built."""
+    match = regex_registry.search(VIDEO_SRC, element)
+    source = site_path(match.group(1), prefix) if match else None
+    video = videos.get(source)
+    if video is None:
+        return element
+
+    open_tag = regex_registry.search(VIDEO_OPEN_TAG, element).group(0)
+    body = element[len(open_tag):-len('</video>')]
+    indent = re.search(r'\n([ \t]*)\S', body)
+    indent = indent.group(1) if indent else ''
+
+    tag = re.sub(r'\ssrc="[^"]*"', '', open_tag, count=1)
+    tag = set_attribute(tag, 'data-video', f'{prefix}{source}')
+    tag = set_attribute(tag, 'poster', f'{prefix}{video["poster"]}')
+    tag = set_attribute(tag, 'preload', 'metadata' if has_attribute(tag, 'autoplay') else 'none')
+    if has_attribute(tag, 'autoplay') and not has_attribute(tag, 'playsinline'):
+        tag = tag[:-1].rstrip() + ' playsinline>'
+
+    # Keep fallback content, replacing the old <source> list
+    fallback = regex_registry.sub(SOURCE_TAG, '', body).strip()
+    lines = source_tags(video, prefix) + ([fallback] if fallback else [])
+    closing_indent = indent[:-4] if len(indent) >= 4 else ''
+    return tag + ''.join(f'\n{indent}{line}' for line in lines) + f'\n{closing_indent}</video>'
+
+def link_videos(content, filename, prefix, videos):
+    """Point every <video> playing a built video at its renditions and poster."""
+    return regex_registry.sub(VIDEO_ELEMENT, lambda match: video_markup(match.group(0), prefix, videos), content)
+
+def print_videos(results):
+    """Original and largest-MP4 size of every video, and the totals."""
+    before = after = 0
+    for result in results:
+        if result['status'] == 'error':
+            print(f"[ERROR] {result['path']}: {result['error']}")
+            continue
+        before += result['before']
+        after += result['after']
+        heights = ', '.join(f"{rendition['height']}p" for rendition in result['renditions'])
+        status = '[UPDATED]' if result['status'] == 'updated' else '[OK]'
+        print(f"{status} {result['path']}: {result['before'] / 1024:.0f} KB -> {result['after'] / 1024:.0f} KB "
+              f"largest MP4 ({heights})")
+
+    errors = sum(1 for result in results if result['status'] == 'error')
+    print(f"\n{'='*60}")
+    print("Summary:")
+    print(f"  Transcoded: {sum(1 for result in results if result['status'] == 'updated')}")
+    print(f"  Unchanged (reused): {sum(1 for result in results if result['status'] == 'cached')}")
+    print(f"  Errors: {errors}")
+    if before:
+        print(f"  Originals: {before / 1048576:.1f} MB -> {after / 1048576:.1f} MB at the largest rendition "
+              f"({100 * (after / before - 1):+.0f}%)")
+    print(f"{'='*60}")
+
+def main():
+    dry_run = '--dry-run' in sys.argv
+    force = '--force' in sys.argv
+    workers = get_worker_count(sys.argv)
+
+    ffmpeg = ffmpeg_command()
+    if ffmpeg is None:
+        print("[ERROR] ffmpeg not found: install ffmpeg, or run: pip install imageio-ffmpeg")
+        return 1
+
+    references = video_references(find_site_files(BUILD_FOLDERS))
+    print(f"Building renditions for {len(references)} videos")
+    print("=" * 60)
+    videos, results = build_renditions(references, ffmpeg, force, workers)
+    print_videos(results)
+
+    report = rewrite_pages('video_renditions', link_videos, dry_run=dry_run, workers=workers, videos=videos)
+    print_summary(report)
+    errors = sum(1 for result in results if result['status'] == 'error')
+    return 0 if errors == 0 and report['errors'] == 0 else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 """
 Export all qualification page links and details to CSV (simple version without external dependencies)
+Page facts come from the cached QualificationPage model (see qualification_page.py),
+so unchanged pages are not re-parsed.
 """
 
 import os
@@ -8,22 +10,15 @@ import csv
 import re
 from pathlib import Path
 
+from qualification_page import load_page
+
 def extract_qualification_info(html_file):
-    """Extract qualification information from HTML file using regex"""
+    """Extract qualification information from the page's cached model"""
     try:
-        with open(html_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Extract title from <title> tag
-        title_match = re.search(r'<title>(.*?)</title>', content, re.IGNORECASE | re.DOTALL)
-        title = title_match.group(1).strip() if title_match else ''
+        page = load_page(html_file)
 
-        # Try to get qualification name from h1
-        h1_match = re.search(r'<h1[^>]*>(.*?)</h1>', content, re.IGNORECASE | re.DOTALL)
-        if h1_match:
-            qual_name = re.sub(r'<[^>]+>', '', h1_match.group(1)).strip()
-        else:
-            qual_name = title
+        # Hero heading, falling back to the <title> tag
+        qual_name = page.name or page.title
 
         # Clean up qualification name
         qual_name = re.sub(r'\s+', ' ', qual_name)
@@ -54,15 +49,11 @@ def extract_qualification_info(html_file):
         elif filename.startswith('skills-'):
             seta = 'Skills'
 
-        # Extract NQF Level from filename
-        nqf_match = re.search(r'nqf(\d+)', filename.lower())
-        nqf_level = f"NQF {nqf_match.group(1)}" if nqf_match else ''
+        # NQF Level from the sidebar (falls back to the filename)
+        nqf_level = f"NQF {page.nqf_level}" if page.nqf_level else ''
 
-        # Extract NLRD/SAQA ID if available
-        nlrd_id = ''
-        nlrd_match = re.search(r'(NLRD|SAQA)\s*ID[:\s]*(\d{5,})', content, re.I)
-        if nlrd_match:
-            nlrd_id = nlrd_match.group(2)
+        # NLRD/SAQA ID if available
+        nlrd_id = page.qualification_id
 
         # Get relative path for URL
         relative_path = f"qualifications/{filename}"
@@ -7,17 +7,49 @@ import os
 import re
 from pathlib import Path
 
+import regex_registry
+
+# Link text fixes, compiled once and profiled by regex_registry
+RETAIL_OPERATIONS_TITLE = regex_registry.register_pattern(
+    'broken_links.retail_operations_title',
+    r'(<a href="services-management-nqf3\.html"[^>]*>.*?)<h3[^>]*>Retail Operations</h3>',
+    re.DOTALL
+)
+RETAIL_OPERATIONS_DESCRIPTION = regex_registry.register_pattern(
+    'broken_links.retail_operations_description',
+    r'(href="services-management-nqf3\.html".*?)Advanced retail skills and operations management\.',
+    re.DOTALL
+)
+BUSINESS_ADMIN_TITLE = regex_registry.register_pattern(
+    'broken_links.business_admin_title',
+    r'(<a href="services-office-supervision-nqf5\.html"[^>]*>.*?)<h3[^>]*>Business Administration</h3>',
+    re.DOTALL
+)
+BUSINESS_ADMIN_DESCRIPTION = regex_registry.register_pattern(
+    'broken_links.business_admin_description',
+    r'(href="services-office-supervision-nqf5\.html".*?)Advanced business and administrative skills\.',
+    re.DOTALL
+)
+
+def register_link_pattern(replacements):
+    """Register one alternation pattern matching every broken href"""
+    alternatives = '|'.join(re.escape(old_link) for old_link in sorted(replacements, key=len, reverse=True))
+    return regex_registry.register_pattern('broken_links.href', f'href="({alternatives})"')
+
 def replace_broken_links(filepath, replacements):
     """Replace broken links in a file"""
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
             content = f.read()
 
-        modified = False
-        for old_link, new_link in replacements.items():
-            if old_link in content:
-                content = content.replace(f'href="{old_link}"', f'href="{new_link}"')
-                modified = True
+        # One pass over the page for all links instead of one per link
+        pattern_name = register_link_pattern(replacements)
+        content, count = regex_registry.subn(
+            pattern_name,
+            lambda match: f'href="{replacements[match.group(1)]}"',
+            content
+        )
+        modified = count > 0
 
         if modified:
             with open(filepath, 'w', encoding='utf-8') as f:
@@ -106,26 +138,22 @@ def main():
                 # Update the text for retail operations link
                 if 'services-management-nqf3.html' in content and 'Retail Operations' in content:
                     # Find and replace the entire block for retail operations
-                    pattern = r'(<a href="services-management-nqf3\.html"[^>]*>.*?)<h3[^>]*>Retail Operations</h3>'
                     replacement = r'\1<h3 class="font-bold text-lg text-gray-900">Management</h3>'
-                    content = re.sub(pattern, replacement, content, flags=re.DOTALL)
+                    content = regex_registry.sub(RETAIL_OPERATIONS_TITLE, replacement, content)
 
                     # Also update the description
-                    pattern = r'(href="services-management-nqf3\.html".*?)Advanced retail skills and operations management\.'
                     replacement = r'\1Management fundamentals and team leadership skills.'
-                    content = re.sub(pattern, replacement, content, flags=re.DOTALL)
+                    content = regex_registry.sub(RETAIL_OPERATIONS_DESCRIPTION, replacement, content)
 
                 # Update the text for business administration NQF5 link
                 if 'services-office-supervision-nqf5.html' in content and 'Business Administration' in content and 'NQF Level 5' in content:
                     # Find and replace the title in the related qualifications
-                    pattern = r'(<a href="services-office-supervision-nqf5\.html"[^>]*>.*?)<h3[^>]*>Business Administration</h3>'
                     replacement = r'\1<h3 class="font-bold text-lg text-gray-900">Office Supervision</h3>'
-                    content = re.sub(pattern, replacement, content, flags=re.DOTALL)
+                    content = regex_registry.sub(BUSINESS_ADMIN_TITLE, replacement, content)
 
                     # Update the description
-                    pattern = r'(href="services-office-supervision-nqf5\.html".*?)Advanced business and administrative skills\.'
                     replacement = r'\1Office management and supervisory skills.'
-                    content = re.sub(pattern, replacement, content, flags=re.DOTALL)
+                    content = regex_registry.sub(BUSINESS_ADMIN_DESCRIPTION, replacement, content)
 
                 with open(filepath, 'w', encoding='utf-8') as f:
                     f.write(content)
@@ -137,5 +165,7 @@ def main():
     print("=" * 60)
     print("Link fixing complete!")
 
+    regex_registry.print_profile()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -10,6 +10,27 @@ import os
 import re
 from pathlib import Path
 
+def apply_nav_styling(content, filename=None):
+    """Return content with the Roboto nav styling applied"""
+    # Add nav font-family styling if not present
+    if 'nav {' not in content and 'nav{' not in content:
+        # Add after <style> tag
+        content = re.sub(
+            r'(<style>)',
+            r'\1\n        nav { font-family: \'Roboto\', sans-serif; }',
+            content,
+            count=1
+        )
+
+    # Ensure Roboto font is loaded (add if not present) - from Google Fonts,
+    # or from the self-hosted stylesheet build_fonts.py links instead
+    if 'family=Roboto' not in content and not re.search(r'css/fonts\.[0-9a-f]+\.css', content):
+        # Add before </head>
+        roboto_link = '    <link href="https://fonts.googleapis.com/css2?family=Roboto:wght@300;400;500;700;900&display=swap" rel="stylesheet">\n'
+        content = content.replace('</head>', roboto_link + '</head>')
+
+    return content
+
 def fix_nav_styling(file_path):
     """Fix navigation styling in a single HTML file"""
     try:
@@ -17,22 +38,7 @@ def fix_nav_styling(file_path):
             content = f.read()
 
         original_content = content
-
-        # Add nav font-family styling if not present
-        if 'nav {' not in content and 'nav{' not in content:
-            # Add after <style> tag
-            content = re.sub(
-                r'(<style>)',
-                r'\1\n        nav { font-family: \'Roboto\', sans-serif; }',
-                content,
-                count=1
-            )
-
-        # Ensure Roboto font is loaded (add if not present)
-        if 'family=Roboto' not in content:
-            # Add before </head>
-            roboto_link = '    <link href="https://fonts.googleapis.com/css2?family=Roboto:wght@300;400;500;700;900&display=swap" rel="stylesheet">\n'
-            content = content.replace('</head>', roboto_link + '</head>')
+        content = apply_nav_styling(content)
 
         # Only save if changes were made
         if content != original_content:
@@ -0,0 +1,1047 @@
+#!/usr/bin/env python3
+"""
+Generate qualifications/*.html from per-qualification records and one template.
+
+Each qualification is a JSON record in RECORDS_DIR. Rendering fills
+templates/qualification.html (string.Template placeholders) with the record's
+hero, main column, sidebar, related qualifications and call to action, built
+here from its fields, so shared markup - head, header, footer, enquiry modal
+and scripts - lives in one place instead of being patched into 70+ pages by
+fix_ scripts.
+
+Usage:
+    python generate_qualification_pages.py --seed      # create records from the current pages
+    python generate_qualification_pages.py             # render pages whose record or template changed
+    python generate_qualification_pages.py --dry-run   # report what would change
+    python generate_qualification_pages.py --force     # re-render everything
+    python generate_qualification_pages.py --adopt     # also replace pages not written by this script
+    python generate_qualification_pages.py --workers 4 # render in 4 processes
+
+--seed builds a record for every existing page (via qualification_page),
+filling gaps from the page's qualification_catalog entry - credits, NQF
+level, formal name and modules from qualifications_data.csv, the
+spreadsheets and the "Qualifications detail" txt files. Existing records are
+never overwritten. Seeding normalises a page onto the template: the hero
+stats and sidebar rows come from the typed fields, modules and careers from
+the parsed lists, and only the main column's prose is kept as markup. It
+reports hero stats that disagree with the sidebar, sidebar rows and empty
+sections it can't carry over and any page text the record doesn't render,
+and refuses pages without a hero, a name or a main column whose tags balance.
+
+Rendering never replaces an existing page the last render didn't write -
+such as a page just seeded, whose head, header, footer and scripts still
+differ from the template's - unless --adopt is passed.
+
+Text fields in a record hold HTML-ready text. page_title, meta_description,
+seta_link, header_subtitle, breadcrumb_title, enquiry_title and programme are
+left empty unless they differ from what the other fields give. overview_html
+and closing_html - the prose before and after the modules - are the only
+markup: the hand-written overview, entry requirements, outcomes and the like.
+"""
+
+import re
+import sys
+import html
+import json
+import hashlib
+from pathlib import Path
+from string import Template
+
+import regex_registry
+from qualification_page import (parse_page, first_int, strip_tags, empty_sections, module_sections,
+                                EXCLUDED_FILES, ID_LABELS, MODULE, MODULES_HEADING, MODULE_ITEM)
+from qualification_catalog import load_catalog, get_by_slug
+from transform_engine import (file_result, run_parallel, build_report, print_results,
+                              print_summary, get_worker_count)
+
+# Handle Windows console encoding
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+    sys.stderr.reconfigure(encoding='utf-8')
+
+RECORDS_DIR = Path('qualification_records')
+TEMPLATE_FILE = Path('templates') / 'qualification.html'
+OUTPUT_DIR = Path('qualifications')
+PDF_DIR = Path('Qualifications PDF')
+RENDER_MANIFEST = Path('.cache') / 'render_manifest.json'
+
+# Bump when render_page() output changes so every page is re-rendered
+GENERATOR_VERSION = 4
+
+DEFAULT_HERO_ICON = 'award'
+DEFAULT_RELATED_ICON = 'graduation-cap'
+DEFAULT_MODULES_TITLE = 'Core Modules'
+DEFAULT_RELATED_TITLE = 'Related Qualifications'
+DEFAULT_HELP_TEXT = 'Contact our qualification specialists for guidance.'
+DEFAULT_HERO_IMAGE = ('https://images.pexels.com/photos/3184465/pexels-photo-3184465.jpeg'
+                      '?auto=compress&cs=tinysrgb&w=1260&h=750&dpr=2')
+
+# Hero stat cards, module cards and sidebar lists alternate between these styles
+HERO_STAT_STYLES = [
+    ('bg-[#12265E]', 'text-[#ffa600]', 'text-white'),
+    ('bg-[#92abc4]', 'text-white', 'text-white'),
+]
+CARD_BACKGROUNDS = ['bg-[#12265E]', 'bg-[#92abc4]']
+
+# Sidebar rows built from typed fields; any other row is kept in extra_details
+SIDEBAR_FIELDS = ['SETA', 'NQF Level', 'NQF level', 'Credits', 'Duration'] + ID_LABELS
+
+# Text fields seeded empty when they match what the other fields render
+OVERRIDE_FIELDS = ['page_title', 'meta_description', 'seta_link', 'header_subtitle', 'breadcrumb_title', 'enquiry_title']
+
+HERO_SECTION = regex_registry.register_pattern(
+    'generator.hero_section', r'<!-- Hero Section -->(.*?)<!-- Qualification Details -->', re.DOTALL
+)
+MAIN_COLUMN = regex_registry.register_pattern(
+    'generator.main_column', r'<div class="lg:col-span-2">(.*?)</div>\s*<!-- Sidebar -->', re.DOTALL
+)
+SIDEBAR_SECTION = regex_registry.register_pattern(
+    'generator.sidebar_section',
+    r'<!-- Sidebar -->(.*?)(?=<!-- Related (?:Qualifications|Programmes) -->|<!-- CTA Section -->'
+    r'|<!-- Enquiry Modal -->|<!-- Footer -->)', re.DOTALL
+)
+RELATED_SECTION = regex_registry.register_pattern(
+    'generator.related_section',
+    r'<!-- Related (?:Qualifications|Programmes) -->(.*?)(?=<!-- CTA Section -->|<!-- Enquiry Modal -->|<!-- Footer -->)',
+    re.DOTALL
+)
+CTA_SECTION = regex_registry.register_pattern(
+    'generator.cta_section', r'<!-- CTA Section -->\s*<section[^>]*>(.*?)</section>', re.DOTALL
+)
+# Content sections of a page, for checking what a record doesn't render
+PAGE_CONTENT = regex_registry.register_pattern(
+    'generator.page_content', r'<!-- Hero Section -->(.*?)(?=<!-- Enquiry Modal -->|<!-- Footer -->|$)', re.DOTALL
+)
+# <i data-lucide="name">, or the <svg class="lucide lucide-name"> build_lucide_sprite.py turns it into
+HERO_ICON = regex_registry.register_pattern('generator.hero_icon', r'(?:data-lucide="|\bclass="lucide lucide-)([\w-]+)')
+HERO_TAGLINE = regex_registry.register_pattern(
+    'generator.hero_tagline',
+    r'<span class="[^"]*font-semibold[^"]*">\s*NQF Level\s*\d+\s*\|\s*(.*?)\s*</span>', re.DOTALL
+)
+HERO_SUBTITLE = regex_registry.register_pattern(
+    'generator.hero_subtitle', r'</h1>\s*<h2[^>]*>\s*(.*?)\s*</h2>', re.DOTALL
+)
+HERO_INTRO = regex_registry.register_pattern(
+    'generator.hero_intro', r'<p class="text-lg[^"]*">\s*(.*?)\s*</p>', re.DOTALL
+)
+HERO_IMAGE = regex_registry.register_pattern(
+    'generator.hero_image', r'<img src="([^"]+)"\s+alt="([^"]*)"'
+)
+META_DESCRIPTION = regex_registry.register_pattern(
+    'generator.meta_description', r'<meta name="description" content="([^"]*)"'
+)
+BREADCRUMB = regex_registry.register_pattern(
+    'generator.breadcrumb',
+    r'<a href="\.\./setas/([^"]+)\.html"[^>]*>\s*(.*?)\s*</a>\s*<span class="mx-2">/</span>\s*'
+    r'<span class="text-\[#12265E\] font-semibold">\s*(.*?)\s*</span>', re.DOTALL
+)
+ENQUIRY_TITLE = regex_registry.register_pattern(
+    'generator.enquiry_title', r'Enquire About\s+(.*?)\s*</h2>', re.DOTALL
+)
+PDF_LINK = regex_registry.register_pattern(
+    'generator.pdf_link', r'href="\.\./Qualifications PDF/([^"]+\.pdf)"'
+)
+# The line under "SpecCon Holdings" in the site header
+HEADER_SUBTITLE = regex_registry.register_pattern(
+    'generator.header_subtitle', r'SpecCon Holdings</h1>\s*<p class="[^"]*">\s*(.*?)\s*</p>', re.DOTALL
+)
+PAGE_TITLE = regex_registry.register_pattern('generator.page_title', r'<title>(.*?)</title>', re.DOTALL)
+HEADING = regex_registry.register_pattern('generator.heading', r'<(h[1-6])[^>]*>(.*?)</\1>', re.DOTALL)
+# Headed bullet lists in the sidebar, with an optional intro line: the careers
+# and others (Career Progression, Specialisation Areas, ...)
+SIDEBAR_LIST = regex_registry.register_pattern(
+    'generator.sidebar_list',
+    r'<(h[3-6])[^>]*>\s*([^<]*?)\s*</\1>\s*(?:<div[^>]*>\s*)?(?:<p[^>]*>\s*((?:(?!</p>).)*?)\s*</p>\s*)?<ul[^>]*>(.*?)</ul>',
+    re.DOTALL
+)
+SAQA_LINK = regex_registry.register_pattern(
+    'generator.saqa_link', r"""(?:window\.open\('|<a href=")(https?://[^'"]*saqa[^'"]*)['"]"""
+)
+# The formal qualification name render_sidebar() puts under the sidebar heading
+FORMAL_NAME = regex_registry.register_pattern(
+    'generator.formal_name', r'Qualification Details</h3>\s*<p class="text-sm text-gray-600 mb-6">\s*(.*?)\s*</p>', re.DOTALL
+)
+HELP_TEXT = regex_registry.register_pattern(
+    'generator.help_text', r'Need Help\?\s*</h4>\s*<p[^>]*>\s*(.*?)\s*</p>', re.DOTALL
+)
+MODULES_INTRO = regex_registry.register_pattern(
+    'generator.modules_intro', r'^<(h[23])[^>]*>.*?</\1>\s*<p[^>]*>\s*(.*?)\s*</p>', re.DOTALL
+)
+SECTION_INTRO = regex_registry.register_pattern(
+    'generator.section_intro', r'<h2[^>]*>\s*(.*?)\s*</h2>\s*(?:<p[^>]*>\s*(.*?)\s*</p>)?', re.DOTALL
+)
+# wr-generic-management misses a </a>, so a card runs to the next card's <a href
+RELATED_CARD = regex_registry.register_pattern(
+    'generator.related_card', r'<a href="([^"]+)"(.*?)(?=<a href="|$)', re.DOTALL
+)
+RELATED_LABEL = regex_registry.register_pattern(
+    'generator.related_label', r'<span class="text-sm[^"]*">\s*(.*?)\s*</span>', re.DOTALL
+)
+RELATED_TITLE = regex_registry.register_pattern(
+    'generator.related_title', r'<h3[^>]*>\s*(.*?)\s*</h3>', re.DOTALL
+)
+RELATED_DESCRIPTION = regex_registry.register_pattern(
+    'generator.related_description', r'<p class="text-gray-600[^"]*">\s*(.*?)\s*</p>', re.DOTALL
+)
+CTA_TEXT = regex_registry.register_pattern('generator.cta_text', r'<p[^>]*>\s*(.*?)\s*</p>', re.DOTALL)
+DURATION = regex_registry.register_pattern('generator.duration', r'^\s*(.*?\d)\s*([A-Za-z]+)\s*$')
+# Tags and comments, for splitting markup into its top-level blocks
+BLOCK_TAG = regex_registry.register_pattern(
+    'generator.block_tag', r'<!--.*?-->|<(/?)([a-zA-Z][\w-]*)\b[^>]*?(/?)>', re.DOTALL
+)
+COMMENT = regex_registry.register_pattern('generator.comment', r'<!--.*?-->', re.DOTALL)
+TEXT_NODE = regex_registry.register_pattern('generator.text_node', r'>([^<]+)<')
+
+VOID_ELEMENTS = {'area', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'wbr'}
+
+def slug_for(filename):
+    """Record slug for a page filename."""
+    return Path(filename).stem
+
+def js_string(value):
+    """Escape a value for a single-quoted JavaScript string."""
+    return str(value).replace('\\', '\\\\').replace("'", "\\'")
+
+def duration_parts(duration):
+    """('12-18', 'Months') for '12-18 Months'; a duration without a unit is its own value."""
+    match = regex_registry.search(DURATION, duration or '')
+    return match.groups() if match else (duration, 'Duration')
+
+def hero_stats(record):
+    """Hero stat cards from the record's credits, duration and NQF level."""
+    stats = []
+    if record.get('credits'):
+        stats.append({'value': str(record['credits']), 'label': 'Credits'})
+    if record.get('duration'):
+        value, unit = duration_parts(record['duration'])
+        stats.append({'value': value, 'label': unit})
+    if record.get('nqf_level'):
+        stats.append({'value': f"NQF {record['nqf_level']}", 'label': 'Level'})
+    return stats
+
+def top_level_blocks(markup):
+    """
+    [start, end] spans of markup's top-level elements, each with the comments
+    just before it, or None when its tags don't balance.
+    """
+    blocks = []
+    depth = 0
+    start = None
+    for match in regex_registry.finditer(BLOCK_TAG, markup):
+        closing, tag, self_closing = match.groups()
+        if tag is None:
+            if depth == 0 and start is None:
+                start = match.start()
+        elif tag.lower() in VOID_ELEMENTS or self_closing:
+            if depth == 0:
+                blocks.append([match.start() if start is None else start, match.end()])
+                start = None
+        elif closing:
+            depth -= 1
+            if depth < 0:
+                return None
+            if depth == 0:
+                blocks.append([start, match.end()])
+                start = None
+        else:
+            if depth == 0 and start is None:
+                start = match.start()
+            depth += 1
+    return blocks if depth == 0 else None
+
+def split_main_column(markup, modules):
+    """
+    (prose before, prose after, problem): the main column's prose around its
+    modules section, or None, None and why when its tags don't balance or a
+    block mixes module cards with other headings.
+
+    Module blocks are those whose headings are all module titles or modules
+    headings, with at least one module title; a block holding only a modules
+    heading belongs to them when module blocks follow it. Blocks without text
+    between module blocks go with them.
+    """
+    blocks = top_level_blocks(markup)
+    if blocks is None:
+        return None, None, "main column tags don't balance"
+
+    titles = {module['title'] for module in modules}
+    kinds = []
+    for start, end in blocks:
+        block = markup[start:end]
+        headings = [strip_tags(match.group(0)) for match in regex_registry.finditer(HEADING, block)]
+        module_titles = [heading for heading in headings if heading in titles]
+        module_headings = [heading for heading in headings if heading in titles
+                           or regex_registry.search(MODULES_HEADING, f'<h2>{heading}</h2>')]
+        if not headings and not strip_tags(regex_registry.sub(COMMENT, '', block)):
+            kinds.append('empty')
+        elif module_titles or module_headings and len(module_headings) == len(headings):
+            if len(module_headings) != len(headings):
+                other = next(heading for heading in headings if heading not in module_headings)
+                return None, None, f'modules share a block with the "{other}" heading'
+            kinds.append('module' if module_titles else 'heading')
+        else:
+            kinds.append('prose')
+
+    before, after = [], []
+    for index, (start, end) in enumerate(blocks):
+        kind = kinds[index]
+        if kind == 'heading':
+            following = next((later for later in kinds[index + 1:] if later != 'empty'), None)
+            kind = 'module' if following == 'module' else 'prose'
+        elif kind == 'empty':
+            neighbours = [later for later in kinds[index + 1:] if later != 'empty'][:1]
+            kind = 'module' if 'module' in neighbours else 'prose'
+        if kind == 'prose':
+            (after if 'module' in kinds[:index] else before).append(markup[start:end])
+    return '\n\n                    '.join(before), '\n\n                    '.join(after), ''
+
+def module_details(content, modules):
+    """
+    The page's modules title and intro, and its modules with the description
+    above a card's bullets and the heading of the modules section they sit in
+    when that isn't the first one (Elective Modules, ...).
+    """
+    sections = [(start, end, strip_tags(regex_registry.search(MODULES_HEADING, content[start:end]).group(0)))
+                for start, end in module_sections(content)]
+    if not sections:
+        return '', '', modules
+
+    cards = {}
+    for match in regex_registry.finditer(MODULE, content):
+        cards.setdefault(strip_tags(match.group(2)), match)
+
+    detailed = []
+    for module in modules:
+        card = cards.get(module['title'])
+        at = card.start() if card else -1
+        section = next((section for section in sections[1:] if section[0] < at < section[1]), None)
+        module = dict(module)
+        if card and card.group(3) is not None and card.group(4) is not None:
+            module['description'] = ' '.join(card.group(3).split())
+        if section:
+            module['group'] = section[2]
+        detailed.append(module)
+
+    intro = regex_registry.search(MODULES_INTRO, content[sections[0][0]:sections[0][1]])
+    return sections[0][2], ' '.join(intro.group(2).split()) if intro else '', detailed
+
+def list_items(markup):
+    """Bullet texts of a <ul>."""
+    items = [strip_tags(item).lstrip('• ') for item in regex_registry.findall(MODULE_ITEM, markup)]
+    return [item for item in items if item]
+
+def related_from_page(related_html):
+    """Related qualification cards: href, icon, NQF label, title and description."""
+    cards = []
+    for match in regex_registry.finditer(RELATED_CARD, related_html):
+        card = match.group(2)
+        title = regex_registry.search(RELATED_TITLE, card)
+        if not title:
+            continue
+        icon = regex_registry.search(HERO_ICON, card)
+        label = regex_registry.search(RELATED_LABEL, card)
+        description = regex_registry.search(RELATED_DESCRIPTION, card)
+        cards.append({
+            'href': match.group(1),
+            'icon': icon.group(1) if icon else DEFAULT_RELATED_ICON,
+            'label': label.group(1) if label else '',
+            'title': title.group(1),
+            'description': description.group(1) if description else '',
+        })
+    return cards
+
+# ---------------------------------------------------------------------------
+# Seeding
+# ---------------------------------------------------------------------------
+
+def record_from_page(content, filename):
+    """
+    (record, problem): a record built from an existing qualification page and
+    normalised onto the template, or None and why the page can't be.
+    """
+    page = parse_page(content, filename)
+    hero = regex_registry.search(HERO_SECTION, content)
+    main_column = regex_registry.search(MAIN_COLUMN, content)
+    if not hero:
+        return None, 'no hero section'
+    if not page.name:
+        return None, 'no qualification name'
+    if not main_column:
+        return None, 'no main column'
+
+    modules_title, modules_intro, modules = module_details(content, page.modules)
+    overview_html, closing_html, problem = split_main_column(main_column.group(1), page.modules)
+    if overview_html is None:
+        return None, problem
+
+    record = {
+        'slug': slug_for(filename),
+        'name': page.name,
+        'page_title': '',
+        'meta_description': '',
+        'seta': page.seta,
+        'seta_name': page.seta,
+        'seta_link': '',
+        'header_subtitle': '',
+        'breadcrumb_title': '',
+        'nqf_level': page.nqf_level,
+        'credits': page.credits,
+        'duration': page.duration,
+        'qualification_id': page.qualification_id,
+        'id_label': page.id_label,
+        'extra_details': [[label, value] for label, value in page.sidebar.items()
+                          if label not in SIDEBAR_FIELDS and value],
+        'formal_name': '',
+        'programme': '',
+        'hero_icon': DEFAULT_HERO_ICON,
+        'hero_subtitle': '',
+        'hero_intro': '',
+        'hero_image': DEFAULT_HERO_IMAGE,
+        'hero_image_alt': page.name,
+        'overview_html': overview_html,
+        'modules_title': modules_title if modules_title != DEFAULT_MODULES_TITLE else '',
+        'modules_intro': modules_intro,
+        'modules': modules,
+        'closing_html': closing_html,
+        'pdf_file': '',
+        'saqa_link': '',
+        'careers_intro': '',
+        'career_opportunities': page.career_opportunities,
+        'sidebar_lists': [],
+        'help_text': '',
+        'related_title': '',
+        'related_intro': '',
+        'related': [],
+        'cta_title': '',
+        'cta_text': '',
+        'enquiry_title': '',
+        'course': page.enquiry_data.get('Course') or page.enquiry_data.get('qualification') or page.name,
+        'source': page.enquiry_data.get('Source', slug_for(filename)),
+    }
+
+    # Pages without a Duration row (or with a bare number) state it in the hero
+    hero_duration = next((stat for stat in page.hero_stats if stat['label'].split()[0] in ('Months', 'Days')), None)
+    if hero_duration and (not record['duration'] or record['duration'].isdigit()):
+        record['duration'] = f"{record['duration'] or hero_duration['value']} {hero_duration['label'].split()[0]}"
+
+    hero_html = hero.group(1)
+    match = regex_registry.search(HERO_ICON, hero_html)
+    if match:
+        record['hero_icon'] = match.group(1)
+    match = regex_registry.search(HERO_TAGLINE, hero_html)
+    if match:
+        record['programme'] = match.group(1)
+    match = regex_registry.search(HERO_SUBTITLE, hero_html)
+    if match:
+        record['hero_subtitle'] = match.group(1)
+    match = regex_registry.search(HERO_INTRO, hero_html)
+    if match:
+        record['hero_intro'] = match.group(1)
+    match = regex_registry.search(HERO_IMAGE, hero_html)
+    if match:
+        record['hero_image'], record['hero_image_alt'] = match.groups()
+
+    sidebar = regex_registry.search(SIDEBAR_SECTION, content)
+    sidebar_html = regex_registry.sub(COMMENT, '', sidebar.group(1)) if sidebar else ''
+    for tag, title, intro, items in regex_registry.findall(SIDEBAR_LIST, sidebar_html):
+        if title == 'Career Opportunities':
+            record['careers_intro'] = ' '.join(intro.split())
+        elif list_items(items):
+            record['sidebar_lists'].append({'title': title, 'intro': ' '.join(intro.split()), 'items': list_items(items)})
+    match = regex_registry.search(FORMAL_NAME, sidebar_html)
+    if match:
+        record['formal_name'] = match.group(1)
+    match = regex_registry.search(SAQA_LINK, sidebar_html)
+    if match:
+        record['saqa_link'] = match.group(1)
+    match = regex_registry.search(HELP_TEXT, sidebar_html)
+    if match and match.group(1) != DEFAULT_HELP_TEXT:
+        record['help_text'] = match.group(1)
+
+    match = regex_registry.search(RELATED_SECTION, content)
+    if match:
+        intro = regex_registry.search(SECTION_INTRO, match.group(1))
+        if intro:
+            record['related_title'], record['related_intro'] = intro.group(1), intro.group(2) or ''
+        record['related'] = related_from_page(match.group(1))
+
+    match = regex_registry.search(CTA_SECTION, content)
+    if match:
+        intro = regex_registry.search(SECTION_INTRO, match.group(1))
+        if intro:
+            record['cta_title'] = intro.group(1)
+            text = regex_registry.search(CTA_TEXT, match.group(1))
+            record['cta_text'] = re.sub(r'\s+', ' ', text.group(1)) if text else ''
+
+    match = regex_registry.search(BREADCRUMB, content)
+    if match:
+        record['seta_link'], record['seta_name'], record['breadcrumb_title'] = match.groups()
+    if record['programme'] == record['seta_name']:
+        record['programme'] = ''
+
+    for field, pattern in (('page_title', PAGE_TITLE), ('meta_description', META_DESCRIPTION),
+                           ('header_subtitle', HEADER_SUBTITLE), ('enquiry_title', ENQUIRY_TITLE)):
+        match = regex_registry.search(pattern, content)
+        if match:
+            record[field] = match.group(1)
+
+    match = regex_registry.search(PDF_LINK, content)
+    if match:
+        record['pdf_file'] = match.group(1)
+
+    return record, ''
+
+def drop_defaults(record):
+    """Empty the OVERRIDE_FIELDS whose value is what rendering gives anyway."""
+    for field in OVERRIDE_FIELDS:
+        value, record[field] = record[field], ''
+        if value and page_values(record)[field] != value:
+            record[field] = value
+
+def stat_conflicts(page, record):
+    """'label page value vs record value' for hero stats that disagree with the typed fields."""
+    expected = {stat['label']: stat['value'] for stat in hero_stats(record)}
+    conflicts = []
+    for stat in page.hero_stats:
+        label = stat['label'].split()[0]
+        if label == 'NQF':
+            label = 'Level'
+        value = f"NQF {first_int(stat['value'])}" if label == 'Level' else stat['value']
+        if label in expected and expected[label] != value:
+            conflicts.append(f"{label} {stat['value']} vs {expected[label]}")
+    return conflicts
+
+def dropped_text(content, rendered):
+    """Text in the page's content sections that its rendered page doesn't show."""
+    match = regex_registry.search(PAGE_CONTENT, content)
+    source = regex_registry.sub(COMMENT, '', match.group(1)) if match else ''
+    shown = ' '.join(' '.join(regex_registry.findall(TEXT_NODE, regex_registry.sub(COMMENT, '', rendered))).split())
+    missing = []
+    for text in regex_registry.findall(TEXT_NODE, source):
+        # Bullets and label colons are the template's
+        text = ' '.join(text.split()).lstrip('• ').rstrip(':')
+        if text and text not in shown and text not in missing:
+            missing.append(text)
+    return missing
+
+def merge_catalog(record, entry):
+    """Fill fields the page doesn't state from its catalog entry."""
+    record['formal_name'] = record['formal_name'] or html.escape(entry['formal_name'], quote=False)
+    record['credits'] = record['credits'] or entry['credits']
+    record['nqf_level'] = record['nqf_level'] or entry['nqf_level']
+    record['qualification_id'] = record['qualification_id'] or entry['qualification_id']
+    if not record['modules']:
+        record['modules'] = [
+            {'title': html.escape(module['title'], quote=False),
+             'items': [html.escape(item, quote=False) for item in module['items']]}
+            for module in entry['modules']
+        ]
+    return sorted({source.split(':')[0] for source in entry['sources']})
+
+def seed_records(qualifications_dir=OUTPUT_DIR, records_dir=RECORDS_DIR, template_file=TEMPLATE_FILE):
+    """
+    Create a record for every existing page that doesn't have one yet.
+
+    Each page is normalised onto the template (see record_from_page); what
+    that changes or loses is printed as a warning for the page to be checked
+    before rendering with --adopt.
+    """
+    records_dir = Path(records_dir)
+    records_dir.mkdir(parents=True, exist_ok=True)
+    with open(template_file, 'r', encoding='utf-8') as f:
+        template_text = f.read()
+
+    catalog = load_catalog()
+    created = skipped = refused = warned = 0
+
+    for html_file in sorted(Path(qualifications_dir).glob('*.html')):
+        if html_file.name in EXCLUDED_FILES:
+            continue
+
+        record_file = records_dir / f'{slug_for(html_file.name)}.json'
+        if record_file.exists():
+            print(f"[SKIP] {record_file} already exists")
+            skipped += 1
+            continue
+
+        with open(html_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+        record, problem = record_from_page(content, html_file.name)
+        if record is None:
+            print(f"[SKIP] {html_file} doesn't fit the template ({problem}) - fix the page first")
+            refused += 1
+            continue
+
+        sources = ['page']
+        entry = get_by_slug(catalog, html_file.name)
+        if entry:
+            sources += merge_catalog(record, entry)
+        drop_defaults(record)
+
+        page = parse_page(content, html_file.name)
+        warnings = [f"hero stats disagree with the sidebar ({', '.join(conflicts)}) - the sidebar's are kept"
+                    for conflicts in [stat_conflicts(page, record)] if conflicts]
+        warnings += [f"{section} heading found but nothing parsed" for section in empty_sections(page)]
+        missing = dropped_text(content, render_page(record, template_text))
+        if missing:
+            shown = '; '.join(text[:40] for text in missing[:3])
+            warnings.append(f"{len(missing)} text fragments not rendered ({shown}{'; ...' if len(missing) > 3 else ''})")
+
+        with open(record_file, 'w', encoding='utf-8') as f:
+            json.dump(record, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+        print(f"[OK] {record_file} ({', '.join(sources)})")
+        for warning in warnings:
+            print(f"[WARN]   {warning}")
+        warned += bool(warnings)
+        created += 1
+
+    print(f"\n{'='*60}")
+    print(f"Seeded {created} records in {records_dir} ({skipped} already existed, "
+          f"{refused} pages refused, {warned} with warnings)")
+    print(f"{'='*60}")
+    return created
+
+# ---------------------------------------------------------------------------
+# Rendering
+# ---------------------------------------------------------------------------
+
+def render_hero(record):
+    """Hero section: icon, tagline, name, intro, stat cards and image."""
+    name = record['name']
+    seta_name = record.get('seta_name') or record.get('seta', '')
+    tagline = f"NQF Level {record.get('nqf_level')} | {record.get('programme') or seta_name}"
+    subtitle = (f'                            <h2 class="text-2xl font-semibold text-[#12265e]">{record["hero_subtitle"]}</h2>\n'
+                if record.get('hero_subtitle') else '')
+    return (
+        '\n    <section class="py-16 bg-gradient-to-br from-blue-50 to-white">\n'
+        '        <div class="container mx-auto px-6">\n'
+        '            <div class="grid lg:grid-cols-2 gap-12 items-center">\n'
+        '                <div>\n'
+        '                    <div class="flex items-center mb-6">\n'
+        '                        <div class="w-16 h-16 bg-[#ffffff]/70 rounded-2xl flex items-center justify-center mr-6">\n'
+        f'                            <i data-lucide="{record.get("hero_icon") or DEFAULT_HERO_ICON}" class="w-8 h-8 text-[#ffa600]"></i>\n'
+        '                        </div>\n'
+        '                        <div>\n'
+        f'                            <span class="text-[#ffa600] font-semibold">{tagline}</span>\n'
+        f'                            <h1 class="text-4xl md:text-5xl font-bold text-[#12265E]">{name}</h1>\n'
+        f'{subtitle}'
+        '                        </div>\n'
+        '                    </div>\n'
+        '                    <p class="text-lg text-gray-600 leading-relaxed mb-8">\n'
+        f'                        {record.get("hero_intro", "")}\n'
+        '                    </p>\n'
+        '                    <div class="grid grid-cols-3 gap-4 mb-8">\n'
+        f'{render_hero_stats(record)}\n'
+        '                    </div>\n'
+        '                </div>\n'
+        '                <div>\n'
+        f'                    <img src="{record.get("hero_image") or DEFAULT_HERO_IMAGE}"\n'
+        f'                         alt="{record.get("hero_image_alt") or name}"\n'
+        '                         class="rounded-2xl shadow-2xl w-full h-auto max-h-96 object-cover">\n'
+        '                </div>\n'
+        '            </div>\n'
+        '        </div>\n'
+        '    </section>\n'
+        '\n    '
+    )
+
+def render_hero_stats(record):
+    """Hero stat cards for credits, duration and NQF level."""
+    cards = []
+    for index, stat in enumerate(hero_stats(record)):
+        background, value_color, label_color = HERO_STAT_STYLES[index % len(HERO_STAT_STYLES)]
+        cards.append(
+            f'                        <div class="text-center p-4 {background} rounded-lg shadow">\n'
+            f'                            <div class="text-xl font-bold {value_color}">{stat["value"]}</div>\n'
+            f'                            <div class="text-sm {label_color}">{stat["label"]}</div>\n'
+            f'                        </div>'
+        )
+    return '\n'.join(cards)
+
+def render_sidebar_rows(record):
+    """Sidebar label/value rows from the typed fields, then extra_details."""
+    rows = [
+        [label, value] for label, value in (
+            ('SETA', record.get('seta')),
+            ('NQF Level', f"Level {record['nqf_level']}" if record.get('nqf_level') else ''),
+            ('Credits', f"{record['credits']} Credits" if record.get('credits') else ''),
+            ('Duration', record.get('duration')),
+            (record.get('id_label') or 'SAQA ID', record.get('qualification_id')),
+        ) if value
+    ] + (record.get('extra_details') or [])
+    return '\n'.join(
+        f'                            <div class="flex justify-between items-center py-3 border-b border-gray-100">\n'
+        f'                                <span class="text-gray-600">{label}</span>\n'
+        f'                                <span class="font-semibold">{value}</span>\n'
+        f'                            </div>'
+        for label, value in rows
+    )
+
+def render_sidebar_links(record):
+    """PDF overview download and SAQA page buttons, or nothing when the record has neither."""
+    links = []
+    pdf_file = record.get('pdf_file')
+    if pdf_file and (PDF_DIR / pdf_file).is_file():
+        links.append(
+            f'                            <a href="../Qualifications PDF/{pdf_file}" download\n'
+            '                               class="flex items-center justify-center w-full border-2 border-[#12265E] text-[#12265E] font-bold py-3 px-6 rounded-lg text-center hover:bg-[#12265E] hover:text-white transition duration-300">\n'
+            '                                <i data-lucide="download" class="w-5 h-5 mr-2"></i>\n'
+            '                                Open this Overview in PDF\n'
+            '                            </a>'
+        )
+    if record.get('saqa_link'):
+        links.append(
+            f'                            <a href="{record["saqa_link"]}" target="_blank" rel="noopener"\n'
+            '                               class="block w-full border-2 border-[#12265E] text-[#12265E] font-bold py-3 px-6 rounded-lg text-center hover:bg-[#12265E] hover:text-white transition duration-300">\n'
+            '                                Open SAQA Info in New Tab\n'
+            '                            </a>'
+        )
+    if not links:
+        return ''
+
+    return '\n                        <div class="space-y-4">\n' + '\n'.join(links) + '\n                        </div>\n'
+
+def render_bullets(items, indent):
+    """Bullet <li>s for a list of HTML-ready texts."""
+    return '\n'.join(f'{indent}<li class="flex items-start"><span class="mr-2">•</span><span>{item}</span></li>'
+                     for item in items)
+
+def render_career_opportunities(record):
+    """Career Opportunities block with the record's sidebar lists, or nothing when it has neither."""
+    careers = record.get('career_opportunities') or []
+    sidebar_lists = record.get('sidebar_lists') or []
+    if not careers and not sidebar_lists:
+        return ''
+
+    parts = ['\n                        <!-- Career Opportunities -->',
+             '                        <div class="mt-8 pt-8 border-t border-gray-200">']
+    if careers:
+        items = '\n'.join(
+            f'                                <li class="flex items-start">\n'
+            f'                                    <i data-lucide="briefcase" class="w-5 h-5 text-[#ffa600] mr-3 mt-0.5 flex-shrink-0"></i>\n'
+            f'                                    <span>{career}</span>\n'
+            f'                                </li>'
+            for career in careers
+        )
+        parts.append('                            <h4 class="text-lg font-bold text-[#12265E] mb-4">Career Opportunities</h4>')
+        if record.get('careers_intro'):
+            parts.append(f'                            <p class="text-sm text-gray-600 mb-4">{record["careers_intro"]}</p>')
+        parts += ['                            <ul class="space-y-3 text-gray-700">',
+                  items,
+                  '                            </ul>']
+    for index, sidebar_list in enumerate(sidebar_lists):
+        parts += [f'                            <div class="{CARD_BACKGROUNDS[index % 2]} p-4 rounded-lg mt-4">',
+                  f'                                <h5 class="font-semibold text-white mb-2 text-sm">{sidebar_list["title"]}</h5>']
+        if sidebar_list.get('intro'):
+            parts.append(f'                                <p class="text-sm text-white mb-2">{sidebar_list["intro"]}</p>')
+        parts += ['                                <ul class="text-sm text-white space-y-1">',
+                  render_bullets(sidebar_list['items'], ' ' * 36),
+                  '                                </ul>',
+                  '                            </div>']
+    parts.append('                        </div>\n')
+    return '\n'.join(parts)
+
+def render_sidebar(record):
+    """Sidebar to the end of the Qualification Details section: rows, links, careers and help box."""
+    formal_name = (f'                        <p class="text-sm text-gray-600 mb-6">{record["formal_name"]}</p>\n'
+                   if record.get('formal_name') else '')
+    return (
+        '\n\n                <!-- Sidebar -->\n'
+        '                <div class="lg:col-span-1">\n'
+        '                    <div class="bg-white border border-gray-200 rounded-2xl shadow-lg p-8">\n'
+        '                        <h3 class="text-xl font-bold text-[#12265E] mb-6">Qualification Details</h3>\n'
+        f'{formal_name}'
+        '\n'
+        '                        <div class="space-y-4 mb-8">\n'
+        f'{render_sidebar_rows(record)}\n'
+        '                        </div>\n'
+        f'{render_sidebar_links(record)}{render_career_opportunities(record)}\n'
+        '                        <div class="mt-8 p-4 bg-[#92abc4] rounded-lg">\n'
+        '                            <h4 class="font-bold text-[#12265E] mb-2">Need Help?</h4>\n'
+        f'                            <p class="text-sm text-gray-700 mb-3">{record.get("help_text") or DEFAULT_HELP_TEXT}</p>\n'
+        '                            <a href="mailto:help@speccon.co.za" class="text-[#12265E] hover:text-[#ffa600] font-medium text-sm">help@speccon.co.za</a>\n'
+        '                        </div>\n'
+        '                    </div>\n'
+        '                </div>\n'
+        '            </div>\n'
+        '        </div>\n'
+        '    </section>\n'
+        '\n    '
+    )
+
+def render_modules(record):
+    """Modules section: a card per module, under a subheading per group."""
+    parts = [
+        '                    <!-- Modules -->',
+        '                    <div class="mb-12">',
+        f'                        <h3 class="text-3xl font-bold text-[#12265E] mb-8">{record.get("modules_title") or DEFAULT_MODULES_TITLE}</h3>',
+    ]
+    if record.get('modules_intro'):
+        parts.append(f'                        <p class="text-gray-700 mb-8 leading-relaxed">{record["modules_intro"]}</p>')
+    parts.append('                        <div class="space-y-6">')
+    group = None
+    for index, module in enumerate(record['modules']):
+        if module.get('group') and module['group'] != group:
+            group = module['group']
+            parts.append(f'                            <h3 class="text-2xl font-bold text-[#12265E] mt-8">{group}</h3>')
+        card = [f'                            <div class="{CARD_BACKGROUNDS[index % 2]} p-6 rounded-xl">',
+                f'                                <h4 class="text-white font-bold text-lg mb-3">{module["title"]}</h4>']
+        if module.get('description'):
+            card.append(f'                                <p class="text-white/90 text-sm mb-4">{module["description"]}</p>')
+        if module['items']:
+            card += ['                                <ul class="space-y-2 text-sm text-white list-none">',
+                     render_bullets(module['items'], ' ' * 36),
+                     '                                </ul>']
+        card.append('                            </div>')
+        parts.append('\n'.join(card))
+    parts += ['                        </div>', '                    </div>']
+    return '\n'.join(parts)
+
+def render_main_content(record):
+    """Main column: the record's overview prose (or one from its intro), its modules and closing prose."""
+    overview = record.get('overview_html')
+    parts = [f'                    {overview}' if overview else (
+        '                    <h2 class="text-3xl font-bold text-[#12265E] mb-8">Qualification Overview</h2>\n'
+        '                    <div class="prose max-w-none mb-12">\n'
+        f'                        <p class="text-gray-600 text-lg leading-relaxed mb-6">{record.get("hero_intro", "")}</p>\n'
+        '                    </div>'
+    )]
+    if record.get('modules'):
+        parts.append(render_modules(record))
+    if record.get('closing_html'):
+        parts.append(f'                    {record["closing_html"]}')
+    return '\n' + '\n\n'.join(parts) + '\n                '
+
+def render_related(record):
+    """Related qualifications cards, or nothing when the record lists none."""
+    if not record.get('related'):
+        return ''
+
+    seta_name = record.get('seta_name') or record.get('seta', '')
+    cards = []
+    for card in record['related']:
+        description = (f'\n                    <p class="text-gray-600 text-sm">{card["description"]}</p>'
+                       if card.get('description') else '')
+        cards.append(
+            f'                <a href="{card["href"]}" class="group bg-white rounded-2xl shadow-lg p-6 card-hover transition-all duration-300 block">\n'
+            '                    <div class="flex items-center mb-4">\n'
+            '                        <div class="w-12 h-12 bg-[#ffffff]/70 rounded-lg flex items-center justify-center mr-4">\n'
+            f'                            <i data-lucide="{card.get("icon") or DEFAULT_RELATED_ICON}" class="w-6 h-6 text-[#ffa600]"></i>\n'
+            '                        </div>\n'
+            '                        <div>\n'
+            f'                            <span class="text-sm text-[#ffa600] font-medium group-hover:text-[#92abc4] transition duration-300">{card.get("label", "")}</span>\n'
+            f'                            <h3 class="font-bold text-lg text-[#12265E]">{card["title"]}</h3>\n'
+            '                        </div>\n'
+            f'                    </div>{description}\n'
+            '                </a>'
+        )
+    return (
+        '<!-- Related Qualifications -->\n'
+        '    <section class="py-20 bg-gray-50">\n'
+        '        <div class="container mx-auto px-6">\n'
+        '            <div class="text-center mb-16">\n'
+        f'                <h2 class="text-3xl md:text-4xl font-bold text-[#12265E] mb-4">{record.get("related_title") or DEFAULT_RELATED_TITLE}</h2>\n'
+        f'                <p class="text-xl text-gray-600 max-w-3xl mx-auto">{record.get("related_intro") or f"Explore other {seta_name} qualifications"}</p>\n'
+        '            </div>\n'
+        '            <div class="grid md:grid-cols-3 gap-8">\n'
+        + '\n'.join(cards) + '\n'
+        '            </div>\n'
+        '        </div>\n'
+        '    </section>\n'
+        '\n    '
+    )
+
+def render_cta(record):
+    """Call-to-action band with a Contact Us button, or nothing when the record has no cta_title."""
+    if not record.get('cta_title'):
+        return ''
+
+    return (
+        '<!-- CTA Section -->\n'
+        '    <section class="py-16 bg-gradient-to-r from-[#12265E] to-[#92ABC4] text-white">\n'
+        '        <div class="container mx-auto px-6 text-center">\n'
+        f'            <h2 class="text-3xl md:text-4xl font-bold mb-6">{record["cta_title"]}</h2>\n'
+        '            <p class="text-xl mb-8 max-w-2xl mx-auto opacity-90">\n'
+        f'                {record.get("cta_text", "")}\n'
+        '            </p>\n'
+        '            <div class="flex flex-col sm:flex-row gap-4 justify-center">\n'
+        '                <button onclick="openEnquiryModal()" class="border-2 border-white text-white font-semibold px-8 py-4 rounded-lg hover:bg-white hover:text-[#12265E] transition duration-300">\n'
+        '                    Contact Us\n'
+        '                </button>\n'
+        '            </div>\n'
+        '        </div>\n'
+        '    </section>\n'
+        '\n    '
+    )
+
+def page_values(record):
+    """Template values for a record."""
+    name = record['name']
+    nqf = record.get('nqf_level')
+    seta_name = record.get('seta_name') or record.get('seta', '')
+    return {
+        'page_title': record.get('page_title') or f"{name} NQF Level {nqf} | {seta_name} | SpecCon Holdings",
+        'meta_description': (record.get('meta_description')
+                             or f"{name} NQF Level {nqf} qualification accredited by {seta_name}."),
+        'seta_name': seta_name,
+        'seta_link': record.get('seta_link') or 'services-seta',
+        'header_subtitle': record.get('header_subtitle') or f"{seta_name} Qualifications",
+        'breadcrumb_title': record.get('breadcrumb_title') or name,
+        'hero': render_hero(record),
+        'main_content': render_main_content(record),
+        'sidebar': render_sidebar(record),
+        'related_qualifications': render_related(record) + render_cta(record),
+        'enquiry_title': record.get('enquiry_title') or name,
+        'course': js_string(html.unescape(record.get('course') or name)),
+        'source': js_string(record.get('source') or record['slug']),
+    }
+
+def render_page(record, template_text):
+    """Render a record into page HTML."""
+    # safe_substitute: inline scripts may contain JS template literals
+    return Template(template_text).safe_substitute(page_values(record))
+
+def load_record(record_file):
+    """Load one record, with its slug defaulting to the filename."""
+    with open(record_file, 'r', encoding='utf-8') as f:
+        record = json.load(f)
+    record.setdefault('slug', Path(record_file).stem)
+    return record
+
+def render_key(record_text, template_text):
+    """Hash of everything a rendered page depends on (the PDF link depends on the file existing)."""
+    pdf_file = json.loads(record_text).get('pdf_file')
+    has_pdf = bool(pdf_file) and (PDF_DIR / pdf_file).is_file()
+    digest = hashlib.sha256()
+    for part in (str(GENERATOR_VERSION), template_text, record_text, str(has_pdf)):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+def page_hash(content):
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+def render_record(record_file, template_text, output_dir=OUTPUT_DIR, dry_run=False, rendered=None, adopt=False):
+    """
+    Render one record and write the page if its HTML changed.
+
+    An existing page is only replaced when it is what the last render wrote
+    (its hash is in rendered, by slug) or adopt is set, so pages not
+    generated yet - or edited since - are skipped rather than overwritten.
+    """
+    record = load_record(record_file)
+    output_file = Path(output_dir) / f"{record['slug']}.html"
+    content = render_page(record, template_text)
+
+    existing = None
+    if output_file.exists():
+        with open(output_file, 'r', encoding='utf-8') as f:
+            existing = f.read()
+
+    if content == existing:
+        result = file_result(output_file, 'unchanged')
+    elif existing is not None and not adopt and page_hash(existing) != (rendered or {}).get(record['slug']):
+        result = file_result(output_file, 'skipped',
+                             'not written by the last render (run with --adopt to replace it)')
+    else:
+        if not dry_run:
+            with open(output_file, 'w', encoding='utf-8') as f:
+                f.write(content)
+        result = file_result(output_file, 'updated', changed_by=['generated' if existing is None else 'rendered'])
+
+    result['record'] = Path(record_file).stem
+    result['output'] = page_hash(content)
+    result['regex_stats'] = regex_registry.take_stats()
+    return result
+
+def load_render_manifest(manifest_path=RENDER_MANIFEST):
+    """{slug: {'key': render key, 'output': page hash}} from the last run."""
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return {slug: entry for slug, entry in manifest.items() if isinstance(entry, dict)}
+
+def save_render_manifest(manifest, manifest_path=RENDER_MANIFEST):
+    Path(manifest_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+def generate_pages(records_dir=RECORDS_DIR, template_file=TEMPLATE_FILE, output_dir=OUTPUT_DIR,
+                   workers=1, dry_run=False, force=False, adopt=False, manifest_path=RENDER_MANIFEST):
+    """
+    Render every record whose content or template changed since the last run.
+
+    Records are hashed with the template and GENERATOR_VERSION; records whose
+    hash matches the render manifest (and whose page still exists) are not
+    rendered at all, unless force is set. Existing pages the last render
+    didn't write are left alone unless adopt is set (see render_record).
+    """
+    with open(template_file, 'r', encoding='utf-8') as f:
+        template_text = f.read()
+
+    manifest = load_render_manifest(manifest_path)
+    results = []
+    pending = []
+    keys = {}
+
+    for record_file in sorted(Path(records_dir).glob('*.json')):
+        with open(record_file, 'r', encoding='utf-8') as f:
+            key = render_key(f.read(), template_text)
+        keys[record_file.stem] = key
+
+        output_file = Path(output_dir) / f'{record_file.stem}.html'
+        if not force and manifest.get(record_file.stem, {}).get('key') == key and output_file.exists():
+            results.append(file_result(output_file, 'cached'))
+        else:
+            pending.append(record_file)
+
+    results.extend(run_parallel(render_record, pending, workers=workers,
+                                args=(template_text, output_dir, dry_run,
+                                      {slug: entry.get('output') for slug, entry in manifest.items()}, adopt)))
+
+    if not dry_run:
+        for result in results:
+            if result['status'] in ('updated', 'unchanged') and 'record' in result:
+                manifest[result['record']] = {'key': keys[result['record']], 'output': result['output']}
+        save_render_manifest(manifest, manifest_path)
+
+    regex_stats = regex_registry.merge_stats(result.pop('regex_stats', {}) for result in results)
+
+    report = build_report(results)
+    report['regex_stats'] = regex_stats
+    print_results(report)
+    return report
+
+def main():
+    if '--seed' in sys.argv:
+        print("Seeding qualification records from existing pages...")
+        print("=" * 60)
+        seed_records()
+        return 0
+
+    if not RECORDS_DIR.exists():
+        print(f"Error: {RECORDS_DIR} not found - run with --seed first")
+        return 1
+
+    print("Generating qualification pages from records...")
+    print("=" * 60)
+
+    # Pass --dry-run to report changes without writing files
+    dry_run = '--dry-run' in sys.argv
+    # Pass --force to ignore the render manifest and re-render every record
+    force = '--force' in sys.argv
+    # Pass --adopt to replace pages this script didn't write (or that were edited since)
+    adopt = '--adopt' in sys.argv
+    # Pass --workers N to set the process count (defaults to all cores)
+    workers = get_worker_count(sys.argv)
+
+    report = generate_pages(workers=workers, dry_run=dry_run, force=force, adopt=adopt)
+    print_summary(report)
+
+    return 0 if report['errors'] == 0 else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
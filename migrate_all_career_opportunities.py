@@ -9,6 +9,8 @@ import os
 import sys
 from pathlib import Path
 
+from transform_engine import time_budget, TransformTimeout
+
 # Handle Windows console encoding
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8')
@@ -32,6 +34,10 @@ FILES_TO_PROCESS = [
     "fasset-computer-technician-nqf5.html",
 ]
 
+# Per-file time budget (seconds) for the DOTALL extraction/removal patterns,
+# so a malformed page is reported and skipped instead of stalling the batch
+CAREER_TIMEOUT = 5.0
+
 def extract_career_opportunities_standard(content):
     """Extract Career Opportunities from standard grid format."""
     # Pattern for standard Career Opportunities section with grid layout (more flexible)
@@ -107,40 +113,41 @@ def process_file(filepath):
             print(f"  ✓ Already has Career Opportunities in sidebar")
             return True
 
-        # Try standard extraction first
-        career_items, full_match = extract_career_opportunities_standard(content)
-
-        # If standard didn't work, try complex extraction
-        if not career_items:
-            career_items, full_match = extract_career_opportunities_complex(content)
-
-        if not career_items:
-            print(f"  ⚠️  Could not find Career Opportunities section")
-            return False
-
-        print(f"  ✓ Found {len(career_items)} career items")
-
-        # Remove from main content - multiple patterns to try
-        removal_patterns = [
-            # Pattern 1: Most flexible - any h3 with Career Opportunities
-            r'\s*<h3[^>]*>Career Opportunities</h3>.*?</div>\s*</div>\s*(?=\s*(?:<!-- (?:Modules|Programme Modules|Core Modules|Learning) -->|<h3|<div class="bg-gradient))',
-            # Pattern 2: With specific text classes
-            r'\s*<h3 class="text-2xl[^>]*>Career Opportunities</h3>.*?</div>\s*</div>\s*(?=\s*(?:<!--|<h3))',
-            # Pattern 3: Complex with nested divs
-            r'\s*<h3[^>]*>Career Opportunities</h3>.*?(?=<h3|<!-- Programme Modules -->|<div class="bg-gradient)',
-        ]
-
-        content_modified = content
-        for pattern in removal_patterns:
-            temp_content = re.sub(pattern, '\n                    </div>\n', content_modified, flags=re.DOTALL)
-            if temp_content != content_modified:
-                content_modified = temp_content
-                print(f"  ✓ Removed from main content")
-                break
+        with time_budget(CAREER_TIMEOUT, f"Career Opportunities patterns on {filepath.name}"):
+            # Try standard extraction first
+            career_items, full_match = extract_career_opportunities_standard(content)
+
+            # If standard didn't work, try complex extraction
+            if not career_items:
+                career_items, full_match = extract_career_opportunities_complex(content)
+
+            if not career_items:
+                print(f"  ⚠️  Could not find Career Opportunities section")
+                return False
+
+            print(f"  ✓ Found {len(career_items)} career items")
+
+            # Remove from main content - multiple patterns to try
+            removal_patterns = [
+                # Pattern 1: Most flexible - any h3 with Career Opportunities
+                r'\s*<h3[^>]*>Career Opportunities</h3>.*?</div>\s*</div>\s*(?=\s*(?:<!-- (?:Modules|Programme Modules|Core Modules|Learning) -->|<h3|<div class="bg-gradient))',
+                # Pattern 2: With specific text classes
+                r'\s*<h3 class="text-2xl[^>]*>Career Opportunities</h3>.*?</div>\s*</div>\s*(?=\s*(?:<!--|<h3))',
+                # Pattern 3: Complex with nested divs
+                r'\s*<h3[^>]*>Career Opportunities</h3>.*?(?=<h3|<!-- Programme Modules -->|<div class="bg-gradient)',
+            ]
+
+            content_modified = content
+            for pattern in removal_patterns:
+                temp_content = re.sub(pattern, '\n                    </div>\n', content_modified, flags=re.DOTALL)
+                if temp_content != content_modified:
+                    content_modified = temp_content
+                    print(f"  ✓ Removed from main content")
+                    break
 
-        if content_modified == content:
-            print(f"  ⚠️  Could not remove Career Opportunities from main content")
-            return False
+            if content_modified == content:
+                print(f"  ⚠️  Could not remove Career Opportunities from main content")
+                return False
 
         # Convert to sidebar format
         sidebar_section = convert_to_sidebar_format(career_items)
@@ -175,6 +182,10 @@ def process_file(filepath):
         print(f"  ✅ Successfully updated {filepath.name}")
         return True
 
+    except TransformTimeout as e:
+        print(f"  ⏱️  Skipped: {e}")
+        return False
+
     except Exception as e:
         print(f"  ❌ Error processing {filepath.name}: {str(e)}")
         return False
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Shrink rendered qualification brochures in "Qualifications PDF".
+
+Chromium embeds every photo at its full source resolution, however small it
+is printed, and writes an identical copy of a shared image for every place
+it appears. optimize_pdf() rewrites a PDF in place:
+
+- images printed at more than TARGET_DPI * DOWNSAMPLE_THRESHOLD are
+  downsampled to TARGET_DPI (photos as JPEG, flat artwork losslessly)
+- identical image and font streams are merged into one object
+- the file is saved linearized ("fast web view") with compressed object
+  streams, so the first page shows before the download finishes
+
+A re-encoded image is kept only when it is smaller than the original.
+batch_render_pdfs.py runs this after every render.
+
+Usage:
+    python optimize_pdfs.py [file.pdf ...] [--workers N]
+
+Requires pikepdf and Pillow (pip install pikepdf pillow).
+"""
+
+import io
+import os
+import sys
+import math
+import zlib
+import hashlib
+import importlib.util
+from pathlib import Path
+
+from transform_engine import file_result, get_worker_count, run_parallel
+
+# Handle Windows console encoding
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+    sys.stderr.reconfigure(encoding='utf-8')
+
+PDF_DIR = Path('Qualifications PDF')
+
+# Resolution images are downsampled to, in pixels per printed inch
+TARGET_DPI = 150
+
+# Images are left alone unless they exceed TARGET_DPI by this factor, so a
+# second pass does not re-encode what the first one produced
+DOWNSAMPLE_THRESHOLD = 1.5
+
+# Quality of re-encoded photos
+JPEG_QUALITY = 80
+
+# Images with more distinct colours than this are treated as photos
+PHOTO_COLOURS = 4096
+
+# Bump when optimize_pdf() output changes so brochures are re-rendered
+OPTIMIZER_VERSION = 1
+
+IDENTITY = (1, 0, 0, 1, 0, 0)
+
+def optimizer_available():
+    """True when pikepdf and Pillow can be imported."""
+    return all(importlib.util.find_spec(module) for module in ('pikepdf', 'PIL'))
+
+def optimizer_settings():
+    """Settings that determine optimize_pdf() output, for cache keys."""
+    return f"{OPTIMIZER_VERSION}:{TARGET_DPI}:{DOWNSAMPLE_THRESHOLD}:{JPEG_QUALITY}:{PHOTO_COLOURS}"
+
+def multiply(m, n):
+    """Product of two PDF transformation matrices (m applied first)."""
+    a, b, c, d, e, f = m
+    A, B, C, D, E, F = n
+    return (a * A + b * C, a * B + b * D,
+            c * A + d * C, c * B + d * D,
+            e * A + f * C + E, e * B + f * D + F)
+
+def collect_placements(pikepdf, container, resources, ctm, placements, depth=0):
+    """
+    Record the largest printed size, in points, of every image drawn by a
+    content stream, following form XObjects.
+    """
+    if depth > 10 or resources is None:
+        return
+    xobjects = resources.get('/XObject', {})
+    stack = []
+
+    for operands, operator in pikepdf.parse_content_stream(container):
+        op = str(operator)
+        if op == 'q':
+            stack.append(ctm)
+        elif op == 'Q':
+            ctm = stack.pop() if stack else IDENTITY
+        elif op == 'cm' and len(operands) == 6:
+            ctm = multiply(tuple(float(x) for x in operands), ctm)
+        elif op == 'Do' and operands:
+            xobject = xobjects.get(str(operands[0]))
+            if xobject is None:
+                continue
+            if xobject.get('/Subtype') == '/Image':
+                width = math.hypot(ctm[0], ctm[1])
+                height = math.hypot(ctm[2], ctm[3])
+                key = xobject.objgen
+                old_width, old_height = placements.get(key, (0, 0))
+                placements[key] = (max(width, old_width), max(height, old_height))
+            elif xobject.get('/Subtype') == '/Form':
+                matrix = tuple(float(x) for x in xobject.get('/Matrix', IDENTITY))
+                collect_placements(pikepdf, xobject, xobject.get('/Resources', resources),
+                                   multiply(matrix, ctm), placements, depth + 1)
+
+def image_placements(pikepdf, pdf):
+    """Largest printed (width, height) in points of each image, by objgen."""
+    placements = {}
+    for page in pdf.pages:
+        collect_placements(pikepdf, page.obj, page.obj.get('/Resources'), IDENTITY, placements)
+    return placements
+
+def encode_image(image, photo):
+    """Encoded bytes and PDF filter name for a Pillow image."""
+    if photo and image.mode in ('L', 'RGB', 'CMYK'):
+        buffer = io.BytesIO()
+        image.save(buffer, format='JPEG', quality=JPEG_QUALITY, optimize=True)
+        return buffer.getvalue(), '/DCTDecode'
+    return zlib.compress(image.tobytes(), 9), '/FlateDecode'
+
+def downsample_image(pikepdf, Image, xobject, printed_size):
+    """
+    Downsample one image XObject (and its soft mask) to TARGET_DPI at its
+    printed size. Returns the bytes saved (0 when left unchanged).
+    """
+    width, height = int(xobject.Width), int(xobject.Height)
+    target_width = math.ceil(printed_size[0] / 72 * TARGET_DPI)
+    target_height = math.ceil(printed_size[1] / 72 * TARGET_DPI)
+    if not target_width or not target_height:
+        return 0
+    if width <= target_width * DOWNSAMPLE_THRESHOLD and height <= target_height * DOWNSAMPLE_THRESHOLD:
+        return 0
+    if int(xobject.get('/BitsPerComponent', 8)) != 8 or '/Mask' in xobject or '/Decode' in xobject:
+        return 0
+
+    image = pikepdf.PdfImage(xobject).as_pil_image()
+    if image.mode not in ('L', 'RGB', 'CMYK'):
+        return 0
+
+    scale = max(target_width / width, target_height / height)
+    size = (max(1, round(width * scale)), max(1, round(height * scale)))
+
+    photo = xobject.get('/Filter') == '/DCTDecode' or image.getcolors(PHOTO_COLOURS) is None
+    data, filter_name = encode_image(image.resize(size, Image.LANCZOS), photo)
+
+    smask = xobject.get('/SMask')
+    smask_data = None
+    before = len(xobject.read_raw_bytes())
+    after = len(data)
+    if smask is not None:
+        mask = pikepdf.PdfImage(smask).as_pil_image().convert('L')
+        smask_data = zlib.compress(mask.resize(size, Image.LANCZOS).tobytes(), 9)
+        before += len(smask.read_raw_bytes())
+        after += len(smask_data)
+
+    if after >= before:
+        return 0
+
+    xobject.write(data, filter=pikepdf.Name(filter_name))
+    xobject.Width, xobject.Height = size
+    if '/DecodeParms' in xobject:
+        del xobject['/DecodeParms']
+    if smask_data is not None:
+        smask.write(smask_data, filter=pikepdf.Name('/FlateDecode'))
+        smask.Width, smask.Height = size
+        if '/DecodeParms' in smask:
+            del smask['/DecodeParms']
+    return before - after
+
+def stream_fingerprint(stream):
+    """Hash of a stream's data and dictionary (apart from its length)."""
+    digest = hashlib.sha256(stream.read_raw_bytes())
+    for key in sorted(stream.keys()):
+        if key != '/Length':
+            value = stream[key]
+            # unparse() writes indirect objects as references ("5 0 R")
+            text = value.unparse() if hasattr(value, 'unparse') else repr(value).encode('utf-8')
+            digest.update(key.encode('utf-8') + b'=' + text)
+    return digest.hexdigest()
+
+def is_shared_resource(stream):
+    """Image XObjects and embedded font programs."""
+    return (stream.get('/Subtype') == '/Image'
+            or any(key in stream for key in ('/Length1', '/Length2', '/Length3'))
+            or stream.get('/Subtype') in ('/Type1C', '/CIDFontType0C', '/OpenType'))
+
+def replace_references(pikepdf, container, canonical):
+    """Point references to duplicate streams at their canonical copy."""
+    if isinstance(container, pikepdf.Dictionary) or isinstance(container, pikepdf.Stream):
+        for key in list(container.keys()):
+            value = container[key]
+            if getattr(value, 'is_indirect', False) and value.objgen in canonical:
+                container[key] = canonical[value.objgen]
+            elif isinstance(value, (pikepdf.Array, pikepdf.Dictionary)) and not value.is_indirect:
+                replace_references(pikepdf, value, canonical)
+    elif isinstance(container, pikepdf.Array):
+        for i, value in enumerate(container):
+            if getattr(value, 'is_indirect', False) and value.objgen in canonical:
+                container[i] = canonical[value.objgen]
+            elif isinstance(value, (pikepdf.Array, pikepdf.Dictionary)) and not value.is_indirect:
+                replace_references(pikepdf, value, canonical)
+
+def deduplicate_streams(pikepdf, pdf):
+    """Merge identical image and font streams. Returns the number merged."""
+    first = {}
+    canonical = {}
+    for obj in pdf.objects:
+        if isinstance(obj, pikepdf.Stream) and is_shared_resource(obj):
+            fingerprint = stream_fingerprint(obj)
+            if fingerprint in first:
+                canonical[obj.objgen] = first[fingerprint]
+            else:
+                first[fingerprint] = obj
+
+    if canonical:
+        for obj in pdf.objects:
+            if isinstance(obj, (pikepdf.Dictionary, pikepdf.Stream, pikepdf.Array)):
+                replace_references(pikepdf, obj, canonical)
+    return len(canonical)
+
+def optimize_pdf(pdf_file):
+    """
+    Optimize one PDF in place.
+
+    Returns a file_result() with 'before' and 'after' sizes in bytes and
+    the number of images downsampled and duplicate streams merged.
+    """
+    import pikepdf
+    from PIL import Image
+
+    pdf_file = Path(pdf_file)
+    before = pdf_file.stat().st_size
+    temp_file = pdf_file.with_suffix('.optimizing.pdf')
+
+    with pikepdf.open(pdf_file) as pdf:
+        downsampled = 0
+        for objgen, printed_size in image_placements(pikepdf, pdf).items():
+            xobject = pdf.get_object(objgen)
+            try:
+                if downsample_image(pikepdf, Image, xobject, printed_size):
+                    downsampled += 1
+            except (pikepdf.PdfError, NotImplementedError, OSError, ValueError):
+                # Image encodings Pillow can't decode are kept as they are
+                continue
+
+        merged = deduplicate_streams(pikepdf, pdf)
+        pdf.save(temp_file, linearize=True, compress_streams=True,
+                 object_stream_mode=pikepdf.ObjectStreamMode.generate)
+
+    after = temp_file.stat().st_size
+    os.replace(temp_file, pdf_file)
+
+    changed_by = [name for name, count in (('downsample', downsampled), ('deduplicate', merged)) if count]
+    result = file_result(pdf_file, 'updated', changed_by=changed_by + ['linearize'])
+    result.update(before=before, after=after, downsampled=downsampled, merged=merged)
+    return result
+
+def print_sizes(results):
+    """Before/after size of every PDF and the totals."""
+    before = after = 0
+    for result in results:
+        if result['status'] == 'error':
+            print(f"[ERROR] {result['path']}: {result['error']}")
+            continue
+        before += result['before']
+        after += result['after']
+        change = 100 * (result['after'] / result['before'] - 1) if result['before'] else 0
+        print(f"[OK] {Path(result['path']).name}: {result['before'] / 1024:.0f} KB -> "
+              f"{result['after'] / 1024:.0f} KB ({change:+.0f}%, {result['downsampled']} images downsampled, "
+              f"{result['merged']} duplicates merged)")
+
+    errors = sum(1 for result in results if result['status'] == 'error')
+    print(f"\n{'='*60}")
+    print("Summary:")
+    print(f"  Optimized: {len(results) - errors}")
+    print(f"  Errors: {errors}")
+    if before:
+        print(f"  Total size: {before / 1048576:.1f} MB -> {after / 1048576:.1f} MB "
+              f"({100 * (after / before - 1):+.0f}%)")
+    print(f"{'='*60}")
+
+def main():
+    argv = sys.argv[1:]
+    workers = get_worker_count(argv)
+
+    pdf_files = []
+    skip_next = False
+    for arg in argv:
+        if skip_next:
+            skip_next = False
+        elif arg == '--workers':
+            skip_next = True
+        elif not arg.startswith('--'):
+            pdf_files.append(Path(arg))
+    pdf_files = pdf_files or sorted(PDF_DIR.glob('*.pdf'))
+
+    if not pdf_files:
+        print(f"[ERROR] No PDFs found in {PDF_DIR}")
+        return 1
+
+    # Fail once with the install hint rather than once per file
+    if not optimizer_available():
+        raise ImportError('pikepdf and Pillow are required')
+
+    print(f"Optimizing {len(pdf_files)} PDFs (target {TARGET_DPI} DPI)")
+    print("=" * 60)
+    results = run_parallel(optimize_pdf, pdf_files, workers)
+    print_sizes(results)
+    return 0 if all(result['status'] != 'error' for result in results) else 1
+
+if __name__ == '__main__':
+    try:
+        sys.exit(main())
+    except ImportError:
+        print("Error: pikepdf and Pillow are required.")
+        print("Please run: pip install pikepdf pillow")
+        sys.exit(1)
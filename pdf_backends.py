@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+One HTML-to-PDF API over the converters the site has used.
+
+Each backend renders a page with the same print stylesheet (PRINT_CSS from
+pdf_browser_pool) and the same page size and margins (PDF_OPTIONS):
+
+    playwright  Chromium via a pooled browser; runs the page's JavaScript
+                (Tailwind CDN, lucide), so output matches the site
+    weasyprint  Pure Python, no browser and no JavaScript - fastest, but
+                pages styled by the Tailwind CDN script come out unstyled
+    pdfkit      wkhtmltopdf (old WebKit), between the two
+
+Backends are opened once and render many pages:
+
+    with open_backend('weasyprint') as backend:
+        backend.render('qualifications/page.html', 'page.pdf')
+
+convert_pdf() tries backends in order until one is installed and succeeds.
+
+Run with --benchmark to render the same pages through every installed
+backend, each in its own process, and compare latency, peak memory and
+output size. PDFs are kept under BENCHMARK_DIR for a fidelity check.
+
+Usage:
+    python pdf_backends.py [--backend NAME] page.html [page.pdf]
+    python pdf_backends.py --benchmark [pattern ...] [--limit N]
+"""
+
+import os
+import sys
+import time
+import tempfile
+import importlib.util
+from abc import ABC, abstractmethod
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+from batch_render_pdfs import discover_pages
+from pdf_browser_pool import PDF_OPTIONS, PRINT_CSS, BrowserPool
+
+# Handle Windows console encoding
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+    sys.stderr.reconfigure(encoding='utf-8')
+
+# Registered backends, by name: class and the modules it needs
+BACKENDS = {}
+
+# Where --benchmark writes its PDFs, one directory per backend
+BENCHMARK_DIR = Path('.cache') / 'pdf_benchmark'
+
+# Pages benchmarked when --limit is not given
+DEFAULT_BENCHMARK_PAGES = 10
+
+def register_backend(name, modules):
+    """Class decorator registering a backend under a name."""
+    def register(cls):
+        cls.name = name
+        BACKENDS[name] = {'class': cls, 'modules': modules}
+        return cls
+    return register
+
+def backend_available(name):
+    """True when every module a backend needs can be imported."""
+    return all(importlib.util.find_spec(module) for module in BACKENDS[name]['modules'])
+
+def page_css():
+    """@page rule matching PDF_OPTIONS, for backends that take CSS only."""
+    margin = PDF_OPTIONS['margin']
+    return (f"@page {{ size: {PDF_OPTIONS['format']}; "
+            f"margin: {margin['top']} {margin['right']} {margin['bottom']} {margin['left']}; }}")
+
+class PdfBackend(ABC):
+    """Base class: a converter opened once and used for many pages."""
+    name = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    @abstractmethod
+    def render(self, html_file, output_pdf):
+        """Render one HTML page to a PDF file."""
+
+@register_backend('playwright', ['playwright'])
+class PlaywrightBackend(PdfBackend):
+    """Chromium through a BrowserPool (see pdf_browser_pool)."""
+
+    def __init__(self, offline=False):
+        self.pool = BrowserPool(offline=offline)
+
+    def open(self):
+        self.pool.start()
+
+    def close(self):
+        self.pool.close()
+
+    def render(self, html_file, output_pdf):
+        self.pool.render(html_file, output_pdf)
+
+@register_backend('weasyprint', ['weasyprint'])
+class WeasyprintBackend(PdfBackend):
+    """WeasyPrint with the shared print stylesheet."""
+
+    def open(self):
+        from weasyprint import CSS
+        from weasyprint.text.fonts import FontConfiguration
+
+        self.font_config = FontConfiguration()
+        self.stylesheet = CSS(string=page_css() + PRINT_CSS, font_config=self.font_config)
+
+    def render(self, html_file, output_pdf):
+        from weasyprint import HTML
+
+        html = HTML(filename=str(html_file), base_url=str(Path(html_file).resolve().parent))
+        html.write_pdf(str(output_pdf), stylesheets=[self.stylesheet], font_config=self.font_config)
+
+@register_backend('pdfkit', ['pdfkit'])
+class PdfkitBackend(PdfBackend):
+    """wkhtmltopdf through pdfkit, with the shared stylesheet as a user style sheet."""
+
+    def open(self):
+        # wkhtmltopdf only takes a user style sheet as a file
+        stylesheet = tempfile.NamedTemporaryFile('w', suffix='.css', delete=False, encoding='utf-8')
+        with stylesheet:
+            stylesheet.write(PRINT_CSS)
+        self.stylesheet = stylesheet.name
+
+        margin = PDF_OPTIONS['margin']
+        self.options = {
+            'page-size': PDF_OPTIONS['format'],
+            'margin-top': margin['top'],
+            'margin-right': margin['right'],
+            'margin-bottom': margin['bottom'],
+            'margin-left': margin['left'],
+            'encoding': "UTF-8",
+            'enable-local-file-access': None,
+            'no-stop-slow-scripts': None,
+            'javascript-delay': 1000,
+            'print-media-type': None,
+            'user-style-sheet': self.stylesheet,
+            'quiet': None,
+        }
+
+    def close(self):
+        os.unlink(self.stylesheet)
+
+    def render(self, html_file, output_pdf):
+        import pdfkit
+
+        pdfkit.from_file(str(html_file), str(output_pdf), options=self.options)
+
+def open_backend(name, **options):
+    """Instantiate a backend by name (use it as a context manager)."""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown PDF backend '{name}' (choose from {', '.join(BACKENDS)})")
+    return BACKENDS[name]['class'](**options)
+
+def convert_pdf(html_file, output_pdf, backends=None):
+    """
+    Render one page with the first backend that is installed and succeeds.
+
+    Returns the name of the backend used, or None.
+    """
+    for name in backends or list(BACKENDS):
+        if not backend_available(name):
+            print(f"[SKIP] {name} is not installed")
+            continue
+        try:
+            with open_backend(name) as backend:
+                backend.render(html_file, output_pdf)
+            return name
+        except Exception as e:
+            print(f"[ERROR] {name} failed on {html_file}: {e}")
+    return None
+
+def peak_memory_mb():
+    """
+    Peak resident memory of this process and of its finished child
+    processes, in MB (None where the resource module is unavailable).
+    """
+    try:
+        import resource
+    except ImportError:
+        return None, None
+
+    # ru_maxrss is in KB on Linux and bytes on macOS
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale
+    return own, children
+
+def benchmark_backend(name, html_files, output_dir):
+    """
+    Render html_files with one backend and measure it. Run in a fresh
+    process so peak memory belongs to this backend alone.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    result = {'backend': name, 'times': [], 'sizes': [], 'errors': []}
+    start = time.perf_counter()
+    with open_backend(name) as backend:
+        result['startup'] = time.perf_counter() - start
+        for html_file in html_files:
+            output_pdf = output_dir / f'{Path(html_file).stem}.pdf'
+            page_start = time.perf_counter()
+            try:
+                backend.render(html_file, output_pdf)
+            except Exception as e:
+                result['errors'].append(f'{Path(html_file).name}: {e}')
+                continue
+            result['times'].append(time.perf_counter() - page_start)
+            result['sizes'].append(output_pdf.stat().st_size)
+
+    result['peak_mb'], result['children_peak_mb'] = peak_memory_mb()
+    return result
+
+def benchmark(html_files, backends=None, output_dir=BENCHMARK_DIR):
+    """Benchmark every installed backend on the same pages."""
+    results = []
+    for name in backends or list(BACKENDS):
+        if not backend_available(name):
+            print(f"[SKIP] {name} is not installed")
+            continue
+        print(f"Benchmarking {name} on {len(html_files)} pages...")
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            try:
+                results.append(executor.submit(benchmark_backend, name, html_files, Path(output_dir) / name).result())
+            except Exception as e:
+                print(f"[ERROR] {name}: {e}")
+    return results
+
+def print_benchmark(results):
+    """Table of latency, memory and size per backend."""
+    print(f"\n{'='*90}")
+    print("PDF backend benchmark")
+    print(f"{'='*90}")
+    print(f"{'Backend':<12} {'Pages':>6} {'Startup s':>10} {'Mean ms':>9} {'Max ms':>8} "
+          f"{'Peak MB':>8} {'Child MB':>9} {'Avg KB':>8}")
+    print(f"{'-'*90}")
+
+    for result in results:
+        times = result['times']
+        mean_ms = 1000 * sum(times) / len(times) if times else 0
+        max_ms = 1000 * max(times) if times else 0
+        avg_kb = sum(result['sizes']) / len(result['sizes']) / 1024 if result['sizes'] else 0
+        peak = f"{result['peak_mb']:.0f}" if result['peak_mb'] is not None else '-'
+        child = f"{result['children_peak_mb']:.0f}" if result['children_peak_mb'] is not None else '-'
+        pages = f"{len(times)}/{len(times) + len(result['errors'])}"
+        print(f"{result['backend']:<12} {pages:>6} {result['startup']:>10.2f} {mean_ms:>9.0f} {max_ms:>8.0f} "
+              f"{peak:>8} {child:>9} {avg_kb:>8.0f}")
+
+    for result in results:
+        for error in result['errors']:
+            print(f"[ERROR] {result['backend']}: {error}")
+
+    print(f"\nPDFs for a side-by-side fidelity check: {BENCHMARK_DIR.resolve()}")
+    print(f"{'='*90}")
+
+def option_value(argv, name):
+    """Value of --name VALUE (or --name=VALUE), or None."""
+    for i, arg in enumerate(argv):
+        if arg.startswith(f'{name}='):
+            return arg.split('=', 1)[1]
+        if arg == name and i + 1 < len(argv):
+            return argv[i + 1]
+    return None
+
+def positional_args(argv, options_with_values):
+    """Arguments that are neither flags nor flag values."""
+    args = []
+    skip_next = False
+    for arg in argv:
+        if skip_next:
+            skip_next = False
+        elif arg in options_with_values:
+            skip_next = True
+        elif not arg.startswith('--'):
+            args.append(arg)
+    return args
+
+def main():
+    argv = sys.argv[1:]
+    args = positional_args(argv, ('--backend', '--limit'))
+    backend = option_value(argv, '--backend')
+    backends = [backend] if backend else None
+
+    if '--benchmark' in argv:
+        limit = int(option_value(argv, '--limit') or DEFAULT_BENCHMARK_PAGES)
+        html_files = discover_pages(args or None)[:limit]
+        if not html_files:
+            print("[ERROR] No pages to benchmark")
+            return 1
+        results = benchmark(html_files, backends)
+        print_benchmark(results)
+        return 0 if results else 1
+
+    if not args:
+        print("Usage: python pdf_backends.py [--backend NAME] page.html [page.pdf]")
+        print("       python pdf_backends.py --benchmark [pattern ...] [--limit N]")
+        return 1
+
+    html_file = Path(args[0])
+    output_pdf = Path(args[1]) if len(args) > 1 else html_file.with_suffix('.pdf')
+    if not html_file.exists():
+        print(f"[ERROR] File not found: {html_file}")
+        return 1
+
+    used = convert_pdf(html_file, output_pdf, backends)
+    if used is None:
+        print(f"[ERROR] No PDF backend could convert {html_file}")
+        return 1
+    print(f"[SUCCESS] {output_pdf} ({used}, {output_pdf.stat().st_size / 1024:.2f} KB)")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
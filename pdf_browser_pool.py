@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Pool of long-lived Chromium browsers for rendering pages to PDF.
+
+Launching Chromium costs more than rendering a qualification page, so
+BrowserPool keeps a few browsers open for a whole batch and renders every
+page through a reused context and tab. Each browser is closed and
+relaunched after MAX_RENDERS_PER_BROWSER renders to bound its memory, and a
+tab that fails a render is replaced before it is used again.
+
+CDN requests (Tailwind, lucide, Google Fonts, hero photos) are answered
+from the local vendor cache (see vendor_cache.py); with offline=True
+nothing is fetched from the network at all.
+
+Usage:
+    with BrowserPool() as pool:
+        for html_file, output_pdf in jobs:
+            pool.render(html_file, output_pdf)
+
+Requires Playwright (pip install playwright && playwright install chromium).
+"""
+
+import os
+import time
+from pathlib import Path
+
+from vendor_cache import VendorRoutes, install_routes
+
+# Browsers kept open by default. The sync API renders one page at a time,
+# so more than one browser only spreads renders (and memory) across them.
+DEFAULT_POOL_SIZE = 1
+
+# Renders after which a browser is closed and relaunched
+MAX_RENDERS_PER_BROWSER = 50
+
+# Chromium flags for every render. Pages are opened from file:// URLs, and
+# Chromium won't otherwise load the lucide sprite into their <svg><use>.
+CHROMIUM_ARGS = ['--allow-file-access-from-files']
+
+# Print stylesheet injected before every render
+PRINT_CSS = """
+    @media print {
+        /* Convert fixed header to static for PDF */
+        header {
+            position: static !important;
+            display: block !important;
+        }
+
+        /* Remove top padding from breadcrumb section */
+        section.pt-24 {
+            padding-top: 1rem !important;
+        }
+
+        /* Ensure proper page breaks */
+        @page {
+            margin: 0.5cm;
+        }
+
+        /* Prevent header from repeating on subsequent pages */
+        body > header {
+            page-break-after: avoid;
+        }
+
+        /* Add small margin after header */
+        header + section {
+            margin-top: 0 !important;
+            padding-top: 0.5rem !important;
+        }
+    }
+"""
+
+# Options passed to page.pdf() for every render
+PDF_OPTIONS = {
+    'format': 'A4',
+    'print_background': True,  # Include background colors and images
+    'margin': {
+        'top': '0.5cm',
+        'right': '0.5cm',
+        'bottom': '0.5cm',
+        'left': '0.5cm'
+    },
+    'prefer_css_page_size': False,
+    'display_header_footer': False,
+}
+
+# Longest wait for a page to become ready before it is printed anyway
+READY_TIMEOUT_MS = 10000
+
+# Page-side readiness check, polled after the load event: web fonts are
+# loaded, lucide.createIcons() has replaced every <i data-lucide> (on pages
+# not yet built with build_lucide_sprite.py), every image has loaded, a
+# stylesheet loaded asynchronously (see build_critical_css.py) has been
+# applied, and the Tailwind CDN (when the page uses it) has injected its
+# generated styles.
+READY_CHECK = """() => {
+    if (document.readyState !== 'complete') return false;
+    if (document.fonts && document.fonts.status !== 'loaded') return false;
+    if (document.querySelector('i[data-lucide]')) return false;
+    if (document.querySelector('link[rel="preload"][as="style"][onload]')) return false;
+    if (!Array.from(document.images).every(img => img.complete)) return false;
+    if (document.querySelector('script[src*="cdn.tailwindcss.com"]')) {
+        const styles = Array.from(document.querySelectorAll('style'));
+        if (!styles.some(style => style.textContent.includes('--tw-'))) return false;
+    }
+    return true;
+}"""
+
+# Run after load: images below the fold are loading="lazy" (see
+# build_images.py) and would otherwise never load in a page that isn't
+# scrolled, so READY_CHECK would wait on them
+LOAD_LAZY_IMAGES = """() => {
+    document.querySelectorAll('img[loading="lazy"]').forEach(img => { img.loading = 'eager'; });
+}"""
+
+def page_url(html_file):
+    """file:// URL of a local HTML file."""
+    return Path(html_file).resolve().as_uri()
+
+def wait_until_ready(page, html_file, timeout_ms=READY_TIMEOUT_MS):
+    """
+    Wait until READY_CHECK passes, at most timeout_ms.
+
+    Returns True when the page became ready; on timeout a warning is
+    printed and False returned, and the page is rendered as it is.
+    """
+    from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+    try:
+        page.wait_for_function(READY_CHECK, timeout=timeout_ms)
+        return True
+    except PlaywrightTimeoutError:
+        print(f"[WARN] {Path(html_file).name} not ready after {timeout_ms / 1000:.0f}s, rendering anyway")
+        return False
+
+def render_page_pdf(page, html_file, output_pdf):
+    """Load html_file into an open Playwright page and print it to output_pdf."""
+    page.goto(page_url(html_file))
+    page.evaluate(LOAD_LAZY_IMAGES)
+    wait_until_ready(page, html_file)
+
+    page.add_style_tag(content=PRINT_CSS)
+    page.pdf(path=str(Path(output_pdf).resolve()), **PDF_OPTIONS)
+
+class BrowserPool:
+    """
+    Long-lived Chromium browsers, each with one reused context and tab.
+
+    render() picks browsers round-robin and relaunches one once it has
+    rendered max_renders pages.
+    """
+
+    def __init__(self, size=DEFAULT_POOL_SIZE, max_renders=MAX_RENDERS_PER_BROWSER, launch_options=None,
+                 offline=False):
+        self.size = max(1, size)
+        self.max_renders = max_renders
+        self.launch_options = launch_options or {}
+        self.routes = VendorRoutes(offline)
+        self.playwright = None
+        self.slots = []
+        self.next_slot = 0
+        self.launches = 0
+        self.renders = 0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def start(self):
+        """Start Playwright; browsers are launched on first use."""
+        from playwright.sync_api import sync_playwright
+
+        self.playwright = sync_playwright().start()
+        self.slots = [{'browser': None, 'context': None, 'page': None, 'renders': 0} for _ in range(self.size)]
+
+    def close(self):
+        """Close every browser and stop Playwright."""
+        for slot in self.slots:
+            self._close_slot(slot)
+        self.slots = []
+        if self.playwright is not None:
+            self.playwright.stop()
+            self.playwright = None
+
+    def _close_slot(self, slot):
+        """Close a slot's browser, ignoring errors from one that already died."""
+        if slot['browser'] is not None:
+            try:
+                slot['browser'].close()
+            except Exception:
+                pass
+        slot.update(browser=None, context=None, page=None, renders=0)
+
+    def _launch(self, slot):
+        """Launch a fresh browser, context and tab into a slot."""
+        self._close_slot(slot)
+        slot['browser'] = self.playwright.chromium.launch(**{'args': CHROMIUM_ARGS, **self.launch_options})
+        slot['context'] = slot['browser'].new_context()
+        install_routes(slot['context'], self.routes)
+        slot['page'] = slot['context'].new_page()
+        self.launches += 1
+
+    def _acquire(self):
+        """Next slot with a live browser and tab, recycling when it is due."""
+        slot = self.slots[self.next_slot]
+        self.next_slot = (self.next_slot + 1) % len(self.slots)
+
+        if slot['browser'] is None or not slot['browser'].is_connected() or slot['renders'] >= self.max_renders:
+            self._launch(slot)
+        elif slot['page'] is None or slot['page'].is_closed():
+            slot['page'] = slot['context'].new_page()
+        return slot
+
+    def run(self, func, *args):
+        """
+        Call func(page, *args) with a pooled tab and return its result.
+
+        Exceptions propagate; the tab that failed is discarded so the next
+        call gets a clean one.
+        """
+        if self.playwright is None:
+            self.start()
+
+        slot = self._acquire()
+        try:
+            return func(slot['page'], *args)
+        except Exception:
+            try:
+                slot['page'].close()
+            except Exception:
+                pass
+            slot['page'] = None
+            raise
+        finally:
+            slot['renders'] += 1
+            self.renders += 1
+
+    def render(self, html_file, output_pdf):
+        """Render html_file to output_pdf through a pooled tab; returns the render time in seconds."""
+        def timed_render(page):
+            start = time.perf_counter()
+            render_page_pdf(page, html_file, output_pdf)
+            return time.perf_counter() - start
+
+        return self.run(timed_render)
+
+def convert_html_to_pdf(html_file, output_pdf, pool):
+    """
+    Convert a single HTML file to PDF through a BrowserPool, printing the
+    outcome. Returns True on success.
+    """
+    try:
+        print(f"\nConverting: {html_file}")
+        seconds = pool.render(html_file, output_pdf)
+
+        file_size = os.path.getsize(output_pdf) / 1024
+        print(f"[SUCCESS] Created: {output_pdf} ({file_size:.2f} KB, {seconds:.1f}s)")
+        return True
+
+    except Exception as e:
+        print(f"[ERROR] Error converting {html_file}: {e}")
+        return False
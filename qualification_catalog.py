@@ -0,0 +1,512 @@
+#!/usr/bin/env python3
+"""
+Unified, indexed catalog of qualification facts.
+
+Qualification facts live in four places: the pages themselves,
+qualifications_data.csv, the spreadsheets in "Qualifications detail" and the
+per-SETA txt files next to them. build_catalog() ingests all of them once,
+matches every source row to its page (by NLRD/SAQA ID, then by name, then
+with qualification_matcher) and stores one entry per page with indexes by
+slug, ID, SETA, NQF level and source name. Every matched row is kept under
+its source and row number; facts that disagree between rows matched to the
+same page are reported as conflicts rather than silently overwritten.
+
+The catalog is saved as compact JSON under .cache/ together with the size and
+mtime of every source, and load_catalog() only rebuilds it when a source
+changed. Tools then look qualifications up with plain dict lookups instead of
+re-reading the sources and matching names with if/elif chains.
+
+Run directly to rebuild the catalog and print a summary.
+"""
+
+import re
+import sys
+import csv
+import html
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+import regex_registry
+from qualification_page import load_all_pages, first_int
+
+# Handle Windows console encoding
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+    sys.stderr.reconfigure(encoding='utf-8')
+
+CATALOG_FILE = Path('.cache') / 'qualification_catalog.json'
+QUALIFICATIONS_DIR = Path('qualifications')
+CSV_FILE = Path('qualifications_data.csv')
+DETAILS_DIR = Path('Qualifications detail')
+
+# Bump when build_catalog() output changes so saved catalogs are rebuilt
+CATALOG_VERSION = 3
+
+# Row facts that must agree between every source matched to one page
+CONFLICT_FIELDS = ['qualification_id', 'nqf_level', 'credits', 'status', 'expiry']
+
+# Date spellings in the sources (spreadsheets give ISO dates, txt files 30-Jun-26)
+DATE_FORMATS = ['%Y-%m-%d', '%d-%b-%y', '%d-%b-%Y', '%d %B %Y', '%d/%m/%Y']
+
+# Canonical SETA keys for the spellings used across pages, CSV and
+# spreadsheets (after lowercasing and dropping a trailing "SETA")
+SETA_ALIASES = {
+    'sseta': 'services',
+    'agri': 'agriseta',
+    'edtp': 'etdp',
+    'mer': 'merseta',
+    'wr': 'w&r',
+    'qcto': 'skills',
+    'skills programme': 'skills',
+}
+
+# Words ignored when comparing qualification names
+NAME_STOPWORDS = {'and', 'of', 'the', 'in', 'for', 'nqf', 'level'}
+
+# "FET Certificate:", "NC:", "Occupational Certificae:" (sic) and friends
+FORMAL_NAME_PREFIX = regex_registry.register_pattern(
+    'catalog.formal_name_prefix',
+    r'^\s*(?:[A-Za-z ]*certi\w*|NC|FETC|(?:Occupational )?Skills Programme)\s*[:_]\s*',
+    re.IGNORECASE
+)
+NQF_SUFFIX = regex_registry.register_pattern(
+    'catalog.nqf_suffix', r'\bNQF\s*(?:Level\s*)?\d+\b', re.IGNORECASE
+)
+DETAIL_MODULE = regex_registry.register_pattern(
+    'catalog.detail_module', r'^Module\s+(\d+)\s*[-–:]\s*(.+)$'
+)
+DETAIL_FIELD = regex_registry.register_pattern(
+    'catalog.detail_field', r'^([A-Za-z][A-Za-z ]+):\s*(.*)$'
+)
+
+def seta_key(seta):
+    """Canonical lowercase key for a SETA name ('Services SETA' -> 'services')."""
+    key = html.unescape(seta or '').lower()
+    key = re.sub(r'\(.*?\)', '', key)
+    key = re.sub(r'\s+seta$', '', key.strip())
+    return SETA_ALIASES.get(key, key)
+
+def normalize_name(name):
+    """Lowercase alphanumeric qualification name without type prefix or NQF level."""
+    name = regex_registry.sub(FORMAL_NAME_PREFIX, '', html.unescape(name or ''))
+    name = regex_registry.sub(NQF_SUFFIX, '', name)
+    return re.sub(r'[^a-z0-9]+', ' ', name.lower()).strip()
+
+def name_tokens(name):
+    """Significant words of a normalized name."""
+    return {token for token in normalize_name(name).split() if token not in NAME_STOPWORDS}
+
+def name_key(name, seta, level):
+    """Index key for a source name: 'seta|normalized name|level'."""
+    return f"{seta_key(seta)}|{normalize_name(name)}|{first_int(str(level))}"
+
+# ---------------------------------------------------------------------------
+# Sources
+# ---------------------------------------------------------------------------
+
+def source_row(source, name, seta, level, credits=0, qualification_id='', **extra):
+    """A qualification fact row from one source, in the catalog's field names."""
+    qualification_id = str(qualification_id or '').strip()
+    # Skills programmes are listed apart from the SETA that accredits them
+    if re.match(r'^\s*(?:Occupational )?Skills Programme', str(name or ''), re.IGNORECASE):
+        seta = 'skills'
+    row = {
+        'source': source,
+        'name': str(name or '').strip(),
+        'seta': seta_key(seta),
+        'nqf_level': first_int(str(level or '')),
+        'credits': first_int(str(credits or '')),
+        'qualification_id': qualification_id if qualification_id.isdigit() else '',
+    }
+    row.update(extra)
+    return row
+
+def load_csv_rows(csv_file=CSV_FILE):
+    """Rows of qualifications_data.csv with stripped column names."""
+    if not Path(csv_file).exists():
+        return []
+    with open(csv_file, 'r', encoding='utf-8-sig', newline='') as f:
+        return [{key.strip(): (value or '').strip() for key, value in row.items() if key}
+                for row in csv.DictReader(f)]
+
+def load_xlsx_rows(xlsx_file):
+    """
+    Rows of every sheet in a workbook whose header has a 'Qualification Name'
+    column, as dicts keyed by stripped header. Needs openpyxl.
+    """
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(xlsx_file, read_only=True, data_only=True)
+    rows = []
+    try:
+        for sheet in workbook.worksheets:
+            values = sheet.iter_rows(values_only=True)
+            header = [str(cell).strip() if cell is not None else '' for cell in next(values, ())]
+            if 'Qualification Name' not in header:
+                continue
+            for cells in values:
+                row = {key: cell for key, cell in zip(header, cells) if key}
+                if row.get('Qualification Name'):
+                    row['Sheet'] = sheet.title
+                    rows.append(row)
+    finally:
+        workbook.close()
+    return rows
+
+def parse_detail_file(txt_file):
+    """
+    Parse a "Qualifications detail" txt file.
+
+    Returns a dict with the header fields (Qualification Name, SETA, NQF
+    Level, Minimum Credits, Qualification NLRD ID, ...) and a 'modules' list
+    of {title, items}.
+    """
+    with open(txt_file, 'r', encoding='utf-8', errors='replace') as f:
+        lines = [line.strip() for line in f]
+
+    detail = {'file': str(txt_file), 'modules': []}
+    module = None
+
+    for line in lines:
+        if not line or set(line) == {'='}:
+            continue
+
+        heading = regex_registry.search(DETAIL_MODULE, line)
+        if heading:
+            module = {'title': f"Module {heading.group(1)}: {heading.group(2).strip()}", 'items': []}
+            detail['modules'].append(module)
+            continue
+
+        if line[0] in '•●' and module is not None:
+            item = line.lstrip('•● \t')
+            # "code, title, NQF Level x, y Credits" -> title
+            parts = [part.strip() for part in item.split(',')]
+            if len(parts) >= 3 and re.match(r'^[\w-]*\d[\w-]*$', parts[0]):
+                item = ', '.join(part for part in parts[1:] if not re.match(r'^(NQF Level|\d+ Credits?)', part))
+            module['items'].append(item)
+            continue
+
+        field = regex_registry.search(DETAIL_FIELD, line)
+        if field and module is None and field.group(1) not in detail:
+            detail[field.group(1).strip()] = field.group(2).strip()
+
+    return detail
+
+def source_files(details_dir=DETAILS_DIR, csv_file=CSV_FILE, qualifications_dir=QUALIFICATIONS_DIR):
+    """Every file the catalog is built from."""
+    files = [Path(csv_file)] if Path(csv_file).exists() else []
+    files += sorted(Path(details_dir).glob('*.xlsx'))
+    files += sorted(Path(details_dir).glob('*/*.txt'))
+    files += sorted(Path(qualifications_dir).glob('*.html'))
+    # Excel lock files ("~$name.xlsx") are not workbooks
+    return [path for path in files if not path.name.startswith('~$')]
+
+def load_source_rows(details_dir=DETAILS_DIR, csv_file=CSV_FILE):
+    """Fact rows from the CSV, the spreadsheets and the detail txt files."""
+    rows = []
+
+    for row in load_csv_rows(csv_file):
+        if row.get('Qualification Name'):
+            rows.append(source_row('csv', row['Qualification Name'], row.get('SETA'),
+                                   row.get('NQF Level'), row.get('Credits')))
+
+    xlsx_files = [path for path in sorted(Path(details_dir).glob('*.xlsx')) if not path.name.startswith('~$')]
+    try:
+        for xlsx_file in xlsx_files:
+            for row in load_xlsx_rows(xlsx_file):
+                rows.append(source_row(
+                    f"xlsx:{xlsx_file.name}", row['Qualification Name'], row.get('SETA'), row.get('NQF Level'),
+                    row.get('Min Credits') or row.get('Credits'), row.get('Qual NLRD'),
+                    status=str(row.get('Status') or '').strip(),
+                    expiry=str(row.get('Expiry Date') or '').split(' ')[0],
+                ))
+    except ImportError:
+        if xlsx_files:
+            print("[SKIP] openpyxl is not installed (pip install openpyxl) - spreadsheets not ingested")
+
+    for txt_file in sorted(Path(details_dir).glob('*/*.txt')):
+        detail = parse_detail_file(txt_file)
+        if not detail.get('Qualification Name'):
+            continue
+        rows.append(source_row(
+            f"detail:{txt_file.parent.name}/{txt_file.name}", detail['Qualification Name'], detail.get('SETA'),
+            detail.get('NQF Level'), detail.get('Minimum Credits'), detail.get('Qualification NLRD ID'),
+            status=detail.get('Status', ''), expiry=detail.get('Expiry Date', ''), modules=detail['modules'],
+        ))
+
+    # Number rows within each source, so rows from one file stay apart
+    counts = {}
+    for row in rows:
+        counts[row['source']] = counts.get(row['source'], 0) + 1
+        row['row'] = counts[row['source']]
+    return rows
+
+# ---------------------------------------------------------------------------
+# Building
+# ---------------------------------------------------------------------------
+
+def page_entry(page):
+    """Catalog entry for a parsed QualificationPage."""
+    slug = Path(page.filename).stem
+    return {
+        'slug': slug,
+        'filename': page.filename,
+        'name': html.unescape(page.name or page.title),
+        'formal_name': '',
+        'seta': seta_key(page.seta) or seta_key(slug.split('-')[0]),
+        'seta_name': html.unescape(page.seta),
+        'nqf_level': page.nqf_level,
+        'credits': page.credits,
+        'duration': page.duration,
+        'qualification_id': page.qualification_id,
+        'id_label': page.id_label,
+        'status': '',
+        'expiry': '',
+        'modules': [],
+        'sources': {},
+        'conflicts': {},
+    }
+
+def build_indexes(entries):
+    """Slug, ID, SETA, NQF level and source-name indexes over entry positions."""
+    index = {'slug': {}, 'id': {}, 'seta': {}, 'nqf_level': {}, 'name': {}}
+
+    for position, entry in enumerate(entries):
+        index['slug'][entry['slug']] = position
+        if entry['qualification_id']:
+            index['id'].setdefault(entry['qualification_id'], []).append(position)
+        index['seta'].setdefault(entry['seta'], []).append(position)
+        index['nqf_level'].setdefault(str(entry['nqf_level']), []).append(position)
+
+        index['name'].setdefault(name_key(entry['name'], entry['seta'], entry['nqf_level']), position)
+        for source in entry['sources'].values():
+            index['name'].setdefault(name_key(source['name'], source['seta'], source['nqf_level']), position)
+
+    return index
+
+def name_confidence(entry, key):
+    """
+    Confidence that a source-name key refers to entry: the lowest confidence
+    any source with that name was matched with (1.0 for the page's own name).
+    """
+    confidences = [source['confidence'] for source in entry['sources'].values()
+                   if name_key(source['name'], source['seta'], source['nqf_level']) == key]
+    return min(confidences, default=1.0)
+
+def match_row(row, index, match_index):
+    """
+    (entry position, confidence) for the page a source row describes; the
+    position is None when no page matches.
+
+    Rows are matched by qualification ID when it identifies one page, then
+    by exact normalized name, then with the fuzzy matcher (limited to the
+    pages sharing the row's ID when several do).
+    """
+    # Imported here because qualification_matcher imports this module
+    from qualification_matcher import match_name, best_match, MIN_CONFIDENCE
+
+    candidates = index['id'].get(row['qualification_id'], []) if row['qualification_id'] else []
+    if len(candidates) == 1:
+        return candidates[0], 1.0
+
+    key = name_key(row['name'], row['seta'], row['nqf_level'])
+    position = index['name'].get(key)
+    if position is not None:
+        return position, name_confidence(match_index['entries'][position], key)
+
+    if not candidates:
+        return best_match(match_index, row['name'], row['seta'], row['nqf_level'])
+
+    for confidence, position in match_name(match_index, row['name'], row['seta'], row['nqf_level'], limit=len(index['slug'])):
+        if position in candidates and confidence >= MIN_CONFIDENCE:
+            return position, confidence
+    return None, 0.0
+
+def comparable(field, value):
+    """A fact value normalized so spellings of the same value compare equal."""
+    value = str(value).strip()
+    if field == 'expiry':
+        for date_format in DATE_FORMATS:
+            try:
+                return datetime.strptime(value, date_format).date().isoformat()
+            except ValueError:
+                pass
+    return value.lower()
+
+def source_key(row):
+    """Key of a row in an entry's sources: the source label and its row number."""
+    return f"{row['source']}:{row['row']}"
+
+def merge_row(entry, row, confidence=1.0):
+    """
+    Record a source row on an entry and fill fields the page doesn't state.
+
+    Facts that disagree with a source matched earlier are recorded under
+    entry['conflicts'] (field -> {source key: value}); the entry keeps the
+    first value.
+    """
+    facts = {key: value for key, value in row.items() if key not in ('source', 'row', 'modules')}
+    facts['confidence'] = confidence
+    key = source_key(row)
+
+    for field in CONFLICT_FIELDS:
+        value = facts.get(field)
+        if not value:
+            continue
+        others = {other: source[field] for other, source in entry['sources'].items()
+                  if source.get(field) and comparable(field, source[field]) != comparable(field, value)}
+        if others:
+            conflict = entry['conflicts'].setdefault(field, {})
+            conflict.update(others)
+            conflict[key] = value
+    entry['sources'][key] = facts
+
+    entry['formal_name'] = entry['formal_name'] or row['name']
+    entry['credits'] = entry['credits'] or row['credits']
+    entry['nqf_level'] = entry['nqf_level'] or row['nqf_level']
+    entry['qualification_id'] = entry['qualification_id'] or row['qualification_id']
+    entry['status'] = entry['status'] or row.get('status', '')
+    entry['expiry'] = entry['expiry'] or row.get('expiry', '')
+    if row.get('modules') and not entry['modules']:
+        entry['modules'] = row['modules']
+
+def source_fingerprints(files):
+    """Size and mtime of every source file, by path."""
+    fingerprints = {}
+    for path in files:
+        stat = os.stat(path)
+        fingerprints[Path(path).as_posix()] = [stat.st_size, stat.st_mtime_ns]
+    return fingerprints
+
+def build_catalog(qualifications_dir=QUALIFICATIONS_DIR, details_dir=DETAILS_DIR, csv_file=CSV_FILE):
+    """Ingest pages and every fact source into an indexed catalog."""
+    files = source_files(details_dir, csv_file, qualifications_dir)
+    # Imported here because qualification_matcher imports this module
+    from qualification_matcher import build_match_index
+
+    entries = [page_entry(page) for page in load_all_pages(qualifications_dir)]
+    index = build_indexes(entries)
+    match_index = build_match_index(entries)
+
+    # Rows with an ID go first so their names are indexed before the rows
+    # that can only be matched by name
+    rows = sorted(load_source_rows(details_dir, csv_file), key=lambda row: not row['qualification_id'])
+
+    unmatched = []
+    for row in rows:
+        position, confidence = match_row(row, index, match_index)
+        if position is None:
+            unmatched.append(dict({key: value for key, value in row.items() if key != 'modules'},
+                                  confidence=confidence))
+            continue
+        merge_row(entries[position], row, confidence)
+        index['name'].setdefault(name_key(row['name'], row['seta'], row['nqf_level']), position)
+
+    conflicts = [{'slug': entry['slug'], 'field': field, 'values': values}
+                 for entry in entries for field, values in sorted(entry['conflicts'].items())]
+
+    return {
+        'version': CATALOG_VERSION,
+        'fingerprints': source_fingerprints(files),
+        'entries': entries,
+        'unmatched': unmatched,
+        'conflicts': conflicts,
+        'index': build_indexes(entries),
+    }
+
+def save_catalog(catalog, catalog_file=CATALOG_FILE):
+    """Write the catalog as compact JSON."""
+    Path(catalog_file).parent.mkdir(parents=True, exist_ok=True)
+    with open(catalog_file, 'w', encoding='utf-8') as f:
+        json.dump(catalog, f, ensure_ascii=False, separators=(',', ':'))
+
+def is_stale(catalog, qualifications_dir=QUALIFICATIONS_DIR, details_dir=DETAILS_DIR, csv_file=CSV_FILE):
+    """True when the catalog version or any source file changed since it was built."""
+    if catalog.get('version') != CATALOG_VERSION:
+        return True
+    files = source_files(details_dir, csv_file, qualifications_dir)
+    return catalog.get('fingerprints') != source_fingerprints(files)
+
+def load_catalog(catalog_file=CATALOG_FILE, rebuild=True):
+    """
+    Return the saved catalog, rebuilding and saving it first when it is
+    missing or stale (unless rebuild=False).
+    """
+    try:
+        with open(catalog_file, 'r', encoding='utf-8') as f:
+            catalog = json.load(f)
+    except (OSError, ValueError):
+        catalog = None
+
+    if catalog is None or (rebuild and is_stale(catalog)):
+        if not rebuild:
+            return None
+        catalog = build_catalog()
+        save_catalog(catalog, catalog_file)
+
+    return catalog
+
+# ---------------------------------------------------------------------------
+# Lookups
+# ---------------------------------------------------------------------------
+
+def get_by_slug(catalog, slug):
+    """Entry for a page slug or filename, or None."""
+    position = catalog['index']['slug'].get(Path(slug).stem)
+    return catalog['entries'][position] if position is not None else None
+
+def find_by_id(catalog, qualification_id):
+    """Entries with an NLRD/SAQA ID."""
+    return [catalog['entries'][i] for i in catalog['index']['id'].get(str(qualification_id), [])]
+
+def find_by_seta(catalog, seta):
+    """Entries for a SETA (any spelling)."""
+    return [catalog['entries'][i] for i in catalog['index']['seta'].get(seta_key(seta), [])]
+
+def find_by_level(catalog, nqf_level):
+    """Entries at an NQF level."""
+    return [catalog['entries'][i] for i in catalog['index']['nqf_level'].get(str(first_int(str(nqf_level))), [])]
+
+def lookup_name(catalog, name, seta, level):
+    """Entry for a qualification name as written in any source, or None."""
+    position = catalog['index']['name'].get(name_key(name, seta, level))
+    return catalog['entries'][position] if position is not None else None
+
+def main():
+    if not QUALIFICATIONS_DIR.exists():
+        print(f"Error: {QUALIFICATIONS_DIR} directory not found")
+        return 1
+
+    print("Building qualification catalog...")
+    print("=" * 60)
+
+    catalog = build_catalog()
+    save_catalog(catalog)
+
+    for entry in catalog['entries']:
+        sources = ', '.join(sorted(source.split(':')[0] for source in entry['sources'])) or 'page only'
+        print(f"[OK] {entry['slug']}: {entry['seta']} | NQF {entry['nqf_level']} | "
+              f"{entry['credits']} credits | ID {entry['qualification_id'] or '-'} ({sources})")
+
+    for conflict in catalog['conflicts']:
+        values = ', '.join(f"{value} ({source})" for source, value in conflict['values'].items())
+        print(f"[CONFLICT] {conflict['slug']}: {conflict['field']} - {values}")
+
+    for row in catalog['unmatched']:
+        print(f"[UNMATCHED] {source_key(row)}: {row['name']} ({row['seta']}, Level {row['nqf_level']}, "
+              f"best confidence {row['confidence']:.2f})")
+
+    print(f"\n{'='*60}")
+    print(f"Entries: {len(catalog['entries'])}")
+    print(f"SETAs: {len(catalog['index']['seta'])}")
+    print(f"Indexed source names: {len(catalog['index']['name'])}")
+    print(f"Unmatched source rows: {len(catalog['unmatched'])}")
+    print(f"Conflicting facts: {len(catalog['conflicts'])}")
+    print(f"Saved to: {CATALOG_FILE} ({CATALOG_FILE.stat().st_size / 1024:.1f} KB)")
+    print(f"{'='*60}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
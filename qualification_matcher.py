@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Fuzzy qualification-name matcher over a precomputed token/trigram index.
+
+Spreadsheet rows name qualifications in their formal form, often with typos
+("Occupational Certificae: Marketing Coordinator", "Eductaion"), while pages
+use short titles ("Marketing Coordinator"). build_match_index() indexes every
+page once by the words and character trigrams of its title, formal name and
+slug, weighted by how rare each feature is. match_name() then scores a name
+against only the pages that share a feature with it and returns candidates
+with a 0-1 confidence, so new rows are matched without adding code branches.
+
+Run directly to show how every CSV row matches, with confidence.
+"""
+
+import sys
+import math
+
+from qualification_page import first_int
+from qualification_catalog import (load_catalog, load_csv_rows, lookup_name, name_confidence, name_key,
+                                   name_tokens, seta_key)
+
+# Handle Windows console encoding
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+    sys.stderr.reconfigure(encoding='utf-8')
+
+# Weight of a shared trigram relative to a shared whole word
+TRIGRAM_WEIGHT = 0.3
+
+# Score multipliers when the SETA or NQF level given with a name differs
+# from the page's
+SETA_MISMATCH = 0.6
+LEVEL_MISMATCH = 0.7
+
+# A best match is accepted at or above this confidence, and only when it
+# beats the runner-up by at least MIN_MARGIN
+MIN_CONFIDENCE = 0.45
+MIN_MARGIN = 0.05
+
+def slug_words(slug):
+    """Name words in a page slug, without the SETA prefix and nqfN suffix."""
+    words = slug.split('-')[1:]
+    return ' '.join(word for word in words if not (word.startswith('nqf') and word[3:].isdigit()))
+
+def name_features(name):
+    """Word and trigram features of a qualification name."""
+    features = set()
+    for word in name_tokens(name):
+        features.add(f'w:{word}')
+        padded = f' {word} '
+        features.update(f'g:{padded[i:i + 3]}' for i in range(len(padded) - 2))
+    return features
+
+def feature_weight(feature, idf):
+    """Weight of a feature given its inverse document frequency."""
+    return idf * (TRIGRAM_WEIGHT if feature.startswith('g:') else 1.0)
+
+def build_match_index(entries):
+    """
+    Inverted index over catalog entries (see qualification_catalog).
+
+    Each entry is indexed by the features of its page name, formal name and
+    slug words.
+    """
+    documents = []
+    for entry in entries:
+        features = set()
+        for name in (entry['name'], entry.get('formal_name', ''), slug_words(entry['slug'])):
+            features |= name_features(name)
+        documents.append(features)
+
+    document_frequency = {}
+    for features in documents:
+        for feature in features:
+            document_frequency[feature] = document_frequency.get(feature, 0) + 1
+
+    count = len(documents)
+    idf = {feature: math.log(1 + count / df) for feature, df in document_frequency.items()}
+
+    postings = {}
+    norms = []
+    for position, features in enumerate(documents):
+        norm = 0.0
+        for feature in features:
+            weight = feature_weight(feature, idf[feature])
+            postings.setdefault(feature, []).append(position)
+            norm += weight * weight
+        norms.append(math.sqrt(norm))
+
+    return {
+        'entries': entries,
+        'postings': postings,
+        'idf': idf,
+        'norms': norms,
+    }
+
+def match_name(index, name, seta=None, level=None, limit=5):
+    """
+    Best candidate pages for a name, as (confidence, entry position) pairs,
+    highest first.
+
+    Confidence is the cosine similarity of the weighted features, scaled
+    down when seta or level is given and differs from the page's.
+    """
+    features = [feature for feature in name_features(name) if feature in index['idf']]
+    if not features:
+        return []
+
+    query_norm = math.sqrt(sum(feature_weight(f, index['idf'][f]) ** 2 for f in features))
+    shared = {}
+    for feature in features:
+        weight = feature_weight(feature, index['idf'][feature])
+        for position in index['postings'][feature]:
+            shared[position] = shared.get(position, 0.0) + weight * weight
+
+    wanted_seta = seta_key(seta) if seta else ''
+    wanted_level = first_int(str(level)) if level else 0
+
+    scored = []
+    for position, dot in shared.items():
+        entry = index['entries'][position]
+        confidence = dot / (query_norm * index['norms'][position])
+        if wanted_seta and entry['seta'] != wanted_seta:
+            confidence *= SETA_MISMATCH
+        if wanted_level and entry['nqf_level'] != wanted_level:
+            confidence *= LEVEL_MISMATCH
+        scored.append((round(confidence, 3), position))
+
+    scored.sort(key=lambda item: (-item[0], item[1]))
+    return scored[:limit]
+
+def best_match(index, name, seta=None, level=None):
+    """
+    (entry position, confidence) of a confident, unambiguous match, or
+    (None, confidence of the best candidate).
+    """
+    candidates = match_name(index, name, seta, level, limit=2)
+    if not candidates:
+        return None, 0.0
+
+    confidence, position = candidates[0]
+    if confidence < MIN_CONFIDENCE:
+        return None, confidence
+    if len(candidates) > 1 and confidence - candidates[1][0] < MIN_MARGIN:
+        return None, confidence
+    return position, confidence
+
+def find_entry(catalog, name, seta=None, level=None, match_index=None):
+    """
+    (catalog entry, confidence) for a qualification name, or (None, best
+    confidence).
+
+    Names already matched when the catalog was built are an O(1) lookup;
+    anything else goes through the fuzzy index (built on first use when
+    match_index is not given).
+    """
+    entry = lookup_name(catalog, name, seta, level)
+    if entry:
+        return entry, name_confidence(entry, name_key(name, seta, level))
+
+    if match_index is None:
+        match_index = build_match_index(catalog['entries'])
+    position, confidence = best_match(match_index, name, seta, level)
+    return (catalog['entries'][position] if position is not None else None), confidence
+
+def main():
+    catalog = load_catalog()
+    index = build_match_index(catalog['entries'])
+
+    print(f"Indexed {len(catalog['entries'])} pages ({len(index['postings'])} features)")
+    print("=" * 60)
+
+    matched = 0
+    rows = [row for row in load_csv_rows() if row.get('Qualification Name')]
+    for row in rows:
+        entry, confidence = find_entry(catalog, row['Qualification Name'], row.get('SETA'), row.get('NQF Level'), index)
+        if entry is None:
+            print(f"[NONE {confidence:.2f}] {row['Qualification Name']} (Level {row.get('NQF Level')})")
+            continue
+        matched += 1
+        print(f"[MATCH {confidence:.2f}] {row['Qualification Name']} (Level {row.get('NQF Level')}) "
+              f"-> {entry['filename']}")
+
+    print(f"\n{'='*60}")
+    print(f"Matched {matched} of {len(rows)} CSV rows (minimum confidence {MIN_CONFIDENCE})")
+    print(f"{'='*60}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+Structured model of a qualifications/*.html page, parsed once and cached.
+
+parse_page() pulls the facts the page tools need - sidebar fields, hero
+stats, career opportunities, modules and the enquiryData block - into a
+QualificationPage, together with the source offsets of every section.
+export_qualifications_simple.py reads the facts; batch_update_sidebars.py,
+standardize_sidebars.py and update_source_field.py look the page up with
+page_for_content() and splice() their rewrite in at the cached offsets
+instead of re-searching with their own regexes.
+
+page_for_content() (and read_page()/load_page() for files) cache the parsed
+model as JSON under CACHE_DIR, keyed by the page's name and content hash, so
+tools only re-parse pages that actually changed. A page keeps one cache entry (older ones are
+deleted when it is re-parsed), and load_all_pages() deletes the entries of
+pages that no longer exist. Bump PARSER_VERSION when parsing changes.
+
+Run directly to (re)build the cache and print a summary of every page.
+"""
+
+import re
+import sys
+import json
+import hashlib
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+
+import regex_registry
+
+# Where parsed pages are cached, as <page stem>.<content hash>.json
+CACHE_DIR = Path('.cache') / 'qualification_pages'
+
+# Bump when parse_page() output changes so cached models are rebuilt
+PARSER_VERSION = 4
+
+# Files that are not real qualification pages
+EXCLUDED_FILES = ['template-qualification.html']
+
+# Headings parsed like modules but never one
+NON_MODULE_TITLES = ['Career Opportunities', 'Need Help?', 'Additional Opportunities', 'Module Details Coming Soon']
+
+# Opening of a sidebar label/value row
+FIELD_ROW = '<div class="flex justify-between'
+
+# Sidebar labels used for the qualification ID, in order of preference
+ID_LABELS = ['NLRD ID', 'SAQA Qual ID', 'SAQA ID']
+
+TITLE = regex_registry.register_pattern(
+    'page.title', r'<title>(.*?)</title>', re.IGNORECASE | re.DOTALL
+)
+H1 = regex_registry.register_pattern(
+    'page.h1', r'<h1[^>]*>(.*?)</h1>', re.IGNORECASE | re.DOTALL
+)
+SIDEBAR_HEADING = regex_registry.register_pattern(
+    'page.sidebar_heading', r'<h3[^>]*>\s*(?:Qualification Details|Quick Facts)\s*</h3>'
+)
+SIDEBAR_FIELD = regex_registry.register_pattern(
+    'page.sidebar_field',
+    r'<span class="text-gray-600[^"]*">\s*([^<]+?)\s*:?\s*</span>\s*<span class="font-semibold[^"]*">\s*([^<]*?)\s*</span>'
+)
+SECTION_END = regex_registry.register_pattern(
+    'page.section_end', r'Career Opportunities|</section>'
+)
+HERO_STAT = regex_registry.register_pattern(
+    'page.hero_stat',
+    r'<div class="text-(?:xl|2xl|3xl) font-bold[^"]*">\s*([^<]+?)\s*</div>\s*<div class="text-sm[^"]*">\s*([^<]+?)\s*</div>'
+)
+CAREER_HEADING = regex_registry.register_pattern(
+    'page.career_heading', r'<(h[2-4])[^>]*>\s*Career Opportunities\s*</\1>'
+)
+CAREER_END = regex_registry.register_pattern(
+    'page.career_end', r'<h[2-6][^>]*>|<!-- |</section>'
+)
+CAREER_END_H2 = regex_registry.register_pattern(
+    'page.career_end_h2', r'<h2[^>]*>|</section>'
+)
+CAREER_ITEM = regex_registry.register_pattern(
+    'page.career_item',
+    r'<(?:li|div) class="flex items-(?:start|center)">(?:(?!</li>|</div>).)*?'
+    r'(?:<strong>\s*([^<]+?)\s*</strong>|<span(?: class="text-sm text-gray-600")?>\s*([^<]+?)\s*</span>'
+    r'|</i>\s*([^<]+?)\s*</li>)',
+    re.DOTALL
+)
+MODULES_HEADING = regex_registry.register_pattern(
+    'page.modules_heading',
+    r'<(h[23])[^>]*>(?!\s*Module\s*\d)[^<]*\b(?:Modules?|Learning Areas|Core Competencies|Knowledge Component)\b[^<]*</\1>'
+)
+MODULES_END = regex_registry.register_pattern(
+    'page.modules_end', r'<h[23][^>]*>(?!\s*Module\s*\d)|<div class="lg:col-span-1|</section>'
+)
+MODULES_END_H2 = regex_registry.register_pattern(
+    'page.modules_end_h2', r'<h2[^>]*>|<div class="lg:col-span-1|</section>'
+)
+MODULE = regex_registry.register_pattern(
+    'page.module',
+    r'<(h[34]) class="[^"]*font-(?:bold|semibold)[^"]*">\s*([^<]+?)\s*</\1>\s*'
+    r'(?:<p[^>]*>(.*?)</p>\s*)?(?:<ul[^>]*>(.*?)</ul>)?',
+    re.DOTALL
+)
+MODULE_TITLE = regex_registry.register_pattern(
+    'page.module_title', r'^Module\s*\d+\s*[:\-\u2013]'
+)
+MODULE_ITEM = regex_registry.register_pattern(
+    'page.module_item', r'<li[^>]*>(.*?)</li>', re.DOTALL
+)
+ENQUIRY_DATA = regex_registry.register_pattern(
+    'page.enquiry_data', r'const enquiryData = \{(.*?)\};', re.DOTALL
+)
+ENQUIRY_FIELD = regex_registry.register_pattern(
+    'page.enquiry_field', r'^\s*(\w+):\s*(.+?),?\s*$', re.MULTILINE
+)
+
+@dataclass
+class QualificationPage:
+    """Facts parsed from one qualification page."""
+    filename: str
+    content_hash: str
+    title: str = ''
+    name: str = ''
+    seta: str = ''
+    nqf_level: int = 0
+    credits: int = 0
+    duration: str = ''
+    qualification_id: str = ''
+    id_label: str = ''
+    sidebar: dict = field(default_factory=dict)
+    hero_stats: list = field(default_factory=list)
+    career_opportunities: list = field(default_factory=list)
+    modules: list = field(default_factory=list)
+    enquiry_data: dict = field(default_factory=dict)
+    # Section name -> [start, end] character offsets in the source page.
+    # Sidebar values are under 'sidebar.<label>', the field rows under
+    # 'sidebar_fields'.
+    offsets: dict = field(default_factory=dict)
+
+def content_hash(content):
+    """Cache key for page content under the current parser version."""
+    return hashlib.sha256(f"{PARSER_VERSION}\n{content}".encode('utf-8')).hexdigest()
+
+def strip_tags(html):
+    """Remove tags and collapse whitespace."""
+    return re.sub(r'\s+', ' ', re.sub(r'<[^>]+>', '', html)).strip()
+
+def first_int(text):
+    """First integer in text, or 0."""
+    match = re.search(r'\d+', text or '')
+    return int(match.group(0)) if match else 0
+
+def parse_sidebar(content, page):
+    """
+    Sidebar label/value fields with the offsets of each value.
+
+    'sidebar_fields' spans the field rows (<div class="flex justify-between">)
+    from the first to the last, for tools that rebuild the field list.
+    """
+    heading = regex_registry.search(SIDEBAR_HEADING, content)
+    if not heading:
+        return
+
+    start = heading.end()
+    end_match = regex_registry.search(SECTION_END, content[start:])
+    end = start + end_match.start() if end_match else len(content)
+
+    section_end = start
+    rows = []
+    for match in regex_registry.finditer(SIDEBAR_FIELD, content[start:end]):
+        label = match.group(1).strip()
+        page.sidebar[label] = match.group(2)
+        page.offsets[f'sidebar.{label}'] = [start + match.start(2), start + match.end(2)]
+        section_end = start + match.end()
+
+        row_start = content.rfind('<div', start, start + match.start())
+        row_end = content.find('</div>', section_end)
+        if row_start != -1 and content.startswith(FIELD_ROW, row_start) and row_end != -1:
+            rows.append([row_start, row_end + len('</div>')])
+
+    if page.sidebar:
+        page.offsets['sidebar'] = [heading.start(), section_end]
+    if rows:
+        page.offsets['sidebar_fields'] = [rows[0][0], rows[-1][1]]
+
+def parse_career_opportunities(content, page):
+    """Career opportunity titles from the sidebar or main-content list."""
+    heading = regex_registry.search(CAREER_HEADING, content)
+    if not heading:
+        return
+
+    # An h2 heading groups its careers under h3 subheadings
+    start = heading.end()
+    end_pattern = CAREER_END_H2 if heading.group(1) == 'h2' else CAREER_END
+    end_match = regex_registry.search(end_pattern, content[start:])
+    end = start + end_match.start() if end_match else len(content)
+
+    for match in regex_registry.finditer(CAREER_ITEM, content[start:end]):
+        title = strip_tags(next(group for group in match.groups() if group))
+        if title and title not in page.career_opportunities:
+            page.career_opportunities.append(title)
+
+    page.offsets['career_opportunities'] = [heading.start(), end]
+
+def module_sections(content):
+    """
+    [start, end] spans of the modules sections.
+
+    A section runs from a modules heading to the next heading of its level
+    (an h3 heading also stops at the next h2), skipping "Module N" headings,
+    and never into the sidebar.
+    """
+    sections = []
+    for heading in regex_registry.finditer(MODULES_HEADING, content):
+        end_pattern = MODULES_END_H2 if heading.group(1) == 'h2' else MODULES_END
+        end_match = regex_registry.search(end_pattern, content[heading.end():])
+        end = heading.end() + end_match.start() if end_match else len(content)
+        sections.append([heading.start(), end])
+    return sections
+
+def parse_modules(content, page):
+    """
+    Module titles with their bullet items (or card description).
+
+    A heading counts as a module when it is titled "Module N" (which may
+    stand alone) or sits in a modules section and is followed by a
+    description or bullet list.
+    """
+    sections = module_sections(content)
+    if sections:
+        page.offsets['modules_heading'] = sections[0]
+
+    matches = []
+    for match in regex_registry.finditer(MODULE, content):
+        title = strip_tags(match.group(2))
+        numbered = regex_registry.search(MODULE_TITLE, title)
+        if title in NON_MODULE_TITLES or (match.group(3) is None and match.group(4) is None and not numbered):
+            continue
+        if numbered or any(start < match.start() < end for start, end in sections):
+            matches.append(match)
+
+    for match in matches:
+        if match.group(4) is not None:
+            items = [strip_tags(item).lstrip('\u2022 ') for item in regex_registry.findall(MODULE_ITEM, match.group(4))]
+        elif match.group(3) is not None:
+            items = [strip_tags(match.group(3))]
+        else:
+            items = []
+        page.modules.append({'title': strip_tags(match.group(2)), 'items': [item for item in items if item]})
+
+    if matches:
+        page.offsets['modules'] = [matches[0].start(), matches[-1].end()]
+
+def empty_sections(page):
+    """Sections whose heading is on the page but whose items parsed to nothing."""
+    empty = []
+    if 'career_opportunities' in page.offsets and not page.career_opportunities:
+        empty.append('career opportunities')
+    if 'modules_heading' in page.offsets and not page.modules:
+        empty.append('modules')
+    return empty
+
+def parse_enquiry_data(content, page):
+    """Keys and values of the enquiryData object (quoted strings unquoted)."""
+    match = regex_registry.search(ENQUIRY_DATA, content)
+    if not match:
+        return
+
+    for key, value in regex_registry.findall(ENQUIRY_FIELD, match.group(1)):
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in '\'"':
+            value = value[1:-1]
+        page.enquiry_data[key] = value
+
+    page.offsets['enquiry_data'] = [match.start(), match.end()]
+
+def parse_page(content, filename):
+    """Parse a qualification page into a QualificationPage."""
+    page = QualificationPage(filename=filename, content_hash=content_hash(content))
+
+    title = regex_registry.search(TITLE, content)
+    if title:
+        page.title = strip_tags(title.group(1))
+        page.offsets['title'] = [title.start(1), title.end(1)]
+
+    # The header logo text is also an h1; the hero heading is the real name
+    for match in regex_registry.finditer(H1, content):
+        name = strip_tags(match.group(1))
+        if name and name != 'SpecCon Holdings':
+            page.name = name
+            page.offsets['name'] = [match.start(1), match.end(1)]
+            break
+
+    parse_sidebar(content, page)
+
+    hero_stats = regex_registry.finditer(HERO_STAT, content)
+    page.hero_stats = [{'value': m.group(1), 'label': m.group(2)} for m in hero_stats]
+    if hero_stats:
+        page.offsets['hero_stats'] = [hero_stats[0].start(), hero_stats[-1].end()]
+
+    parse_career_opportunities(content, page)
+    parse_modules(content, page)
+    parse_enquiry_data(content, page)
+
+    # Typed fields from the sidebar, falling back to the filename
+    page.seta = page.sidebar.get('SETA', '')
+    page.nqf_level = first_int(page.sidebar.get('NQF Level') or page.sidebar.get('NQF level'))
+    if not page.nqf_level:
+        # The last nqf<N> in the name is the page's own level
+        page.nqf_level = first_int(''.join(re.findall(r'nqf(\d+)', filename.lower())[-1:]))
+    page.credits = first_int(page.sidebar.get('Credits'))
+    page.duration = page.sidebar.get('Duration', '')
+    for label in ID_LABELS:
+        if page.sidebar.get(label):
+            page.qualification_id = page.sidebar[label]
+            page.id_label = label
+            break
+
+    return page
+
+def page_for_content(content, filename, cache_dir=CACHE_DIR):
+    """
+    Return the QualificationPage for a page's content, using the on-disk cache.
+
+    The content is re-parsed only when no cached model exists for its hash,
+    so transforms can look up the page they are rewriting in memory.
+    """
+    stem = Path(filename).stem
+    cache_file = Path(cache_dir) / f'{stem}.{content_hash(content)}.json'
+
+    if cache_file.exists():
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('filename') == Path(filename).name:
+                return QualificationPage(**data)
+        except (OSError, ValueError, TypeError):
+            pass
+
+    page = parse_page(content, Path(filename).name)
+
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(cache_file, 'w', encoding='utf-8') as f:
+        json.dump(asdict(page), f)
+
+    # Entries for the page's earlier content
+    for old in cache_file.parent.glob(f'{stem}.*.json'):
+        if old != cache_file and '.' not in old.name[len(stem) + 1:-len('.json')]:
+            old.unlink()
+
+    return page
+
+def read_page(html_file, cache_dir=CACHE_DIR):
+    """Return (content, QualificationPage) for a file; offsets index into content."""
+    with open(html_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+    return content, page_for_content(content, Path(html_file).name, cache_dir)
+
+def load_page(html_file, cache_dir=CACHE_DIR):
+    """Return the QualificationPage for a file, using the on-disk cache."""
+    return read_page(html_file, cache_dir)[1]
+
+def splice(content, span, replacement):
+    """Replace content[start:end] for a [start, end] offset pair."""
+    start, end = span
+    return content[:start] + replacement + content[end:]
+
+def prune_cache(html_files, cache_dir=CACHE_DIR):
+    """Delete cache entries that belong to none of html_files."""
+    stems = {Path(html_file).stem for html_file in html_files}
+    for cache_file in Path(cache_dir).glob('*.json'):
+        stem = cache_file.name[:-len('.json')].rpartition('.')[0]
+        if stem not in stems:
+            cache_file.unlink()
+
+def load_all_pages(qualifications_dir='qualifications', cache_dir=CACHE_DIR):
+    """Load every qualification page (excluding templates), sorted by name."""
+    html_files = [html_file for html_file in sorted(Path(qualifications_dir).glob('*.html'))
+                  if html_file.name not in EXCLUDED_FILES]
+    pages = [load_page(html_file, cache_dir) for html_file in html_files]
+    prune_cache(html_files, cache_dir)
+    return pages
+
+def main():
+    qualifications_dir = Path('qualifications')
+
+    if not qualifications_dir.exists():
+        print(f"Error: {qualifications_dir} directory not found")
+        return 1
+
+    pages = load_all_pages(qualifications_dir)
+
+    unparsed = 0
+    for page in pages:
+        missing = [name for name in ('seta', 'nqf_level', 'credits', 'qualification_id') if not getattr(page, name)]
+        status = f"[WARN] missing {', '.join(missing)}" if missing else '[OK]'
+        print(f"{status} {page.filename}: {page.name} | {page.seta} | NQF {page.nqf_level} | "
+              f"{page.credits} credits | {len(page.modules)} modules | {len(page.career_opportunities)} careers")
+
+        empty = empty_sections(page)
+        if empty:
+            unparsed += 1
+            print(f"[WARN] {page.filename}: {' and '.join(empty)} heading found but nothing parsed")
+
+    print(f"\n{'='*60}")
+    print(f"Parsed {len(pages)} qualification pages (cache: {CACHE_DIR})")
+    if unparsed:
+        print(f"[WARN] Headings with nothing parsed: {unparsed} pages")
+    print(f"{'='*60}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
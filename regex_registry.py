@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Shared registry of precompiled regex patterns with a hit-count profiler.
+
+Scripts register their patterns once at import time and call sub(),
+search(), findall() and finditer() by name instead of passing pattern
+strings to re on every file. Every call records its runtime, match count
+and input size, so print_profile() can show which rewrites dominate a
+full-site pass and flag patterns whose runtime grows faster than linearly
+with page size (usually DOTALL `.*?` patterns that backtrack across the
+whole document).
+"""
+
+import math
+import re
+import time
+
+# Compiled patterns, by name
+PATTERNS = {}
+
+# Per-pattern counters, by name: calls, matches, seconds, samples
+STATS = {}
+
+# Samples kept per pattern for the growth estimate
+MAX_SAMPLES = 2000
+
+# Runtime exponent (time ~ size ** k) above which a pattern is flagged
+SUPERLINEAR_EXPONENT = 1.3
+
+def register_pattern(name, pattern, flags=0):
+    """
+    Compile a pattern once and register it under a name.
+
+    Registering the same name again with the same pattern is a no-op, so
+    modules can register at import time.
+    """
+    existing = PATTERNS.get(name)
+    if existing is not None:
+        if existing.pattern != pattern or existing.flags != re.compile(pattern, flags).flags:
+            raise ValueError(f"Pattern '{name}' is already registered with a different pattern")
+        return name
+
+    PATTERNS[name] = re.compile(pattern, flags)
+    return name
+
+def get_pattern(name):
+    """Return the compiled pattern registered under name."""
+    return PATTERNS[name]
+
+def _record(name, size, seconds, matches):
+    """Record one call against a pattern."""
+    stats = STATS.get(name)
+    if stats is None:
+        stats = STATS[name] = {'calls': 0, 'matches': 0, 'seconds': 0.0, 'samples': []}
+
+    stats['calls'] += 1
+    stats['matches'] += matches
+    stats['seconds'] += seconds
+    if len(stats['samples']) < MAX_SAMPLES:
+        stats['samples'].append((size, seconds))
+
+def sub(name, repl, string, count=0):
+    """re.sub() with a registered pattern."""
+    return subn(name, repl, string, count=count)[0]
+
+def subn(name, repl, string, count=0):
+    """re.subn() with a registered pattern."""
+    start = time.perf_counter()
+    matches = 0
+    try:
+        result, matches = PATTERNS[name].subn(repl, string, count=count)
+    finally:
+        # Recorded even when interrupted, so a timed-out pattern still shows
+        _record(name, len(string), time.perf_counter() - start, matches)
+    return result, matches
+
+def search(name, string):
+    """re.search() with a registered pattern."""
+    start = time.perf_counter()
+    match = None
+    try:
+        match = PATTERNS[name].search(string)
+    finally:
+        _record(name, len(string), time.perf_counter() - start, 1 if match else 0)
+    return match
+
+def findall(name, string):
+    """re.findall() with a registered pattern."""
+    start = time.perf_counter()
+    matches = []
+    try:
+        matches = PATTERNS[name].findall(string)
+    finally:
+        _record(name, len(string), time.perf_counter() - start, len(matches))
+    return matches
+
+def finditer(name, string):
+    """re.finditer() with a registered pattern, returned as a list."""
+    start = time.perf_counter()
+    matches = []
+    try:
+        matches = list(PATTERNS[name].finditer(string))
+    finally:
+        _record(name, len(string), time.perf_counter() - start, len(matches))
+    return matches
+
+def take_stats():
+    """Return the counters collected in this process and reset them."""
+    stats = dict(STATS)
+    STATS.clear()
+    return stats
+
+def merge_stats(stats_list):
+    """Merge counters from several processes (see take_stats)."""
+    merged = {}
+    for stats in stats_list:
+        for name, entry in stats.items():
+            target = merged.setdefault(name, {'calls': 0, 'matches': 0, 'seconds': 0.0, 'samples': []})
+            target['calls'] += entry['calls']
+            target['matches'] += entry['matches']
+            target['seconds'] += entry['seconds']
+            target['samples'].extend(entry['samples'][:MAX_SAMPLES - len(target['samples'])])
+    return merged
+
+def growth_exponent(samples):
+    """
+    Estimate k in time ~ size ** k by least squares on log-log samples.
+
+    Returns None when the samples don't cover a wide enough size range to
+    say anything (fewer than 5 usable samples or under a 2x size spread).
+    """
+    points = [(math.log(size), math.log(seconds)) for size, seconds in samples if size > 0 and seconds > 0]
+    if len(points) < 5:
+        return None
+
+    sizes = [x for x, y in points]
+    if max(sizes) - min(sizes) < math.log(2):
+        return None
+
+    mean_x = sum(sizes) / len(points)
+    mean_y = sum(y for x, y in points) / len(points)
+    var_x = sum((x - mean_x) ** 2 for x in sizes)
+    cov_xy = sum((x - mean_x) * (y - mean_y) for x, y in points)
+
+    return cov_xy / var_x
+
+def profile_report(stats=None):
+    """
+    Build per-pattern rows, slowest first.
+
+    Each row has name, calls, matches, seconds, us_per_kb, exponent and
+    superlinear (True when the growth exponent exceeds SUPERLINEAR_EXPONENT).
+    """
+    stats = STATS if stats is None else stats
+    rows = []
+
+    for name, entry in stats.items():
+        total_kb = sum(size for size, seconds in entry['samples']) / 1024
+        sampled_seconds = sum(seconds for size, seconds in entry['samples'])
+        exponent = growth_exponent(entry['samples'])
+
+        rows.append({
+            'name': name,
+            'calls': entry['calls'],
+            'matches': entry['matches'],
+            'seconds': entry['seconds'],
+            'us_per_kb': (sampled_seconds * 1e6 / total_kb) if total_kb else 0.0,
+            'exponent': exponent,
+            'superlinear': exponent is not None and exponent > SUPERLINEAR_EXPONENT,
+        })
+
+    return sorted(rows, key=lambda row: row['seconds'], reverse=True)
+
+def print_profile(stats=None):
+    """Print the pattern profile table."""
+    rows = profile_report(stats)
+    if not rows:
+        print("No registered patterns were used")
+        return
+
+    print(f"\n{'='*90}")
+    print("Regex profile (slowest first)")
+    print(f"{'='*90}")
+    print(f"{'Pattern':<40} {'Calls':>7} {'Matches':>8} {'Total ms':>10} {'us/KB':>8} {'Growth':>7}")
+    print(f"{'-'*90}")
+
+    for row in rows:
+        growth = f"{row['exponent']:.2f}" if row['exponent'] is not None else '-'
+        flag = '  [SUPERLINEAR]' if row['superlinear'] else ''
+        print(f"{row['name']:<40} {row['calls']:>7} {row['matches']:>8} "
+              f"{row['seconds'] * 1000:>10.2f} {row['us_per_kb']:>8.1f} {growth:>7}{flag}")
+
+    flagged = [row['name'] for row in rows if row['superlinear']]
+    if flagged:
+        print(f"\n[WARN] Runtime grows faster than page size for: {', '.join(flagged)}")
+    print(f"{'='*90}")
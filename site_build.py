@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for build stages that emit static assets and relink pages.
+
+A build stage (build_tailwind.py and friends) writes a content-hashed
+asset - the name changes whenever the bytes do, so browsers and CDNs can
+cache it forever - and then rewrites every page to reference it. Pages are
+rewritten through the transform engine, so each page is read and written
+at most once per stage and the usual [UPDATED] report and --dry-run and
+--workers flags apply.
+
+Pages live at the site root and one folder down, so asset links are
+written relative to each page with asset_prefix().
+"""
+
+import hashlib
+import functools
+from pathlib import Path
+
+from transform_engine import SITE_FOLDERS, find_site_files, make_transform, run_transforms
+
+# Folders whose pages build stages rewrite ('.' is the site root; templates/
+# so pages generated later keep the rewritten links)
+BUILD_FOLDERS = ['.'] + SITE_FOLDERS + ['templates']
+
+# Hex digits of the content hash kept in asset names
+HASH_LENGTH = 10
+
+# Where build stages keep their state between runs
+BUILD_CACHE_DIR = Path('.cache') / 'build'
+
+def asset_prefix(folder):
+    """Relative path from a page in folder back to the site root."""
+    return '' if folder == '.' else '../'
+
+def short_hash(data):
+    """Content hash used in asset names."""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+def write_hashed_asset(directory, stem, suffix, data):
+    """
+    Write data to directory/stem.<hash><suffix> and delete older builds of
+    the same asset. Returns the path, relative to the site root.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+
+    path = directory / f'{stem}.{short_hash(data)}{suffix}'
+    for old in directory.glob(f'{stem}.*{suffix}'):
+        middle = old.name[len(stem) + 1:-len(suffix)]
+        if old != path and len(middle) == HASH_LENGTH and all(c in '0123456789abcdef' for c in middle):
+            old.unlink()
+
+    if not path.exists():
+        with open(path, 'wb') as f:
+            f.write(data)
+    return path
+
+def rewrite_pages(name, func, dry_run=False, workers=1, folders=None, **kwargs):
+    """
+    Run func(content, filename, prefix=..., **kwargs) over every page in
+    folders (default BUILD_FOLDERS), where prefix is the page's path back
+    to the site root. Returns the transform engine report.
+    """
+    folders = folders or BUILD_FOLDERS
+    transforms = [
+        make_transform(name, functools.partial(func, prefix=asset_prefix(folder), **kwargs), folders=[folder])
+        for folder in folders
+    ]
+    return run_transforms(transforms=transforms, files=find_site_files(folders), dry_run=dry_run, workers=workers)
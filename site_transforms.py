@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Site-wide transforms run through the single-pass transform engine.
+
+Each transform wraps an existing fix_/update_ helper so that one run of this
+script reads every page once, applies all transforms in order, and writes
+each changed page once. Add new transforms here instead of writing another
+standalone script that re-reads the whole site.
+"""
+
+import sys
+
+import regex_registry
+from transform_engine import register_transform, run_transforms, print_summary, get_worker_count
+from batch_update_sidebars import standardize_sidebar, EXCLUDED_FILES as SIDEBAR_EXCLUDED_FILES
+from update_source_field import update_source_field
+from update_api_format import update_enquiry_data_format
+from fix_nav_styling import apply_nav_styling
+
+# Handle Windows console encoding
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+    sys.stderr.reconfigure(encoding='utf-8')
+
+def api_format(content, filename):
+    """Rewrite enquiryData to the exact enquiry API format."""
+    if 'function submitEnquiry' not in content:
+        return content
+    updated_content, was_updated = update_enquiry_data_format(content, filename)
+    return updated_content
+
+def source_field(content, filename):
+    """Set the enquiryData Source field to the page name."""
+    if 'const enquiryData' not in content:
+        return content
+    updated_content, status = update_source_field(content, filename)
+    return updated_content
+
+# Transforms run in registration order. Bump version= when a transform's
+# output changes so --incremental runs re-apply it. timeout= is the
+# per-file budget in seconds.
+register_transform('nav_styling', apply_nav_styling)
+register_transform('standardize_sidebar', standardize_sidebar,
+                   folders=['qualifications'], exclude=SIDEBAR_EXCLUDED_FILES, version='2')
+register_transform('api_format', api_format, folders=['qualifications'])
+register_transform('source_field', source_field, folders=['qualifications'], version='2')
+
+def main():
+    print("Running site transforms (single pass)...")
+    print("=" * 60)
+
+    # Pass --dry-run to report changes without writing files
+    dry_run = '--dry-run' in sys.argv
+    # Pass --workers N to set the process count (defaults to all cores)
+    workers = get_worker_count(sys.argv)
+    # Pass --incremental to skip pages unchanged since the last incremental run
+    incremental = '--incremental' in sys.argv
+
+    report = run_transforms(dry_run=dry_run, workers=workers, incremental=incremental)
+    print_summary(report)
+
+    # Pass --profile to show which registered patterns dominate the pass
+    if '--profile' in sys.argv:
+        regex_registry.print_profile(report['regex_stats'])
+
+    return 0 if report['errors'] == 0 else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
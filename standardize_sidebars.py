@@ -5,12 +5,16 @@ Keep only: SETA, NQF Level, Credits, Duration, NLRD ID (or SAQA Qual ID)
 Remove: Delivery Mode, Assessment, Status, Expiry Date, Provider, etc.
 Keep Career Opportunities section if it exists.
 Keep "Need Help?" section if it exists.
+
+Fields and the span of the field rows come from the cached QualificationPage
+model (see qualification_page.py); the new rows are spliced in at its offsets.
 """
 
-import re
-import os
 from pathlib import Path
 
+from qualification_page import read_page, splice
+from batch_update_sidebars import sidebar_rows
+
 # Files to exclude
 EXCLUDED_FILES = [
     'skills-conflict-management-nqf5.html',
@@ -26,52 +30,19 @@ def process_file(filepath):
     """Process a single HTML file to standardize its sidebar."""
     print(f"Processing: {filepath.name}")
 
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    # Find the sidebar section with Qualification Details or Quick Facts
-    # Pattern 1: Look for the details container
-    pattern1 = r'(<div class="space-y-4[^"]*">)(.*?)(</div>\s*(?:</div>|<div class="space-y-4">|<div class="mb-8[^"]*">|<button|<!-- Career Opportunities -->))'
-
-    def replace_sidebar_fields(match):
-        opening = match.group(1)
-        fields_section = match.group(2)
-        closing = match.group(3)
-
-        # Extract all field divs
-        field_pattern = r'<div class="flex justify-between[^"]*">\s*<span class="text-gray-600[^"]*">([^<]+)</span>\s*<span class="font-semibold[^"]*">([^<]+)</span>\s*</div>'
-
-        fields = re.findall(field_pattern, fields_section)
-
-        if not fields:
-            return match.group(0)  # Return original if no fields found
+    content, page = read_page(filepath)
 
+    if 'sidebar_fields' not in page.offsets:
+        new_content = content  # No field rows found
+    else:
         # Filter and reorder fields
-        kept_fields = []
-        field_dict = {label.strip().rstrip(':'): value.strip() for label, value in fields}
-
-        for keep_field in KEEP_FIELDS:
-            if keep_field in field_dict:
-                kept_fields.append((keep_field, field_dict[keep_field]))
-
-        if not kept_fields:
-            return match.group(0)  # Return original if no fields to keep
-
-        # Rebuild the fields HTML
-        new_fields = []
-        for label, value in kept_fields:
-            # Determine if border-b should be included (all except last)
-            new_fields.append(
-                f'                            <div class="flex justify-between items-center py-3 border-b border-gray-100">\n'
-                f'                                <span class="text-gray-600">{label}</span>\n'
-                f'                                <span class="font-semibold">{value}</span>\n'
-                f'                            </div>'
-            )
-
-        return opening + '\n' + '\n'.join(new_fields) + '\n                        ' + closing
-
-    # Apply the replacement
-    new_content = re.sub(pattern1, replace_sidebar_fields, content, flags=re.DOTALL)
+        kept_fields = [(keep_field, page.sidebar[keep_field]) for keep_field in KEEP_FIELDS
+                       if keep_field in page.sidebar]
+
+        if kept_fields:
+            new_content = splice(content, page.offsets['sidebar_fields'], sidebar_rows(kept_fields))
+        else:
+            new_content = content  # No fields to keep
 
     # Write back
     if new_content != content:
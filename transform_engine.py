@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+"""
+Single-pass transform engine for site-wide HTML rewrites.
+
+Every page under qualifications/, setas/ and short-courses/ is read once,
+run through the ordered list of registered transforms in memory, and
+written back at most once. A transform is a plain function taking
+(content, filename) and returning the new content, so helpers such as
+batch_update_sidebars.standardize_sidebar can be registered as-is.
+
+Pages are independent, so run_parallel() can fan the per-file work out
+over a process pool; results are merged in path order so the report is the
+same whatever the worker count.
+
+In incremental mode a manifest (path -> content hash + the version of each
+transform applied) is kept in MANIFEST_FILE. Pages whose size, mtime and
+transform versions match the manifest are not opened at all; pages whose
+mtime changed but whose content hash did not are skipped after hashing.
+Bump a transform's version when its output changes to re-run it everywhere.
+
+Each transform runs under a per-file time budget (timeout=, default
+DEFAULT_TIMEOUT seconds). A page where a transform blows its budget -
+typically a nested DOTALL `.*?` pattern backtracking over a malformed
+page - is reported as timed out and left untouched instead of stalling the
+whole batch.
+
+Register transforms in site_transforms.py and run that script.
+"""
+
+import os
+import json
+import time
+import signal
+import hashlib
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import regex_registry
+
+# Folders processed by default
+SITE_FOLDERS = ['qualifications', 'setas', 'short-courses']
+
+# Default number of worker processes for parallel passes
+DEFAULT_WORKERS = os.cpu_count() or 1
+
+# Page state recorded by incremental runs
+MANIFEST_FILE = '.transform_manifest.json'
+
+# Default per-file time budget for one transform, in seconds
+DEFAULT_TIMEOUT = 5.0
+
+# Registered transforms, in the order they run
+TRANSFORMS = []
+
+class TransformTimeout(Exception):
+    """Raised when a transform exceeds its per-file time budget."""
+
+@contextmanager
+def time_budget(seconds, label='transform'):
+    """
+    Raise TransformTimeout if the body runs longer than seconds.
+
+    Where SIGALRM is available (POSIX, main thread - which includes process
+    pool workers) the body is interrupted, and re's matching loop honours
+    the signal. Elsewhere the body runs to completion and the overrun is
+    raised afterwards, so the page is still reported and not written.
+    A falsy seconds disables the budget.
+    """
+    if not seconds:
+        yield
+        return
+
+    message = f"{label} exceeded its {seconds:g}s budget"
+
+    if hasattr(signal, 'setitimer') and threading.current_thread() is threading.main_thread():
+        def on_timeout(signum, frame):
+            raise TransformTimeout(message)
+
+        previous = signal.signal(signal.SIGALRM, on_timeout)
+        signal.setitimer(signal.ITIMER_REAL, seconds)
+        try:
+            yield
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+    else:
+        start = time.perf_counter()
+        yield
+        if time.perf_counter() - start > seconds:
+            raise TransformTimeout(message)
+
+def register_transform(name, func, folders=None, exclude=None, version='1', timeout=DEFAULT_TIMEOUT):
+    """
+    Register a transform to run on every matching page.
+
+    Args:
+        name: Short name used in reports
+        func: Function (content, filename) -> new content
+        folders: Folders the transform applies to (defaults to SITE_FOLDERS)
+        exclude: Filenames the transform must not touch
+        version: Bump when the transform's output changes so incremental
+            runs re-apply it to every page
+        timeout: Per-file time budget in seconds (None disables it)
+    """
+    transform = make_transform(name, func, folders=folders, exclude=exclude, version=version, timeout=timeout)
+    TRANSFORMS.append(transform)
+    return transform
+
+def make_transform(name, func, folders=None, exclude=None, version='1', timeout=DEFAULT_TIMEOUT):
+    """
+    Build a transform without registering it, for passes that run their
+    own transforms through run_transforms(transforms=...). Arguments are
+    as for register_transform(); func must be picklable (a module-level
+    function or a functools.partial of one) for parallel runs.
+    """
+    return {
+        'name': name,
+        'func': func,
+        'folders': list(folders or SITE_FOLDERS),
+        'exclude': set(exclude or []),
+        'version': str(version),
+        'timeout': timeout,
+    }
+
+def transform(name, folders=None, exclude=None, version='1', timeout=DEFAULT_TIMEOUT):
+    """Decorator form of register_transform()."""
+    def decorator(func):
+        register_transform(name, func, folders=folders, exclude=exclude, version=version, timeout=timeout)
+        return func
+    return decorator
+
+def find_site_files(folders=None, base_dir='.'):
+    """Return all HTML pages in the given folders, sorted by path."""
+    files = []
+    for folder in folders or SITE_FOLDERS:
+        folder_path = Path(base_dir) / folder
+        if folder_path.exists():
+            files.extend(folder_path.glob('*.html'))
+    return sorted(files)
+
+def page_folder(file_path):
+    """Folder name a page is matched against ('.' for the site root)."""
+    return Path(file_path).parent.name or '.'
+
+def applies_to(transform, file_path):
+    """Check whether a transform should run on the given page."""
+    file_path = Path(file_path)
+    if file_path.name in transform['exclude']:
+        return False
+    return page_folder(file_path) in transform['folders']
+
+def apply_transforms(content, file_path, transforms):
+    """
+    Run transforms over in-memory content.
+
+    Raises TransformTimeout if a transform exceeds its time budget.
+
+    Returns:
+        (new_content, names of transforms that changed the content)
+    """
+    changed_by = []
+    filename = Path(file_path).name
+
+    for transform in transforms:
+        if not applies_to(transform, file_path):
+            continue
+        with time_budget(transform['timeout'], f"{transform['name']} on {filename}"):
+            new_content = transform['func'](content, filename)
+        if new_content != content:
+            changed_by.append(transform['name'])
+            content = new_content
+
+    return content, changed_by
+
+def load_manifest(manifest_path=MANIFEST_FILE):
+    """Load the incremental manifest (empty if missing or unreadable)."""
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(manifest, manifest_path=MANIFEST_FILE):
+    """Write the incremental manifest, sorted so diffs stay small."""
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+def manifest_key(file_path):
+    """Manifest key for a page: its path with forward slashes."""
+    return Path(file_path).as_posix()
+
+def content_hash(content):
+    """SHA-256 of page content."""
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+def transform_versions(transforms, file_path):
+    """Versions of the transforms that apply to a page, by name."""
+    return {t['name']: t['version'] for t in transforms if applies_to(t, file_path)}
+
+def manifest_entry(file_path, content, versions):
+    """Manifest record for a page as it is on disk now."""
+    stat = os.stat(file_path)
+    return {
+        'hash': content_hash(content),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'transforms': versions,
+    }
+
+def is_up_to_date(file_path, entry, versions):
+    """
+    Cheap check (no read) that a page is unchanged since the last run.
+
+    The page counts as up to date when its size and mtime match the
+    manifest and every applicable transform was applied at its current
+    version.
+    """
+    if not entry or entry.get('transforms') != versions:
+        return False
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return False
+    return stat.st_size == entry.get('size') and stat.st_mtime_ns == entry.get('mtime_ns')
+
+def file_result(path, status, message='', changed_by=None):
+    """
+    Build a per-file result for run_parallel().
+
+    status is one of 'updated', 'unchanged', 'cached', 'skipped', 'timeout'
+    or 'error'.
+    """
+    return {'path': str(path), 'status': status, 'changed_by': list(changed_by or []), 'error': message}
+
+def process_file(file_path, transforms, dry_run=False, manifest=None):
+    """
+    Read a page once, apply all transforms and write it back if changed.
+
+    When a manifest is given the page is skipped if its content hash and
+    transform versions match it, and the result carries the page's new
+    manifest entry under 'manifest'.
+
+    Returns a result dict with path, status ('updated', 'unchanged',
+    'cached', 'timeout' or 'error'), the transforms that changed the page
+    and any error message. Timed-out pages are not written.
+    """
+    result = file_result(file_path, 'unchanged')
+
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        versions = transform_versions(transforms, file_path)
+
+        if manifest is not None:
+            entry = manifest.get(manifest_key(file_path))
+            if entry and entry.get('transforms') == versions and entry.get('hash') == content_hash(content):
+                # Touched but not edited: refresh the stat fields only
+                result['status'] = 'cached'
+                result['manifest'] = manifest_entry(file_path, content, versions)
+                return result
+
+        new_content, changed_by = apply_transforms(content, file_path, transforms)
+
+        if changed_by:
+            if not dry_run:
+                with open(file_path, 'w', encoding='utf-8') as f:
+                    f.write(new_content)
+            result['status'] = 'updated'
+            result['changed_by'] = changed_by
+
+        if manifest is not None and not dry_run:
+            result['manifest'] = manifest_entry(file_path, new_content, versions)
+
+        # Counters for registered patterns used on this page (see regex_registry)
+        result['regex_stats'] = regex_registry.take_stats()
+
+    except TransformTimeout as e:
+        result['status'] = 'timeout'
+        result['error'] = str(e)
+        # Keep the counters: the interrupted pattern shows up with its time
+        result['regex_stats'] = regex_registry.take_stats()
+
+    except Exception as e:
+        result['status'] = 'error'
+        result['error'] = str(e)
+
+    return result
+
+def _call(func, item, args):
+    """Run func(item, *args) and turn an exception into an error result."""
+    try:
+        return func(item, *args)
+    except Exception as e:
+        return file_result(item, 'error', str(e))
+
+def run_parallel(func, items, workers=None, args=()):
+    """
+    Run func(item, *args) for every item, fanning out over worker processes.
+
+    func must be a module-level function (so it can be pickled) that returns
+    a file_result() dict. Results come back in the order of items.
+
+    Args:
+        func: Per-file function
+        items: Paths to process
+        workers: Number of worker processes (defaults to DEFAULT_WORKERS,
+            1 runs in-process)
+        args: Extra arguments passed to func after the item
+    """
+    items = list(items)
+    workers = DEFAULT_WORKERS if workers is None else max(1, workers)
+
+    if workers == 1 or len(items) < 2:
+        return [_call(func, item, args) for item in items]
+
+    # Hand out work in chunks so short per-file tasks don't pay IPC per page
+    chunksize = max(1, len(items) // (workers * 4))
+    count = len(items)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_call, [func] * count, items, [args] * count, chunksize=chunksize))
+
+def build_report(results):
+    """Merge per-file results into one report, ordered by path."""
+    results = sorted(results, key=lambda r: r['path'])
+    report = {'results': results, 'updated': 0, 'unchanged': 0, 'cached': 0, 'skipped': 0, 'timeouts': 0, 'errors': 0, 'by_transform': {}}
+
+    for result in results:
+        if result['status'] == 'updated':
+            report['updated'] += 1
+        elif result['status'] == 'cached':
+            report['cached'] += 1
+        elif result['status'] == 'skipped':
+            report['skipped'] += 1
+        elif result['status'] == 'timeout':
+            report['timeouts'] += 1
+        elif result['status'] == 'error':
+            report['errors'] += 1
+        else:
+            report['unchanged'] += 1
+
+        for name in result['changed_by']:
+            report['by_transform'][name] = report['by_transform'].get(name, 0) + 1
+
+    return report
+
+def print_results(report):
+    """Print one line per updated, skipped or failed file."""
+    for result in report['results']:
+        if result['status'] == 'updated':
+            changed_by = f" ({', '.join(result['changed_by'])})" if result['changed_by'] else ''
+            print(f"[UPDATED] {result['path']}{changed_by}")
+        elif result['status'] == 'skipped':
+            print(f"[SKIP] {result['path']} - {result['error']}")
+        elif result['status'] == 'timeout':
+            print(f"[TIMEOUT] {result['path']} - {result['error']}")
+        elif result['status'] == 'error':
+            print(f"[ERROR] {result['path']} - {result['error']}")
+
+def run_transforms(transforms=None, files=None, dry_run=False, workers=1,
+                   incremental=False, manifest_path=MANIFEST_FILE):
+    """
+    Run transforms over every site page, reading and writing each file once.
+
+    Args:
+        transforms: Transforms to run (defaults to all registered TRANSFORMS)
+        files: Pages to process (defaults to find_site_files())
+        dry_run: Report changes without writing files
+        workers: Number of worker processes (see run_parallel)
+        incremental: Skip pages unchanged since the last incremental run
+        manifest_path: Where the incremental manifest is kept
+    """
+    transforms = TRANSFORMS if transforms is None else transforms
+    files = find_site_files() if files is None else files
+
+    manifest = None
+    results = []
+    pending = files
+
+    if incremental:
+        manifest = load_manifest(manifest_path)
+        pending = []
+        for file_path in files:
+            entry = manifest.get(manifest_key(file_path))
+            if is_up_to_date(file_path, entry, transform_versions(transforms, file_path)):
+                results.append(file_result(file_path, 'cached'))
+            else:
+                pending.append(file_path)
+
+    results.extend(run_parallel(process_file, pending, workers=workers, args=(transforms, dry_run, manifest)))
+
+    if incremental and not dry_run:
+        for result in results:
+            if 'manifest' in result:
+                manifest[manifest_key(result['path'])] = result['manifest']
+        save_manifest(manifest, manifest_path)
+
+    regex_stats = regex_registry.merge_stats(result.pop('regex_stats', {}) for result in results)
+
+    report = build_report(results)
+    report['regex_stats'] = regex_stats
+    print_results(report)
+
+    return report
+
+def get_worker_count(argv, default=None):
+    """Read --workers N (or --workers=N) from a command line."""
+    for i, arg in enumerate(argv):
+        if arg.startswith('--workers='):
+            return int(arg.split('=', 1)[1])
+        if arg == '--workers' and i + 1 < len(argv):
+            return int(argv[i + 1])
+    return DEFAULT_WORKERS if default is None else default
+
+def print_summary(report):
+    """Print the summary block shown at the end of every pass."""
+    total = (report['updated'] + report['unchanged'] + report['cached']
+             + report['skipped'] + report['timeouts'] + report['errors'])
+
+    print(f"\n{'='*60}")
+    print(f"Summary:")
+    print(f"  Updated: {report['updated']}")
+    print(f"  Unchanged: {report['unchanged']}")
+    print(f"  Up to date (manifest): {report['cached']}")
+    print(f"  Skipped: {report['skipped']}")
+    print(f"  Timed out (left untouched): {report['timeouts']}")
+    print(f"  Errors: {report['errors']}")
+    print(f"  Total files: {total}")
+
+    if report['by_transform']:
+        print(f"\nChanges per transform:")
+        for name, count in sorted(report['by_transform'].items()):
+            print(f"  {name}: {count}")
+    print(f"{'='*60}")
+
+if __name__ == '__main__':
+    print("Register transforms in site_transforms.py and run: python site_transforms.py")
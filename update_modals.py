@@ -8,6 +8,22 @@ import os
 import re
 from pathlib import Path
 
+import regex_registry
+
+# Qualification page patterns, compiled once and profiled by regex_registry
+QUAL_ENQUIRE_BUTTON = regex_registry.register_pattern(
+    'modals.qualification_enquire_button',
+    r'<a[^>]*href="[^"]*index\.html#apply[^"]*"[^>]*class="[^"]*(?:bg-gradient|bg-blue)[^"]*"[^>]*>([^<]*(?:Enquire Now)[^<]*)</a>'
+)
+QUAL_MOBILE_ENQUIRE_BUTTON = regex_registry.register_pattern(
+    'modals.qualification_mobile_enquire_button',
+    r'<a[^>]*href="[^"]*index\.html#apply[^"]*"[^>]*class="[^"]*(?:mt-2|w-full)[^"]*bg-gradient[^"]*"[^>]*>([^<]*(?:Enquire Now)[^<]*)</a>'
+)
+QUAL_CONTACT_LINK = regex_registry.register_pattern(
+    'modals.qualification_contact_link',
+    r'<a[^>]*href="[^"]*index\.html#contact[^"]*"[^>]*>([^<]*(?:Contact Us)[^<]*)</a>'
+)
+
 def update_index_page():
     """Update the main index.html page"""
     index_path = Path('index.html')
@@ -118,22 +134,22 @@ def update_qualification_pages():
             )
 
         # Update Enquire Now buttons in navigation and content
-        content = re.sub(
-            r'<a[^>]*href="[^"]*index\.html#apply[^"]*"[^>]*class="[^"]*(?:bg-gradient|bg-blue)[^"]*"[^>]*>([^<]*(?:Enquire Now)[^<]*)</a>',
+        content = regex_registry.sub(
+            QUAL_ENQUIRE_BUTTON,
             r'<a href="#" data-modal="enquire" class="enquire-trigger bg-gradient-to-r from-[#12265E] to-[#4A90E2] text-white font-semibold px-6 py-3 rounded-lg hover:from-[#0d1a47] hover:to-[#3a7bc8] transition duration-300 shadow-lg">\1</a>',
             content
         )
 
         # Update mobile Enquire Now buttons
-        content = re.sub(
-            r'<a[^>]*href="[^"]*index\.html#apply[^"]*"[^>]*class="[^"]*(?:mt-2|w-full)[^"]*bg-gradient[^"]*"[^>]*>([^<]*(?:Enquire Now)[^<]*)</a>',
+        content = regex_registry.sub(
+            QUAL_MOBILE_ENQUIRE_BUTTON,
             r'<a href="#" data-modal="enquire" class="enquire-trigger mt-2 w-full bg-gradient-to-r from-[#12265E] to-[#4A90E2] text-white font-semibold px-5 py-2 rounded-lg hover:from-[#0d1a47] hover:to-[#3a7bc8] transition duration-300 shadow-lg text-center block">\1</a>',
             content
         )
 
         # Update Contact Us links
-        content = re.sub(
-            r'<a[^>]*href="[^"]*index\.html#contact[^"]*"[^>]*>([^<]*(?:Contact Us)[^<]*)</a>',
+        content = regex_registry.sub(
+            QUAL_CONTACT_LINK,
             r'<a href="#" data-modal="contact" class="contact-trigger">\1</a>',
             content
         )
@@ -234,6 +250,8 @@ def main():
     print("\n📚 Updating short course pages...")
     update_short_course_pages()
 
+    regex_registry.print_profile()
+
     print("\n" + "=" * 60)
     print("✅ Centralized Modal System Implementation Complete!")
     print("\n📋 Next Steps:")
@@ -3,12 +3,16 @@
 Update all qualification pages to add Source field with the actual page filename.
 The Source field should reflect the page name (e.g., 'agri-animal-production')
 instead of being hardcoded as 'contactus'.
+
+The enquiryData block and its fields come from the cached QualificationPage
+model (see qualification_page.py); only that block is rewritten, at its offsets.
 """
 
-import os
 import re
 from pathlib import Path
 
+from qualification_page import page_for_content, splice
+
 def update_source_field(content, filename):
     """
     Add or update the Source field in enquiryData to use the actual filename.
@@ -17,35 +21,30 @@ def update_source_field(content, filename):
     # Extract filename without extension (e.g., 'agri-animal-production-nqf1' from 'agri-animal-production-nqf1.html')
     page_source = filename.replace('.html', '')
 
-    # Pattern 1: Find enquiryData object that has 'qualification' but no 'Source'
-    # This pattern looks for the closing brace of enquiryData before localStorage
-    pattern1 = r"(const enquiryData = \{[^}]*qualification: '[^']*'\s*)\};"
+    page = page_for_content(content, filename)
+    if 'enquiry_data' not in page.offsets:
+        return content, "no_change"
 
-    # Check if Source field already exists
-    if re.search(r"[Ss]ource:\s*['\"]", content):
+    start, end = page.offsets['enquiry_data']
+    block = content[start:end]
+    source_key = next((key for key in page.enquiry_data if key.lower() == 'source'), None)
+
+    if source_key:
         # Source field exists, update it
-        pattern_update = r"([Ss]ource:\s*['\"])[^'\"]*(['\"])"
-        replacement = rf"\1{page_source}\2"
-        updated_content = re.sub(pattern_update, replacement, content)
-        return updated_content, "updated"
+        if page.enquiry_data[source_key] == page_source:
+            return content, "no_change"
+        updated_block = re.sub(rf"({source_key}:\s*['\"])[^'\"]*(['\"])",
+                               rf"\g<1>{page_source}\g<2>", block, count=1)
+        status = "updated"
     else:
-        # Source field doesn't exist, add it
-        replacement1 = rf"\1,\n                source: '{page_source}'\n            }};"
-        updated_content = re.sub(pattern1, replacement1, content)
-
-        # Check if update was successful
-        if updated_content != content:
-            return updated_content, "added"
-        else:
-            # Try alternative pattern for different formatting
-            pattern2 = r"(const enquiryData = \{[^}]*qualification: '[^']*')\s*\};"
-            replacement2 = rf"\1,\n                source: '{page_source}'\n            }};"
-            updated_content = re.sub(pattern2, replacement2, content)
-
-            if updated_content != content:
-                return updated_content, "added"
-            else:
-                return content, "no_change"
+        # Source field doesn't exist, add it before the closing brace
+        body = block[:-len('};')].rstrip().rstrip(',')
+        updated_block = f"{body},\n                source: '{page_source}'\n            }};"
+        status = "added"
+
+    if updated_block == block:
+        return content, "no_change"
+    return splice(content, [start, end], updated_block), status
 
 def update_all_qualification_files():
     """Update all qualification HTML files to add proper Source field."""
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Local cache of the CDN files every page loads, served to Playwright.
+
+Pages pull Tailwind from cdn.tailwindcss.com, icons from
+unpkg.com/lucide@latest, fonts from Google Fonts and hero photos from
+images.pexels.com. install_routes() intercepts those requests in a browser
+context and answers them from VENDOR_DIR, so renders don't wait on CDN
+round-trips, give the same output on every run (lucide@latest is frozen at
+the version first cached) and work without a network. Analytics requests
+are dropped.
+
+A request that is not cached yet is fetched once and stored, unless the
+context runs offline, in which case it fails and the page renders without
+it. The cache is versioned: bump VENDOR_CACHE_VERSION, or run with
+--refresh, to start a new one.
+
+Usage:
+    python vendor_cache.py            Prefetch every CDN file the pages reference
+    python vendor_cache.py --refresh  Discard the cache and fetch again
+"""
+
+import os
+import re
+import sys
+import json
+import shutil
+import hashlib
+import mimetypes
+import urllib.request
+from pathlib import Path
+from datetime import datetime
+
+import regex_registry
+
+# Handle Windows console encoding
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+    sys.stderr.reconfigure(encoding='utf-8')
+
+# Bump to start a fresh cache (old versions are left on disk)
+VENDOR_CACHE_VERSION = 1
+
+VENDOR_DIR = Path('.cache') / 'vendor' / f'v{VENDOR_CACHE_VERSION}'
+INDEX_FILE = VENDOR_DIR / 'index.json'
+
+# Hosts served from the cache
+VENDOR_HOSTS = [
+    'cdn.tailwindcss.com',
+    'unpkg.com',
+    'fonts.googleapis.com',
+    'fonts.gstatic.com',
+    'images.pexels.com',
+]
+
+# Hosts whose requests are aborted while rendering
+BLOCKED_HOSTS = [
+    'www.googletagmanager.com',
+    'www.google-analytics.com',
+]
+
+# Directories scanned for CDN references by --prefetch
+SITE_DIRS = ['.', 'qualifications', 'setas', 'short-courses']
+
+# Google Fonts picks the font format from the user agent, so prefetching
+# has to look like the Chromium that Playwright drives
+USER_AGENT = ('Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 '
+              '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+
+ROUTE_PATTERN = re.compile(
+    r'^https?://(?:' + '|'.join(re.escape(host) for host in VENDOR_HOSTS + BLOCKED_HOSTS) + r')/'
+)
+
+VENDOR_URL = regex_registry.register_pattern(
+    'vendor.url',
+    r"""https?://(?:""" + '|'.join(re.escape(host) for host in VENDOR_HOSTS) + r""")(?:/[^"'\s()<>]*)?"""
+)
+PRECONNECT = regex_registry.register_pattern(
+    'vendor.preconnect', r'<link[^>]*rel="(?:preconnect|dns-prefetch)"[^>]*>'
+)
+
+def url_host(url):
+    """Host part of an http(s) URL."""
+    return url.split('://', 1)[-1].split('/', 1)[0]
+
+def request_url(url):
+    """URL as the browser requests it (a bare host gets a trailing slash)."""
+    return url if url.count('/') > 2 else url + '/'
+
+def load_index(index_file=INDEX_FILE):
+    """Cached entries by URL: file, content_type, sha256, fetched."""
+    try:
+        with open(index_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_index(index, index_file=INDEX_FILE):
+    """Write the index atomically, so an interrupted run can't corrupt it."""
+    index_file = Path(index_file)
+    index_file.parent.mkdir(parents=True, exist_ok=True)
+    temp_file = index_file.with_suffix('.tmp')
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+    os.replace(temp_file, index_file)
+
+def store(index, url, body, content_type, vendor_dir=VENDOR_DIR):
+    """Save a response body into the cache and index it."""
+    digest = hashlib.sha256(body).hexdigest()
+    extension = mimetypes.guess_extension((content_type or '').split(';')[0].strip()) or ''
+    filename = f'{digest[:32]}{extension}'
+
+    Path(vendor_dir).mkdir(parents=True, exist_ok=True)
+    with open(Path(vendor_dir) / filename, 'wb') as f:
+        f.write(body)
+
+    index[url] = {
+        'file': filename,
+        'content_type': content_type or 'application/octet-stream',
+        'sha256': digest,
+        'fetched': datetime.now().isoformat(timespec='seconds'),
+    }
+
+    # Keep entries another process stored since this index was loaded
+    index_file = Path(vendor_dir) / INDEX_FILE.name
+    for other_url, entry in load_index(index_file).items():
+        index.setdefault(other_url, entry)
+    save_index(index, index_file)
+
+def cached_body(index, url, vendor_dir=VENDOR_DIR):
+    """(body, content_type) of a cached URL, or None."""
+    entry = index.get(url)
+    if entry is None:
+        return None
+    try:
+        with open(Path(vendor_dir) / entry['file'], 'rb') as f:
+            return f.read(), entry['content_type']
+    except OSError:
+        return None
+
+def fulfill_headers(content_type):
+    """Response headers for a cached file (fonts need CORS on file:// pages)."""
+    return {'Content-Type': content_type, 'Access-Control-Allow-Origin': '*'}
+
+class VendorRoutes:
+    """
+    Route handlers for one browser context.
+
+    handle() is for the sync API and handle_async() for the async API;
+    both share the index, so a file fetched by one page is served to the
+    next from disk.
+    """
+
+    def __init__(self, offline=False, vendor_dir=VENDOR_DIR):
+        self.offline = offline
+        self.vendor_dir = Path(vendor_dir)
+        self.index = load_index(self.vendor_dir / INDEX_FILE.name)
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, url):
+        """'abort', ('fulfill', body, content_type) or 'fetch' for a request."""
+        if url_host(url) in BLOCKED_HOSTS:
+            return 'abort'
+        cached = cached_body(self.index, url, self.vendor_dir)
+        if cached is not None:
+            self.hits += 1
+            return ('fulfill',) + cached
+        self.misses += 1
+        return 'abort' if self.offline else 'fetch'
+
+    def _store(self, url, response, body):
+        if response.status == 200:
+            store(self.index, url, body, response.headers.get('content-type'), self.vendor_dir)
+
+    def handle(self, route):
+        """Sync API route handler."""
+        url = route.request.url
+        action = self._lookup(url)
+        if action == 'abort':
+            route.abort()
+        elif action == 'fetch':
+            response = route.fetch()
+            self._store(url, response, response.body())
+            route.fulfill(response=response)
+        else:
+            route.fulfill(status=200, headers=fulfill_headers(action[2]), body=action[1])
+
+    async def handle_async(self, route):
+        """Async API route handler."""
+        url = route.request.url
+        action = self._lookup(url)
+        if action == 'abort':
+            await route.abort()
+        elif action == 'fetch':
+            response = await route.fetch()
+            self._store(url, response, await response.body())
+            await route.fulfill(response=response)
+        else:
+            await route.fulfill(status=200, headers=fulfill_headers(action[2]), body=action[1])
+
+def install_routes(context, routes=None, offline=False):
+    """
+    Serve CDN requests of a sync-API browser context from the cache.
+
+    Pass the same VendorRoutes to every context of a run so they share
+    one index.
+    """
+    routes = routes or VendorRoutes(offline)
+    context.route(ROUTE_PATTERN, routes.handle)
+    return routes
+
+async def install_routes_async(context, routes=None, offline=False):
+    """Async counterpart of install_routes()."""
+    routes = routes or VendorRoutes(offline)
+    await context.route(ROUTE_PATTERN, routes.handle_async)
+    return routes
+
+def fetch(url, user_agent=USER_AGENT):
+    """Download a URL as (body, content_type)."""
+    request = urllib.request.Request(url, headers={'User-Agent': user_agent})
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return response.read(), response.headers.get('Content-Type')
+
+def referenced_urls(site_dirs=SITE_DIRS):
+    """CDN URLs referenced by the site's HTML pages, sorted."""
+    urls = set()
+    for directory in site_dirs:
+        for html_file in Path(directory).glob('*.html'):
+            with open(html_file, 'r', encoding='utf-8', errors='replace') as f:
+                # Preconnect hints name hosts, not files
+                content = regex_registry.sub(PRECONNECT, '', f.read())
+            urls.update(request_url(url) for url in regex_registry.findall(VENDOR_URL, content))
+    return sorted(urls)
+
+def prefetch(urls, index=None):
+    """
+    Fetch URLs that are not cached yet, following the font files Google
+    Fonts stylesheets point to. Returns (fetched, failed) counts.
+    """
+    index = load_index() if index is None else index
+    pending = list(urls)
+    fetched = failed = 0
+
+    while pending:
+        url = pending.pop(0)
+        if url in index:
+            continue
+        try:
+            body, content_type = fetch(url)
+        except Exception as e:
+            print(f"[ERROR] {url}: {e}")
+            failed += 1
+            continue
+
+        store(index, url, body, content_type)
+        fetched += 1
+        print(f"[OK] {url} ({len(body) / 1024:.1f} KB)")
+
+        if url_host(url) == 'fonts.googleapis.com':
+            css = body.decode('utf-8', errors='replace')
+            pending.extend(request_url(font_url) for font_url in regex_registry.findall(VENDOR_URL, css))
+
+    return fetched, failed
+
+def main():
+    if '--refresh' in sys.argv[1:] and VENDOR_DIR.exists():
+        shutil.rmtree(VENDOR_DIR)
+        print(f"[UPDATED] Cleared {VENDOR_DIR}")
+
+    urls = referenced_urls()
+    index = load_index()
+    print(f"Vendor cache {VENDOR_DIR}: {len(index)} files cached, {len(urls)} CDN URLs referenced by pages")
+    print("=" * 60)
+
+    fetched, failed = prefetch(urls, index)
+
+    print(f"\n{'='*60}")
+    print("Summary:")
+    print(f"  Fetched: {fetched}")
+    print(f"  Failed: {failed}")
+    print(f"  Cached files: {len(index)}")
+    print(f"{'='*60}")
+    return 0 if failed == 0 else 1
+
+if __name__ == '__main__':
+    sys.exit(main())